@@ -49,6 +49,7 @@ import os
 # Adicionar o diretório raiz ao path do Python:
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config.settings import OPENAI_API_KEY, ANTHROPIC_API_KEY
+from config.embedding_cache import CachedEmbedder
 
 # Criar uma base de conhecimento:
 knowledge_base = PDFKnowledgeBase(
@@ -57,7 +58,8 @@ knowledge_base = PDFKnowledgeBase(
             uri="tmp/lancedb_detran_df",
             table_name="detran_df_docs",
             search_type=SearchType.hybrid,
-            embedder=OpenAIEmbedder(id="text-embedding-3-large", api_key=OPENAI_API_KEY),
+            # Cache em disco: recriar a tabela não chama a API de novo para os mesmos chunks
+            embedder=CachedEmbedder(embedder=OpenAIEmbedder(id="text-embedding-3-large", api_key=OPENAI_API_KEY)),
         ),
         chunking_strategy=DocumentChunking(),
     )
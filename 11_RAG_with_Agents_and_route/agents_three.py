@@ -10,6 +10,7 @@ from agno.knowledge.json import JSONKnowledgeBase
 from agno.vectordb.lancedb import LanceDb, SearchType
 from agno.embedder.openai import OpenAIEmbedder
 from config.settings import OPENAI_API_KEY
+from config.embedding_cache import CachedEmbedder
 
 agent_detran_df = Agent(
     name="Especialista do Detran do Distrito Federal (DF)",
@@ -30,7 +31,8 @@ agent_detran_df = Agent(
             uri="tmp/lancedb_detran_df",
             table_name="detran_df_docs",
             search_type=SearchType.hybrid,
-            embedder=OpenAIEmbedder(id="text-embedding-3-large"),
+            # Os três agentes compartilham o mesmo cache em disco (tmp/embedding_cache)
+            embedder=CachedEmbedder(embedder=OpenAIEmbedder(id="text-embedding-3-large")),
         ),
     ),
     show_tool_calls=True,
@@ -59,7 +61,7 @@ cleaning_service_agent_df = Agent(
             uri="tmp/lancedb_slu_df",
             table_name="slu_df_docs",
             search_type=SearchType.hybrid,
-            embedder=OpenAIEmbedder(id="text-embedding-3-large"),
+            embedder=CachedEmbedder(embedder=OpenAIEmbedder(id="text-embedding-3-large")),
         ),
     ),
     show_tool_calls=True,
@@ -88,7 +90,7 @@ agent_health_secretary_df = Agent(
             uri="tmp/lancedb_secretaria_saude_df",
             table_name="secretaria_saude_df_docs",
             search_type=SearchType.hybrid,
-            embedder=OpenAIEmbedder(id="text-embedding-3-large"),
+            embedder=CachedEmbedder(embedder=OpenAIEmbedder(id="text-embedding-3-large")),
         ),
     ),
     show_tool_calls=True,
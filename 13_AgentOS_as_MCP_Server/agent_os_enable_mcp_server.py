@@ -19,14 +19,16 @@ from agno.knowledge.chunking.document import DocumentChunking
 from agno.models.anthropic import Claude
 from agno.os import AgentOS
 from agno.tools.duckduckgo import DuckDuckGoTools
+from agno.tracing.exporter import DatabaseSpanExporter
 from agno.knowledge import Knowledge
 from agno.knowledge.reader.pdf_reader import PDFReader
 from agno.vectordb.lancedb import LanceDb, SearchType
 from agno.knowledge.embedder.openai import OpenAIEmbedder
 import sys
+from contextlib import AsyncExitStack, asynccontextmanager
 from pathlib import Path
 from textwrap import dedent
-from typing import Optional
+from typing import Any, Optional
 from prompts_agent_os_and_mcp.prompts import (
     WEB_RESEARCH_AGENT_PROMPT,
     KNOWLEDGE_BASE_AGENT_PROMPT,
@@ -34,6 +36,11 @@ from prompts_agent_os_and_mcp.prompts import (
 
 # Add the project root directory to the sys.path:
 sys.path.append(str(Path(__file__).parent.parent))
+from config.agent_warmup import AgentOSWarmup
+from config.embedding_cache import CachedEmbedder
+from config.knowledge_ingestion import BackgroundIngestion
+from config.knowledge_pipeline import PipelineSettings
+from config.sampled_tracing import TraceSampling, setup_sampled_tracing
 from config.settings import ANTHROPIC_API_KEY, OPENAI_API_KEY
 
 
@@ -44,7 +51,7 @@ class AgentOSMCPServer:
     This class encapsulates the entire configuration and execution of the AgentOS as MCP Server,
     including:
     - Configuration of the SQLite database
-    - Configuration of the knowledge base with LanceDB
+    - Configuration of the knowledge base with LanceDB (filled in the background)
     - Creation of specialized agents (Web Research and Knowledge Base)
     - Exposure of the MCP server via FastAPI
 
@@ -54,7 +61,12 @@ class AgentOSMCPServer:
         openai_api_key (str): API key for OpenAI.
         db_path (str): Path to the SQLite database.
         lancedb_uri (str): URI to the LanceDB database.
+        embedding_cache_dir (str): Folder of the on-disk embedding cache.
         documents_path (Path): Path to the PDF documents.
+        trace_sampling (Optional[TraceSampling]): Trace sampling settings.
+        traces_db_path (str): Path to the SQLite database of the traces.
+        warmup (Optional[AgentOSWarmup]): Startup warm-up behind the `/ready` endpoint.
+        ingestion (BackgroundIngestion): Ingestion of the documents, with progress at `/knowledge/ingestion`.
 
     Example:
         >>> server = AgentOSMCPServer(
@@ -70,8 +82,13 @@ class AgentOSMCPServer:
         openai_api_key: str = OPENAI_API_KEY,
         db_path: str = "tmp/agentos.db",
         lancedb_uri: str = "tmp/lancedb_kb",
+        embedding_cache_dir: str = "tmp/embedding_cache",
         documents_path: Optional[Path] = (Path(__file__).parent / "data" / "documents"),
         user_id: str = "eddy-giusepe",
+        trace_sampling: Optional[TraceSampling] = TraceSampling(),
+        traces_db_path: str = "tmp/agentos_traces.db",
+        warmup: bool = True,
+        warmup_ping_model: bool = False,
     ) -> None:
         """
         Initialize the AgentOSMCPServer with the necessary configurations.
@@ -81,8 +98,15 @@ class AgentOSMCPServer:
             openai_api_key: API key for OpenAI.
             db_path: Path to the SQLite database. Defaults to "tmp/agentos.db".
             lancedb_uri: URI to the LanceDB database. Defaults to "tmp/lancedb_kb".
+            embedding_cache_dir: Folder of the on-disk embedding cache. Defaults to "tmp/embedding_cache".
             documents_path: Path to the PDF documents. Defaults to (Path(__file__).parent / "data" / "documents").
             user_id: ID of the user to persist memories. Defaults to "eddy-giusepe".
+            trace_sampling: Head ratio and tail rules (slow/failed runs) for tracing,
+                exported in batches off the request path. None traces every run.
+            traces_db_path: Path to the SQLite database of the traces. Defaults to "tmp/agentos_traces.db".
+            warmup: If True, warms up the databases, model clients, tools and system prompts
+                right after startup; `/ready` answers 200 only once that is done. Defaults to True.
+            warmup_ping_model: If True, the warm-up also sends a tiny request to each model. Defaults to False.
         """
         # Fixed user ID to persist memories consistently:
         self.user_id: str = user_id
@@ -90,15 +114,20 @@ class AgentOSMCPServer:
         self.openai_api_key: str = openai_api_key
         self.db_path: str = db_path
         self.lancedb_uri: str = lancedb_uri
+        self.embedding_cache_dir: str = embedding_cache_dir
         self.documents_path: Path = documents_path or (
             Path(__file__).parent / "data" / "documents"
         )
+        self.trace_sampling: Optional[TraceSampling] = trace_sampling
+        self.traces_db_path: str = traces_db_path
+        self.warmup_ping_model: bool = warmup_ping_model
 
         # Setup the database:
         self.db: SqliteDb = self._setup_database()
 
-        # Setup knowledge base with PDFs:
+        # Setup knowledge base with PDFs (ingested in the background once the server starts):
         self.knowledge_base: Knowledge = self._setup_knowledge_base()
+        self.ingestion: BackgroundIngestion = self._setup_ingestion()
 
         # Setup basic research agent:
         self.web_research_agent: Agent = self._create_web_research_agent()
@@ -106,6 +135,16 @@ class AgentOSMCPServer:
         # Setup knowledge base agent:
         self.knowledge_base_agent: Agent = self._create_knowledge_base_agent()
 
+        # Setup the startup warm-up (served at /ready):
+        self.warmup: Optional[AgentOSWarmup] = (
+            AgentOSWarmup(
+                agents=[self.knowledge_base_agent, self.web_research_agent],
+                ping_model=self.warmup_ping_model,
+            )
+            if warmup
+            else None
+        )
+
         # Setup our AgentOS with MCP enabled:
         self.agent_os: AgentOS = self._setup_agent_os()
 
@@ -123,41 +162,78 @@ class AgentOSMCPServer:
         """
         Setup and return the knowledge base with LanceDB.
 
-        Setup the PDF reader with chunking strategy,
-        setup the LanceDB vector database with OpenAI embeddings,
-        and add the content of the documents.
+        Setup the LanceDB vector database with OpenAI embeddings. The content
+        of the documents is added later by `self.ingestion`, so building the
+        server does not wait for the PDFs to be read and embedded.
 
         Returns:
             Knowledge: Configured instance of the knowledge base.
         """
-        reader = PDFReader(
-            chunking_strategy=DocumentChunking(chunk_size=600, overlap=150)
-        )
-
         # Setup knowledge base with PDFs:
         knowledge_base = Knowledge(
             vector_db=LanceDb(
                 uri=self.lancedb_uri,
                 table_name="pdf_knowledge_cv_eddy",
                 search_type=SearchType.hybrid,
-                embedder=OpenAIEmbedder(
-                    id="text-embedding-3-small", api_key=self.openai_api_key
+                # Texts embedded before (re-indexed pages, repeated questions) are read from disk:
+                embedder=CachedEmbedder(
+                    embedder=OpenAIEmbedder(
+                        id="text-embedding-3-small", api_key=self.openai_api_key
+                    ),
+                    cache_dir=self.embedding_cache_dir,
                 ),
             ),
             contents_db=self.db,  # Database to track added contents
             max_results=8,
         )
 
-        # Add content using add_content or add_content_async:
-        knowledge_base.add_content(
+        return knowledge_base
+
+    def _setup_ingestion(self) -> BackgroundIngestion:
+        """
+        Setup the background ingestion of the documents.
+
+        Setup the PDF reader with chunking strategy. The ingestion starts with
+        the server (see `_lifespan`), so the knowledge base agent answers from
+        what is already indexed meanwhile. A manifest of page hashes in
+        `self.db` makes each restart re-index only the pages that changed
+        since the previous one, and those pages are parsed, embedded and
+        written in parallel stages (throughput in pages/s at
+        `/knowledge/ingestion` and in the logs).
+
+        Returns:
+            BackgroundIngestion: Ingestion of the documents into the knowledge base.
+        """
+        reader = PDFReader(
+            chunking_strategy=DocumentChunking(chunk_size=600, overlap=150)
+        )
+
+        return BackgroundIngestion(
+            knowledge=self.knowledge_base,
             path=self.documents_path,
             reader=reader,
-            skip_if_exists=True,  # Indicates that if the content already exists, do not add it again.
+            pattern="*.pdf",
+            incremental=True,  # Only new or changed pages are embedded again; deleted PDFs are removed.
+            pipeline=PipelineSettings(),
         )
-        # or asynchronously:
-        # await knowledge_base.add_content_async(path="data/documents", reader=reader)
 
-        return knowledge_base
+    @asynccontextmanager
+    async def _lifespan(self, app, agent_os: AgentOS):
+        """
+        AgentOS lifespan: starts the document ingestion and the warm-up in the background.
+
+        Args:
+            app: FastAPI application.
+            agent_os: The AgentOS being served.
+        """
+        async with AsyncExitStack() as stack:
+            after = None
+            if self.warmup is not None:
+                await stack.enter_async_context(self.warmup.lifespan(app, agent_os))
+                # The warm-up creates the tables that the ingestion also writes to
+                after = self.warmup.databases_ready.wait()
+            await stack.enter_async_context(self.ingestion.lifespan(app, after=after))
+            yield
 
     def _create_web_research_agent(self) -> Agent:
         """
@@ -250,6 +326,12 @@ class AgentOSMCPServer:
         Returns:
             AgentOS: Configured instance of the AgentOS.
         """
+        # Sampled tracing, installed before the AgentOS so it keeps this provider:
+        tracing_db = None
+        if self.trace_sampling is not None:
+            tracing_db = SqliteDb(db_file=self.traces_db_path)
+            setup_sampled_tracing(DatabaseSpanExporter(db=tracing_db), self.trace_sampling)
+
         # Setup our AgentOS with MCP enabled:
         return AgentOS(
             description="AgentOS with MCP enabled - Web Research and Knowledge Base",
@@ -262,6 +344,8 @@ class AgentOSMCPServer:
             name="🤗 My second AgentOS 🤗",
             telemetry=True,
             tracing=True,
+            tracing_db=tracing_db,
+            lifespan=self._lifespan,
         )
 
     def get_app(self):
@@ -269,9 +353,14 @@ class AgentOSMCPServer:
         Return the FastAPI application of the AgentOS.
 
         Returns:
-            FastAPI: Configured FastAPI application with the AgentOS endpoints.
+            FastAPI: Configured FastAPI application with the AgentOS endpoints,
+            the ingestion progress (and `/ready` when the warm-up is enabled).
         """
-        return self.agent_os.get_app()
+        app = self.agent_os.get_app()
+        app.include_router(self.ingestion.router())
+        if self.warmup is not None:
+            app.include_router(self.warmup.router())
+        return app
 
     def serve(
         self,
@@ -292,18 +381,51 @@ class AgentOSMCPServer:
 
         Note:
             The MCP server will be available at http://localhost:{port}/mcp
+            and the readiness probe at http://localhost:{port}/ready
+            The progress of the document ingestion is at http://localhost:{port}/knowledge/ingestion
         """
         # Use websockets-sansio to avoid warnings of websockets.legacy deprecation
         # uvicorn 0.35.0+ supports the new websockets-sansio implementation
         self.agent_os.serve(app=app, host=host, port=port, ws=ws)
 
 
-# Global instance for use with uvicorn:
-agent_os_server = AgentOSMCPServer(
-    anthropic_api_key=ANTHROPIC_API_KEY,
-    openai_api_key=OPENAI_API_KEY,
-)
-app = agent_os_server.get_app()
+# Global instance for use with uvicorn, built on first use (see `__getattr__`):
+_server: Optional[AgentOSMCPServer] = None
+_app = None
+
+
+def get_server() -> AgentOSMCPServer:
+    """
+    Return the global AgentOSMCPServer, building it on the first call.
+
+    Returns:
+        AgentOSMCPServer: The server shared by `app` and `__main__`.
+    """
+    global _server
+    if _server is None:
+        _server = AgentOSMCPServer(
+            anthropic_api_key=ANTHROPIC_API_KEY,
+            openai_api_key=OPENAI_API_KEY,
+        )
+    return _server
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Build `agent_os_server` and `app` lazily on first access (`agent_os_enable_mcp_server:app` for uvicorn).
+
+    Importing the module does not create the agents, databases or routes. The
+    ingestion's spawn workers re-import this script as `__mp_main__`, and
+    without this each of them would build a whole server it never uses.
+    """
+    global _app
+    if name == "agent_os_server":
+        return get_server()
+    if name == "app":
+        if _app is None:
+            _app = get_server().get_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
@@ -312,4 +434,4 @@ if __name__ == "__main__":
     You can see your LLM-friendly MCP server at:
     http://localhost:7777/mcp
     """
-    agent_os_server.serve()
+    get_server().serve()
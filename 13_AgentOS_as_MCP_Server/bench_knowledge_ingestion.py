@@ -0,0 +1,121 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script bench_knowledge_ingestion.py
+===================================
+Throughput of the knowledge base ingestion of the MCP server, in pages per second.
+
+A synthetic corpus of PDFs is indexed with the reader of the MCP server
+(`PDFReader` with `DocumentChunking(chunk_size=600, overlap=150)`) into a
+temporary LanceDB, once one file at a time and once through the staged
+pipeline of `config.knowledge_pipeline` for each embedding concurrency. The
+embedder is local (no network calls) and waits `EMBED_LATENCY` seconds per
+request, like the embeddings API. Parsing is bounded by the number of CPU
+cores and embedding by the latency.
+
+Run:
+uv run bench_knowledge_ingestion.py
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pymupdf
+from agno.db.sqlite import SqliteDb
+from agno.knowledge import Knowledge
+from agno.knowledge.chunking.document import DocumentChunking
+from agno.knowledge.reader.pdf_reader import PDFReader
+from agno.vectordb.lancedb import LanceDb, SearchType
+
+# Add the root directory to the Python path to import config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.fake_model import FakeEmbedder
+from config.knowledge_ingestion import BackgroundIngestion
+from config.knowledge_pipeline import PipelineSettings
+
+FILES = 4
+PAGES_PER_FILE = 50
+EMBED_LATENCY = 0.1  # seconds per embedding request
+DIMENSIONS = 256
+EMBED_CONCURRENCY = [1, 4, 8]
+PARAGRAPH = (
+    "Agentes consultam a base de conhecimento antes de responder. Cada página do PDF é "
+    "extraída, dividida em chunks e convertida em embeddings que ficam no LanceDB. "
+)
+
+
+def make_corpus(folder: Path) -> None:
+    """Write FILES PDFs of PAGES_PER_FILE pages of text."""
+    folder.mkdir(parents=True)
+    for f in range(FILES):
+        document = pymupdf.open()
+        for p in range(PAGES_PER_FILE):
+            page = document.new_page()
+            text = "\n\n".join(f"[{f}.{p}.{i}] {PARAGRAPH}" for i in range(8))
+            page.insert_textbox(pymupdf.Rect(40, 40, 560, 800), text, fontsize=9)
+        document.save(str(folder / f"document_{f:02d}.pdf"))
+        document.close()
+
+
+def measure(name: str, tag: str, documents: Path, folder: Path, pipeline: PipelineSettings | None) -> dict:
+    """Index the corpus into an empty knowledge base and return the throughput."""
+    embedder = FakeEmbedder(latency=EMBED_LATENCY, dimensions=DIMENSIONS)
+    knowledge = Knowledge(
+        vector_db=LanceDb(
+            uri=str(folder / f"lancedb_{tag}"),
+            table_name="bench",
+            search_type=SearchType.hybrid,
+            embedder=embedder,
+        ),
+        contents_db=SqliteDb(db_file=str(folder / f"{tag}.db")),
+    )
+    ingestion = BackgroundIngestion(
+        knowledge=knowledge,
+        path=documents,
+        reader=PDFReader(chunking_strategy=DocumentChunking(chunk_size=600, overlap=150)),
+        pattern="*.pdf",
+        incremental=True,
+        pipeline=pipeline,
+    )
+    start = time.perf_counter()
+    progress = asyncio.run(ingestion.run())
+    elapsed = time.perf_counter() - start
+    pages = progress.index.pages_embedded
+    return {
+        "name": name,
+        "pages": pages,
+        "chunks": knowledge.vector_db.get_count(),
+        "requests": embedder.requests,
+        "seconds": elapsed,
+        "pages_per_s": pages / elapsed,
+    }
+
+
+def main() -> None:
+    print(f"🧪 {FILES} PDFs x {PAGES_PER_FILE} pages, {EMBED_LATENCY * 1000:.0f} ms per embedding request, "
+          f"{os.cpu_count()} CPU cores\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        make_corpus(folder / "documents")
+        results = [measure("one file at a time", "sequential", folder / "documents", folder, None)]
+        for concurrency in EMBED_CONCURRENCY:
+            settings = PipelineSettings(embed_concurrency=concurrency)
+            results.append(
+                measure(f"pipeline (embed x{concurrency})", f"pipeline_{concurrency}", folder / "documents", folder, settings)
+            )
+
+    baseline = results[0]["pages_per_s"]
+    print(f"{'mode':<24}{'pages':>7}{'chunks':>8}{'requests':>10}{'seconds':>9}{'pages/s':>9}{'speedup':>9}")
+    for r in results:
+        print(
+            f"{r['name']:<24}{r['pages']:>7}{r['chunks']:>8}{r['requests']:>10}"
+            f"{r['seconds']:>9.1f}{r['pages_per_s']:>9.1f}{r['pages_per_s'] / baseline:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
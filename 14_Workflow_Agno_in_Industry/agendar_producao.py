@@ -0,0 +1,55 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script agendar_producao.py
+==========================
+Monitoramento contínuo: dispara o workflow industrial em cadência fixa para
+cada linha de produção e imprime as métricas de agendamento ao final.
+
+Run:
+uv run agendar_producao.py
+"""
+import asyncio
+import json
+
+from agno.db.sqlite import SqliteDb
+
+from industria.agendador import AgendadorCadencia, LinhaProducao
+from teste_industry import criar_workflow_industrial, historico
+
+DURACAO_SEGUNDOS = 15 * 60
+MAX_EM_ANDAMENTO = 8
+
+LINHAS = [
+    LinhaProducao("linha-1", "F001", cadencia_segundos=60, jitter_segundos=5),
+    LinhaProducao("linha-2", "F002", cadencia_segundos=60, jitter_segundos=5),
+    LinhaProducao("linha-3", "F003", cadencia_segundos=120, jitter_segundos=10),
+]
+
+
+async def main() -> None:
+    """Executa o agendador por DURACAO_SEGUNDOS."""
+    db = SqliteDb(session_table="producao_industrial", db_file="tmp/industrial.db")
+
+    async def ciclo(linha: LinhaProducao, numero: int) -> None:
+        lote_id = f"{linha.nome}-{numero:05d}"
+        await criar_workflow_industrial(db=db).arun(
+            input=f"Iniciar ciclo de produção - Lote {lote_id}, Forno {linha.forno_id}. "
+            "IMPORTANTE: Responder APENAS em português brasileiro.",
+            additional_data={"lote_id": lote_id, "forno_id": linha.forno_id},
+        )
+
+    agendador = AgendadorCadencia(ciclo, max_em_andamento=MAX_EM_ANDAMENTO)
+    for linha in LINHAS:
+        agendador.adicionar_linha(linha)
+
+    print(f"⏱️ Agendador iniciado com {len(LINHAS)} linhas por {DURACAO_SEGUNDOS}s")
+    metricas = await agendador.executar_por(DURACAO_SEGUNDOS)
+    historico.gravar()
+    print("\n📊 Métricas de agendamento:")
+    print(json.dumps(metricas, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
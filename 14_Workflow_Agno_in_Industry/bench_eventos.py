@@ -0,0 +1,77 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script bench_eventos.py
+=======================
+Benchmark do EventStore: escritas sustentadas por segundo e latência de
+leitura de "últimos N ciclos do forno X".
+
+Run:
+uv run bench_eventos.py
+"""
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from industria.eventos import EventStore
+
+NUM_EVENTOS = 200_000
+NUM_FORNOS = 50
+NUM_LEITURAS = 500
+ULTIMOS_N = 20
+
+
+def main() -> None:
+    """Grava NUM_EVENTOS eventos e mede escrita e leitura."""
+    with tempfile.TemporaryDirectory() as pasta:
+        # Fila do tamanho do teste: mede a vazão do escritor, sem descartes
+        store = EventStore(db_file=str(Path(pasta) / "bench_eventos.db"), max_fila=NUM_EVENTOS + 1)
+        gerador = random.Random(42)
+
+        inicio = time.perf_counter()
+        for i in range(NUM_EVENTOS):
+            forno_id = f"F{gerador.randrange(NUM_FORNOS):03d}"
+            store.registrar(
+                "ciclo_concluido",
+                run_id=f"run-{i}",
+                forno_id=forno_id,
+                lote_id=f"L{i:06d}",
+                payload={
+                    "temperatura": gerador.randint(800, 1200),
+                    "resultado": gerador.choice(["aprovado", "reprovado", "retrabalho"]),
+                    "defeitos": gerador.randint(0, 5),
+                },
+            )
+        store.fechar()  # espera a thread escritora gravar tudo
+        duracao_escrita = time.perf_counter() - inicio
+        assert store.eventos_descartados == 0 and store.eventos_perdidos == 0
+
+        store = EventStore(db_file=str(Path(pasta) / "bench_eventos.db"))
+        latencias = []
+        for _ in range(NUM_LEITURAS):
+            forno_id = f"F{gerador.randrange(NUM_FORNOS):03d}"
+            t0 = time.perf_counter()
+            eventos = store.ultimos_ciclos(forno_id, ULTIMOS_N)
+            latencias.append((time.perf_counter() - t0) * 1000)
+            assert len(eventos) == ULTIMOS_N
+        store.fechar()
+
+        tamanho = (Path(pasta) / "bench_eventos.db").stat().st_size
+
+    quantis = statistics.quantiles(latencias, n=100)
+    print("📊 Benchmark EventStore")
+    print("=" * 50)
+    print(f"Eventos gravados: {NUM_EVENTOS} em {duracao_escrita:.2f}s")
+    print(f"Escritas sustentadas: {NUM_EVENTOS / duracao_escrita:,.0f} eventos/s")
+    print(f"Tamanho do banco: {tamanho / 1e6:.1f} MB")
+    print(
+        f"Leitura 'últimos {ULTIMOS_N} ciclos do forno X': "
+        f"p50 {quantis[49]:.2f} ms | p95 {quantis[94]:.2f} ms | p99 {quantis[98]:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script bench_industria.py
+=========================
+Benchmark reprodutível do workflow industrial com a planta simulada e um
+modelo local (FakeModel, sem chamadas de rede).
+
+Para cada tamanho de planta executa o plano de produção completo e reporta
+ciclos por minuto, chamadas ao LLM por ciclo e latência p50/p95 do ciclo.
+Com a mesma semente, as anomalias (e portanto as chamadas ao LLM) são
+idênticas entre execuções; só os tempos variam.
+
+Run:
+uv run bench_industria.py
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+
+from agno.db.sqlite import SqliteDb
+
+# Adiciona o diretório raiz do projeto ao PATH do Python:
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.fake_model import FakeModel
+from industria.historico import HistoricoQualidade
+from industria.lotes import ResumoTurno, executar_lotes
+from industria.sensores import configurar_simulador
+from industria.simulador import ConfiguracaoPlanta, SimuladorPlanta
+from teste_industry import configurar_historico, criar_workflow_industrial
+
+SEMENTE = 42
+TAMANHOS_PLANTA = [3, 10, 30]  # número de fornos
+LOTES_POR_FORNO = 10
+MAX_CONCORRENCIA = 16
+LATENCIA_MODELO = 0.2  # segundos por chamada ao modelo
+LATENCIA_SENSOR = (0.005, 0.02)
+TAXA_ANOMALIA_FORNO = 0.15
+TAXA_ANOMALIA_QUALIDADE = 0.15
+
+
+async def medir(num_fornos: int, pasta: Path) -> dict:
+    """Executa o plano de produção de uma planta com `num_fornos` fornos."""
+    simulador = SimuladorPlanta(ConfiguracaoPlanta(
+        num_fornos=num_fornos,
+        num_lotes=num_fornos * LOTES_POR_FORNO,
+        taxa_anomalia_forno=TAXA_ANOMALIA_FORNO,
+        taxa_anomalia_qualidade=TAXA_ANOMALIA_QUALIDADE,
+        latencia_sensor_min=LATENCIA_SENSOR[0],
+        latencia_sensor_max=LATENCIA_SENSOR[1],
+        semente=SEMENTE,
+    ))
+    configurar_simulador(simulador)
+    modelo = FakeModel(latency=LATENCIA_MODELO)
+    db = SqliteDb(session_table="producao_industrial", db_file=str(pasta / f"bench_{num_fornos}.db"))
+
+    resumo = ResumoTurno()
+    duracoes = []
+    async for resultado in executar_lotes(
+        simulador.plano_producao(),
+        lambda: criar_workflow_industrial(db=db, modelo=modelo),
+        max_concorrencia=MAX_CONCORRENCIA,
+    ):
+        resumo.registrar(resultado)
+        duracoes.append(resultado.duracao)
+
+    quantis = statistics.quantiles(duracoes, n=100, method="inclusive")
+    return {
+        "fornos": num_fornos,
+        "ciclos": resumo.total,
+        "erros": resumo.total - resumo.status.get("COMPLETED", 0),
+        "ciclos_por_minuto": resumo.ciclos_por_minuto,
+        "chamadas_llm_por_ciclo": modelo.stats.calls / resumo.total,
+        "p50": quantis[49],
+        "p95": quantis[94],
+    }
+
+
+async def main() -> None:
+    """Executa o benchmark para cada tamanho de planta."""
+    with tempfile.TemporaryDirectory() as pasta:
+        # O histórico sintético fica na pasta temporária, fora do histórico da planta
+        historico = HistoricoQualidade(str(Path(pasta) / "historico_qualidade"))
+        configurar_historico(historico)
+        resultados = [await medir(n, Path(pasta)) for n in TAMANHOS_PLANTA]
+        historico.gravar()
+
+    print("📊 Benchmark do workflow industrial (modelo local)")
+    print(
+        f"semente={SEMENTE} | latência modelo={LATENCIA_MODELO}s | "
+        f"concorrência={MAX_CONCORRENCIA} | lotes/forno={LOTES_POR_FORNO}"
+    )
+    print("=" * 78)
+    print(f"{'fornos':>6} {'ciclos':>7} {'erros':>6} {'ciclos/min':>11} "
+          f"{'LLM/ciclo':>10} {'p50 (s)':>9} {'p95 (s)':>9}")
+    for r in resultados:
+        print(
+            f"{r['fornos']:>6} {r['ciclos']:>7} {r['erros']:>6} {r['ciclos_por_minuto']:>11.1f} "
+            f"{r['chamadas_llm_por_ciclo']:>10.2f} {r['p50']:>9.2f} {r['p95']:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
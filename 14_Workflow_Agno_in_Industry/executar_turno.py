@@ -0,0 +1,68 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script executar_turno.py
+========================
+Executa o workflow industrial para todos os lotes de um turno de forma
+concorrente, com limite global de concorrência e limitador de taxa do modelo
+compartilhado. Os resultados são exibidos à medida que cada ciclo termina.
+
+Run:
+uv run executar_turno.py
+"""
+import asyncio
+
+from industria.eventos import EventStore
+from industria.lotes import LimitadorTaxa, ResumoTurno, executar_lotes
+from teste_industry import criar_workflow_industrial, historico
+
+NUM_LOTES = 200
+NUM_FORNOS = 10
+MAX_CONCORRENCIA = 16
+# Ex.: 300 RPM no provedor -> 5 requisições ao modelo por segundo
+REQUISICOES_MODELO_POR_SEGUNDO = 5
+
+
+async def main() -> None:
+    """Processa um turno completo e imprime o resumo agregado."""
+    pares = [
+        (f"L{i:04d}", f"F{(i % NUM_FORNOS) + 1:03d}") for i in range(1, NUM_LOTES + 1)
+    ]
+    limitador = LimitadorTaxa(taxa_por_segundo=REQUISICOES_MODELO_POR_SEGUNDO)
+    # Histórico do turno só no EventStore (append-only), sem sessões do agno
+    eventos = EventStore()
+    resumo = ResumoTurno()
+
+    print(f"🏭 Turno com {len(pares)} lotes - concorrência {MAX_CONCORRENCIA}")
+    print("=" * 50)
+    async for resultado in executar_lotes(
+        pares,
+        lambda: criar_workflow_industrial(limitador=limitador, eventos=eventos),
+        max_concorrencia=MAX_CONCORRENCIA,
+    ):
+        resumo.registrar(resultado)
+        eventos.registrar(
+            "ciclo_concluido",
+            run_id=resultado.run_id,
+            forno_id=resultado.forno_id,
+            lote_id=resultado.lote_id,
+            payload={"status": resultado.status, "duracao": resultado.duracao},
+        )
+        print(
+            f"[{resumo.total}/{len(pares)}] Lote {resultado.lote_id} / "
+            f"Forno {resultado.forno_id}: {resultado.status} ({resultado.duracao:.1f}s)"
+        )
+
+    print("\n📊 Resumo do Turno:")
+    print(f"Ciclos: {resumo.total} | Status: {dict(resumo.status)}")
+    print(
+        f"Vazão: {resumo.ciclos_por_minuto:.1f} ciclos/min | "
+        f"Duração média: {resumo.duracao_media:.2f}s"
+    )
+    eventos.fechar()
+    historico.gravar()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,212 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script agendador.py
+===================
+Agendador de cadência para ciclos recorrentes de produção.
+
+Cada linha de produção dispara o workflow numa grade fixa
+(`inicio + k * cadencia`), de modo que atrasos não se acumulam. Sobre a
+grade é somado um jitter por tick para espalhar as linhas. O agendador:
+
+- nunca sobrepõe duas execuções da mesma linha (o tick é pulado);
+- pula o tick quando o sistema está saturado (limite global de execuções);
+- conta ticks perdidos quando o loop acorda atrasado mais de uma cadência;
+- mede o desvio (drift) entre o horário planejado e o disparo real.
+
+Desvios e durações ficam numa janela dos últimos `JANELA_METRICAS` ticks, de
+modo que um monitor contínuo não cresce em memória; os percentis refletem
+o comportamento recente da linha.
+"""
+import asyncio
+import random
+import statistics
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+# Ticks mais recentes usados nos percentis de desvio e duração de cada linha:
+JANELA_METRICAS = 1000
+
+
+@dataclass
+class LinhaProducao:
+    """Configuração de uma linha de produção agendada.
+
+    Attributes:
+        nome: Identificador da linha.
+        forno_id: Forno monitorado pela linha.
+        cadencia_segundos: Intervalo entre ciclos.
+        jitter_segundos: Jitter máximo somado a cada tick (0 desativa).
+    """
+
+    nome: str
+    forno_id: str
+    cadencia_segundos: float
+    jitter_segundos: float = 0.0
+
+
+@dataclass
+class MetricasLinha:
+    """Métricas de agendamento de uma linha (contadores totais; desvios e durações da janela recente)."""
+
+    disparos: int = 0
+    concluidos: int = 0
+    erros: int = 0
+    pulados_sobreposicao: int = 0
+    pulados_saturacao: int = 0
+    ticks_perdidos: int = 0
+    desvios: deque[float] = field(default_factory=lambda: deque(maxlen=JANELA_METRICAS))
+    duracoes: deque[float] = field(default_factory=lambda: deque(maxlen=JANELA_METRICAS))
+
+    def resumo(self) -> dict:
+        """Métricas agregadas, com desvio e duração em p50/p95 (s)."""
+
+        def p(valores: deque[float], q: int) -> float:
+            if not valores:
+                return 0.0
+            if len(valores) == 1:
+                return valores[0]
+            return statistics.quantiles(valores, n=100, method="inclusive")[q - 1]
+
+        return {
+            "disparos": self.disparos,
+            "concluidos": self.concluidos,
+            "erros": self.erros,
+            "pulados_sobreposicao": self.pulados_sobreposicao,
+            "pulados_saturacao": self.pulados_saturacao,
+            "ticks_perdidos": self.ticks_perdidos,
+            "desvio_p50": p(self.desvios, 50),
+            "desvio_p95": p(self.desvios, 95),
+            "duracao_p50": p(self.duracoes, 50),
+            "duracao_p95": p(self.duracoes, 95),
+        }
+
+
+class AgendadorCadencia:
+    """Dispara ciclos do workflow em cadência fixa por linha de produção.
+
+    Attributes:
+        executar: Corrotina chamada a cada disparo com (linha, número do ciclo).
+        max_em_andamento: Limite global de ciclos simultâneos (saturação).
+        metricas: Métricas por linha.
+
+    Example:
+        >>> async def ciclo(linha, n):
+        ...     await criar_workflow_industrial(db=db).arun(
+        ...         input=f"Lote {linha.nome}-{n}, Forno {linha.forno_id}")
+        >>> agendador = AgendadorCadencia(ciclo, max_em_andamento=8)
+        >>> agendador.adicionar_linha(LinhaProducao("linha-1", "F001", cadencia_segundos=60, jitter_segundos=5))
+        >>> await agendador.executar_por(3600)
+    """
+
+    def __init__(
+        self,
+        executar: Callable[[LinhaProducao, int], Awaitable[Any]],
+        max_em_andamento: int = 8,
+        semente_jitter: Optional[int] = None,
+    ) -> None:
+        """Inicializa o agendador.
+
+        Args:
+            executar: Corrotina que executa um ciclo da linha.
+            max_em_andamento: Limite global de ciclos simultâneos.
+            semente_jitter: Semente do jitter (reprodutível em testes).
+        """
+        self.executar = executar
+        self.max_em_andamento = max_em_andamento
+        self.linhas: dict[str, LinhaProducao] = {}
+        self.metricas: dict[str, MetricasLinha] = {}
+        self._aleatorio = random.Random(semente_jitter)
+        self._em_andamento: dict[str, asyncio.Task] = {}
+        self._loops: list[asyncio.Task] = []
+
+    def adicionar_linha(self, linha: LinhaProducao) -> None:
+        """Registra uma linha de produção."""
+        if linha.cadencia_segundos <= 0:
+            raise ValueError("cadencia_segundos deve ser positiva")
+        self.linhas[linha.nome] = linha
+        self.metricas[linha.nome] = MetricasLinha()
+
+    @property
+    def saturado(self) -> bool:
+        """True se o limite global de ciclos simultâneos foi atingido."""
+        return len(self._em_andamento) >= self.max_em_andamento
+
+    async def _ciclo(self, linha: LinhaProducao, numero: int) -> None:
+        metricas = self.metricas[linha.nome]
+        inicio = time.perf_counter()
+        try:
+            await self.executar(linha, numero)
+            metricas.concluidos += 1
+        except Exception:
+            metricas.erros += 1
+        finally:
+            metricas.duracoes.append(time.perf_counter() - inicio)
+            self._em_andamento.pop(linha.nome, None)
+
+    async def _loop_linha(self, linha: LinhaProducao) -> None:
+        metricas = self.metricas[linha.nome]
+        origem = time.monotonic()
+        tick = 0
+        while True:
+            planejado = (
+                origem
+                + tick * linha.cadencia_segundos
+                + self._aleatorio.uniform(0, linha.jitter_segundos)
+            )
+            espera = planejado - time.monotonic()
+            if espera > 0:
+                await asyncio.sleep(espera)
+
+            agora = time.monotonic()
+            atraso = agora - planejado
+            metricas.desvios.append(atraso)
+            # Acordou mais de uma cadência atrasado: ticks intermediários são perdidos
+            perdidos = int(atraso // linha.cadencia_segundos)
+            if perdidos:
+                metricas.ticks_perdidos += perdidos
+            tick += 1 + perdidos
+
+            if linha.nome in self._em_andamento:
+                metricas.pulados_sobreposicao += 1
+            elif self.saturado:
+                metricas.pulados_saturacao += 1
+            else:
+                metricas.disparos += 1
+                self._em_andamento[linha.nome] = asyncio.create_task(
+                    self._ciclo(linha, tick)
+                )
+
+    def iniciar(self) -> None:
+        """Inicia o loop de cada linha no event loop corrente."""
+        self._loops = [
+            asyncio.create_task(self._loop_linha(linha)) for linha in self.linhas.values()
+        ]
+
+    async def parar(self, aguardar_ciclos: bool = True) -> None:
+        """Para os loops; opcionalmente espera os ciclos em andamento terminarem."""
+        for loop in self._loops:
+            loop.cancel()
+        await asyncio.gather(*self._loops, return_exceptions=True)
+        self._loops = []
+        ciclos = list(self._em_andamento.values())
+        if not aguardar_ciclos:
+            for ciclo in ciclos:
+                ciclo.cancel()
+        await asyncio.gather(*ciclos, return_exceptions=True)
+
+    async def executar_por(self, segundos: float) -> dict:
+        """Executa o agendador durante `segundos` e retorna as métricas."""
+        self.iniciar()
+        try:
+            await asyncio.sleep(segundos)
+        finally:
+            await self.parar()
+        return self.resumo()
+
+    def resumo(self) -> dict:
+        """Métricas de todas as linhas."""
+        return {nome: metricas.resumo() for nome, metricas in self.metricas.items()}
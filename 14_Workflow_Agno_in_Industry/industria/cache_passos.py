@@ -0,0 +1,135 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script cache_passos.py
+======================
+Memoização opcional de passos do workflow industrial.
+
+O resultado de cada passo de agente é gravado no mesmo arquivo SQLite do
+workflow, com chave (nome do passo, hash da entrada, versão dos dados das
+ferramentas, derivada da planta simulada). Numa reexecução com a mesma entrada a saída é reproduzida do
+banco, dentro do TTL, sem chamar o modelo; apenas os passos cuja entrada
+mudou são executados de novo. Entradas expiradas são removidas ao abrir o
+cache.
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from agno.run.base import RunContext
+from agno.workflow import Step, StepInput, StepOutput
+
+from industria.passos import desserializar_saida, hash_entrada, serializar_saida
+from industria.sensores import versao_dados
+
+
+class CachePassos:
+    """Cache de saídas de passos persistido no SQLite do workflow.
+
+    Attributes:
+        db_file: Arquivo SQLite (o mesmo do workflow).
+        ttl_segundos: Validade de uma entrada do cache.
+        versao_dados: Versão fixa dos dados das ferramentas, parte da chave
+            (None = `sensores.versao_dados()` da planta em uso).
+        acertos: Número de passos reproduzidos do cache.
+        falhas: Número de passos executados por não estarem no cache.
+    """
+
+    TABELA = "cache_passos"
+
+    def __init__(
+        self,
+        db_file: str = "tmp/industrial.db",
+        ttl_segundos: float = 3600,
+        versao_dados: Optional[str] = None,
+    ) -> None:
+        """Inicializa o cache e cria a tabela, se necessário.
+
+        Args:
+            db_file: Arquivo SQLite do workflow.
+            ttl_segundos: Validade das entradas em segundos.
+            versao_dados: Versão fixa dos dados das ferramentas (padrão:
+                derivada da planta simulada em uso a cada chave).
+        """
+        self.db_file = db_file
+        self.ttl_segundos = ttl_segundos
+        self.versao_dados = versao_dados
+        self.acertos = 0
+        self.falhas = 0
+        self._lock = threading.Lock()
+        Path(db_file).parent.mkdir(parents=True, exist_ok=True)
+        self._conexao = sqlite3.connect(db_file, check_same_thread=False)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute(
+            f"""CREATE TABLE IF NOT EXISTS {self.TABELA} (
+                chave TEXT PRIMARY KEY,
+                passo TEXT NOT NULL,
+                conteudo TEXT NOT NULL,
+                criado_em REAL NOT NULL
+            )"""
+        )
+        self._conexao.commit()
+        # Descarta o que expirou desde a última abertura do cache
+        self.limpar_expirados()
+
+    def chave(self, passo: Step, step_input: StepInput) -> str:
+        """Chave do cache: nome do passo, hash da entrada e versão dos dados."""
+        versao = self.versao_dados or versao_dados()
+        base = f"{passo.name}|{hash_entrada(step_input)}|{versao}"
+        return hashlib.sha256(base.encode("utf-8")).hexdigest()
+
+    def obter(self, chave: str) -> Optional[StepOutput]:
+        """Retorna a saída em cache se existir e estiver dentro do TTL."""
+        with self._lock:
+            linha = self._conexao.execute(
+                f"SELECT conteudo, criado_em FROM {self.TABELA} WHERE chave = ?",
+                (chave,),
+            ).fetchone()
+        if linha is None or time.time() - linha[1] > self.ttl_segundos:
+            return None
+        return desserializar_saida(linha[0])
+
+    def gravar(self, chave: str, passo: str, saida: StepOutput) -> None:
+        """Grava a saída de um passo bem-sucedido."""
+        with self._lock:
+            self._conexao.execute(
+                f"INSERT OR REPLACE INTO {self.TABELA} VALUES (?, ?, ?, ?)",
+                (chave, passo, serializar_saida(saida), time.time()),
+            )
+            self._conexao.commit()
+
+    def limpar_expirados(self) -> int:
+        """Remove entradas fora do TTL e retorna quantas foram removidas."""
+        with self._lock:
+            cursor = self._conexao.execute(
+                f"DELETE FROM {self.TABELA} WHERE criado_em < ?",
+                (time.time() - self.ttl_segundos,),
+            )
+            self._conexao.commit()
+        return cursor.rowcount
+
+    # Interceptador -----------------------------------------------------------
+
+    def antes(
+        self, passo: Step, step_input: StepInput, run_context: Optional[RunContext]
+    ) -> Optional[StepOutput]:
+        saida = self.obter(self.chave(passo, step_input))
+        if saida is None:
+            self.falhas += 1
+        else:
+            self.acertos += 1
+        return saida
+
+    def depois(
+        self,
+        passo: Step,
+        step_input: StepInput,
+        run_context: Optional[RunContext],
+        saida: StepOutput,
+    ) -> None:
+        if saida.success and saida.content is not None:
+            self.gravar(self.chave(passo, step_input), passo.name or "", saida)
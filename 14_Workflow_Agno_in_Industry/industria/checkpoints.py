@@ -0,0 +1,228 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script checkpoints.py
+=====================
+Checkpoints por passo e retomada de execuções do workflow industrial.
+
+Cada passo concluído é gravado no SQLite do workflow, indexado por
+(run_id, passo), junto com a entrada original da execução. Se o processo
+cair no meio do ciclo, `retomar(run_id)` executa o workflow de novo com o
+mesmo run_id: os passos já concluídos são reproduzidos a partir do banco
+(inclusive as leituras do pré-filtro de regras) e só o restante é executado.
+"""
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Optional
+
+from agno.run.base import RunContext
+from agno.workflow import Step, StepInput, StepOutput, Workflow
+
+from industria.passos import desserializar_saida, serializar_saida
+
+
+class CheckpointStore:
+    """Checkpoints duráveis de passos e registro das execuções.
+
+    Também é um interceptador: reproduz passos já gravados para o run_id
+    corrente e grava cada passo novo assim que ele termina.
+
+    Attributes:
+        db_file: Arquivo SQLite (o mesmo do workflow).
+    """
+
+    def __init__(self, db_file: str = "tmp/industrial.db") -> None:
+        """Abre o banco e cria as tabelas, se necessário.
+
+        Args:
+            db_file: Arquivo SQLite do workflow.
+        """
+        self.db_file = db_file
+        self._lock = threading.Lock()
+        Path(db_file).parent.mkdir(parents=True, exist_ok=True)
+        self._conexao = sqlite3.connect(db_file, check_same_thread=False)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        # synchronous=FULL: um checkpoint confirmado sobrevive a queda de energia
+        self._conexao.execute("PRAGMA synchronous=FULL")
+        self._conexao.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS checkpoints_execucoes (
+                run_id TEXT PRIMARY KEY,
+                session_id TEXT NOT NULL,
+                entrada TEXT,
+                dados TEXT,
+                status TEXT NOT NULL,
+                criado_em REAL NOT NULL,
+                atualizado_em REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS checkpoints_passos (
+                run_id TEXT NOT NULL,
+                passo TEXT NOT NULL,
+                saida TEXT NOT NULL,
+                criado_em REAL NOT NULL,
+                PRIMARY KEY (run_id, passo)
+            );
+            """
+        )
+        self._conexao.commit()
+
+    # Registro das execuções --------------------------------------------------
+
+    def registrar_execucao(
+        self, run_id: str, session_id: str, entrada: Any, dados: Optional[dict]
+    ) -> None:
+        """Grava a entrada de uma execução antes de iniciá-la."""
+        agora = time.time()
+        with self._lock:
+            self._conexao.execute(
+                "INSERT OR IGNORE INTO checkpoints_execucoes VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id,
+                    session_id,
+                    json.dumps(entrada, default=str),
+                    json.dumps(dados, default=str),
+                    "RUNNING",
+                    agora,
+                    agora,
+                ),
+            )
+            self._conexao.commit()
+
+    def finalizar_execucao(self, run_id: str, status: str) -> None:
+        """Marca a execução como finalizada com o status informado."""
+        with self._lock:
+            self._conexao.execute(
+                "UPDATE checkpoints_execucoes SET status = ?, atualizado_em = ? WHERE run_id = ?",
+                (status, time.time(), run_id),
+            )
+            self._conexao.commit()
+
+    def obter_execucao(self, run_id: str) -> Optional[dict]:
+        """Retorna a entrada registrada de uma execução."""
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT session_id, entrada, dados, status FROM checkpoints_execucoes WHERE run_id = ?",
+                (run_id,),
+            ).fetchone()
+        if linha is None:
+            return None
+        return {
+            "run_id": run_id,
+            "session_id": linha[0],
+            "entrada": json.loads(linha[1]),
+            "dados": json.loads(linha[2]),
+            "status": linha[3],
+        }
+
+    def execucoes_pendentes(self) -> list[str]:
+        """run_ids de execuções iniciadas e nunca finalizadas."""
+        with self._lock:
+            linhas = self._conexao.execute(
+                "SELECT run_id FROM checkpoints_execucoes WHERE status = 'RUNNING' ORDER BY criado_em"
+            ).fetchall()
+        return [linha[0] for linha in linhas]
+
+    def passos_concluidos(self, run_id: str) -> list[str]:
+        """Nomes dos passos com checkpoint gravado para a execução."""
+        with self._lock:
+            linhas = self._conexao.execute(
+                "SELECT passo FROM checkpoints_passos WHERE run_id = ? ORDER BY criado_em",
+                (run_id,),
+            ).fetchall()
+        return [linha[0] for linha in linhas]
+
+    # Interceptador -----------------------------------------------------------
+
+    def antes(
+        self, passo: Step, step_input: StepInput, run_context: Optional[RunContext]
+    ) -> Optional[StepOutput]:
+        if run_context is None:
+            return None
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT saida FROM checkpoints_passos WHERE run_id = ? AND passo = ?",
+                (run_context.run_id, passo.name),
+            ).fetchone()
+        return desserializar_saida(linha[0]) if linha else None
+
+    def depois(
+        self,
+        passo: Step,
+        step_input: StepInput,
+        run_context: Optional[RunContext],
+        saida: StepOutput,
+    ) -> None:
+        if run_context is None or not saida.success:
+            return
+        with self._lock:
+            self._conexao.execute(
+                "INSERT OR REPLACE INTO checkpoints_passos VALUES (?, ?, ?, ?)",
+                (run_context.run_id, passo.name, serializar_saida(saida), time.time()),
+            )
+            self._conexao.commit()
+
+
+def executar(
+    workflow: Workflow,
+    store: CheckpointStore,
+    input: Any,
+    additional_data: Optional[dict] = None,
+    session_id: Optional[str] = None,
+    run_id: Optional[str] = None,
+):
+    """Executa o workflow com checkpoints, registrando a entrada para retomada.
+
+    Args:
+        workflow: Workflow criado com `criar_workflow_industrial(checkpoints=store, sincrono=True)`.
+        store: Store de checkpoints.
+        input: Entrada do workflow.
+        additional_data: Dados extras (ex.: lote_id e forno_id).
+        session_id: Sessão da execução (padrão: nova sessão).
+        run_id: ID da execução (padrão: novo UUID).
+
+    Returns:
+        WorkflowRunOutput: Saída da execução.
+    """
+    run_id = run_id or str(uuid.uuid4())
+    session_id = session_id or str(uuid.uuid4())
+    store.registrar_execucao(run_id, session_id, input, additional_data)
+    saida = workflow.run(
+        input=input,
+        additional_data=additional_data,
+        session_id=session_id,
+        run_id=run_id,
+    )
+    store.finalizar_execucao(run_id, getattr(saida.status, "value", str(saida.status)))
+    return saida
+
+
+def retomar(workflow: Workflow, store: CheckpointStore, run_id: str):
+    """Retoma uma execução a partir do último passo concluído.
+
+    Args:
+        workflow: Workflow criado com `criar_workflow_industrial(checkpoints=store, sincrono=True)`.
+        store: Store de checkpoints.
+        run_id: Execução a retomar.
+
+    Returns:
+        WorkflowRunOutput: Saída da execução retomada.
+
+    Raises:
+        KeyError: Se o run_id não estiver registrado.
+    """
+    execucao = store.obter_execucao(run_id)
+    if execucao is None:
+        raise KeyError(f"Execução {run_id} não encontrada nos checkpoints")
+    return executar(
+        workflow,
+        store,
+        input=execucao["entrada"],
+        additional_data=execucao["dados"],
+        session_id=execucao["session_id"],
+        run_id=run_id,
+    )
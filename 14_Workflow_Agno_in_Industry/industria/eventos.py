@@ -0,0 +1,302 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script eventos.py
+=================
+Store append-only de execuções e eventos do workflow industrial.
+
+Ao contrário da sessão do workflow (um blob reescrito a cada execução), cada
+evento é uma linha nova numa tabela particionada por dia:
+
+- SQLite em modo WAL com `synchronous=NORMAL`;
+- uma única thread escritora que agrupa os eventos em commits em lote; a
+  fila é limitada (`max_fila`): se o banco não acompanhar, os eventos novos
+  são descartados e contados em vez de acumular memória;
+- um lote que falha (banco travado, disco cheio) é registrado no log e
+  contado em `eventos_perdidos`, e a thread segue gravando os próximos;
+- payload em JSON comprimido com zlib;
+- retenção por partição: tabelas mais antigas que `retencao_dias` são descartadas
+  com um DROP TABLE, sem DELETE linha a linha.
+"""
+import json
+import queue
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Optional
+
+from agno.run.base import RunContext
+from agno.utils.log import logger
+from agno.workflow import Step, StepInput, StepOutput
+
+_PREFIXO_PARTICAO = "eventos_"
+_FIM = object()
+
+
+class EventStore:
+    """Store append-only de eventos com escritor único e commits em lote.
+
+    Também é um interceptador de passos: grava um evento `passo_concluido`
+    para cada passo executado.
+
+    Attributes:
+        db_file: Arquivo SQLite do store.
+        tamanho_lote: Máximo de eventos por commit.
+        intervalo_flush: Tempo máximo (s) que um evento espera na fila.
+        retencao_dias: Dias de partições mantidas.
+        eventos_descartados: Eventos recusados com a fila cheia.
+        eventos_perdidos: Eventos de lotes cuja gravação falhou.
+    """
+
+    def __init__(
+        self,
+        db_file: str = "tmp/eventos_industria.db",
+        tamanho_lote: int = 1000,
+        intervalo_flush: float = 0.1,
+        retencao_dias: int = 30,
+        max_fila: int = 100_000,
+    ) -> None:
+        """Abre o banco e inicia a thread escritora.
+
+        Args:
+            db_file: Arquivo SQLite do store.
+            tamanho_lote: Máximo de eventos por commit.
+            intervalo_flush: Tempo máximo (s) que um evento espera na fila.
+            retencao_dias: Dias de partições mantidas.
+            max_fila: Eventos aguardando gravação acima dos quais `registrar` descarta.
+        """
+        self.db_file = db_file
+        self.tamanho_lote = tamanho_lote
+        self.intervalo_flush = intervalo_flush
+        self.retencao_dias = retencao_dias
+        self.eventos_descartados = 0
+        self.eventos_perdidos = 0
+        self._fila: queue.Queue = queue.Queue(maxsize=max_fila)
+        self._contadores_lock = threading.Lock()
+        self._particoes: set[str] = set()
+        self._leitura_lock = threading.Lock()
+
+        Path(db_file).parent.mkdir(parents=True, exist_ok=True)
+        self._leitor = self._conectar()
+        self._escritor = threading.Thread(
+            target=self._loop_escritor, name="event-store-writer", daemon=True
+        )
+        self._escritor.start()
+
+    def _conectar(self) -> sqlite3.Connection:
+        conexao = sqlite3.connect(self.db_file, check_same_thread=False)
+        conexao.execute("PRAGMA journal_mode=WAL")
+        conexao.execute("PRAGMA synchronous=NORMAL")
+        conexao.execute("PRAGMA temp_store=MEMORY")
+        return conexao
+
+    # Escrita -----------------------------------------------------------------
+
+    def registrar(
+        self,
+        tipo: str,
+        run_id: Optional[str] = None,
+        forno_id: Optional[str] = None,
+        lote_id: Optional[str] = None,
+        payload: Optional[dict] = None,
+        ts: Optional[float] = None,
+    ) -> None:
+        """Enfileira um evento; não bloqueia o chamador (com a fila cheia, o evento é descartado).
+
+        Args:
+            tipo: Tipo do evento (ex.: "ciclo_iniciado", "passo_concluido", "ciclo_concluido").
+            run_id: Execução do workflow.
+            forno_id: Forno do ciclo.
+            lote_id: Lote do ciclo.
+            payload: Dados do evento (gravados comprimidos).
+            ts: Timestamp epoch (padrão: agora).
+        """
+        try:
+            self._fila.put_nowait((ts or time.time(), run_id, forno_id, lote_id, tipo, payload or {}))
+        except queue.Full:
+            with self._contadores_lock:
+                self.eventos_descartados += 1
+                descartados = self.eventos_descartados
+            if descartados == 1 or descartados % 10_000 == 0:
+                logger.warning(f"EventStore: fila cheia, {descartados} eventos descartados até agora")
+
+    def _particao(self, conexao: sqlite3.Connection, ts: float) -> str:
+        """Nome da partição diária do timestamp, criando-a se necessário."""
+        nome = f"{_PREFIXO_PARTICAO}{datetime.fromtimestamp(ts):%Y%m%d}"
+        if nome not in self._particoes:
+            conexao.executescript(
+                f"""
+                CREATE TABLE IF NOT EXISTS {nome} (
+                    id INTEGER PRIMARY KEY,
+                    ts REAL NOT NULL,
+                    run_id TEXT,
+                    forno_id TEXT,
+                    lote_id TEXT,
+                    tipo TEXT NOT NULL,
+                    payload BLOB
+                );
+                CREATE INDEX IF NOT EXISTS idx_{nome}_forno ON {nome} (forno_id, tipo, ts);
+                """
+            )
+            self._particoes.add(nome)
+        return nome
+
+    def _gravar_lote(self, conexao: sqlite3.Connection, lote: list) -> None:
+        """Grava um lote de eventos num único commit."""
+        por_particao: dict[str, list] = {}
+        for ts, run_id, forno_id, lote_id, tipo, payload in lote:
+            compactado = zlib.compress(
+                json.dumps(payload, default=str, separators=(",", ":")).encode("utf-8"), 1
+            )
+            por_particao.setdefault(self._particao(conexao, ts), []).append(
+                (ts, run_id, forno_id, lote_id, tipo, compactado)
+            )
+        with conexao:
+            for particao, linhas in por_particao.items():
+                conexao.executemany(
+                    f"INSERT INTO {particao} (ts, run_id, forno_id, lote_id, tipo, payload) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    linhas,
+                )
+
+    def _loop_escritor(self) -> None:
+        """Thread escritora: agrupa eventos da fila e aplica a retenção."""
+        conexao = self._conectar()
+        ultima_retencao = 0.0
+        encerrar = False
+        while not encerrar:
+            lote = []
+            try:
+                item = self._fila.get(timeout=1.0)
+            except queue.Empty:
+                item = None
+            if item is _FIM:
+                encerrar = True
+            elif item is not None:
+                lote.append(item)
+                limite = time.monotonic() + self.intervalo_flush
+                while len(lote) < self.tamanho_lote:
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        break
+                    try:
+                        item = self._fila.get(timeout=restante)
+                    except queue.Empty:
+                        break
+                    if item is _FIM:
+                        encerrar = True
+                        break
+                    lote.append(item)
+            if lote:
+                try:
+                    self._gravar_lote(conexao, lote)
+                except Exception as exc:
+                    # Um lote com erro não derruba a thread: os próximos continuam sendo gravados
+                    with self._contadores_lock:
+                        self.eventos_perdidos += len(lote)
+                    logger.error(f"EventStore: falha ao gravar {len(lote)} eventos: {exc}")
+            if time.monotonic() - ultima_retencao > 3600:
+                ultima_retencao = time.monotonic()
+                try:
+                    self._aplicar_retencao(conexao)
+                except Exception as exc:
+                    logger.error(f"EventStore: falha ao aplicar a retenção: {exc}")
+        conexao.close()
+
+    def _aplicar_retencao(self, conexao: sqlite3.Connection) -> list[str]:
+        """Descarta partições mais antigas que a retenção."""
+        corte = f"{_PREFIXO_PARTICAO}{datetime.now() - timedelta(days=self.retencao_dias):%Y%m%d}"
+        descartadas = [p for p in self._listar_particoes(conexao) if p < corte]
+        for particao in descartadas:
+            conexao.execute(f"DROP TABLE IF EXISTS {particao}")
+            self._particoes.discard(particao)
+        conexao.commit()
+        return descartadas
+
+    def fechar(self) -> None:
+        """Grava os eventos pendentes e encerra a thread escritora."""
+        self._fila.put(_FIM)
+        self._escritor.join()
+        self._leitor.close()
+        if self.eventos_descartados or self.eventos_perdidos:
+            logger.warning(
+                f"EventStore: {self.eventos_descartados} eventos descartados (fila cheia) e "
+                f"{self.eventos_perdidos} perdidos em gravações com erro"
+            )
+
+    # Leitura -----------------------------------------------------------------
+
+    @staticmethod
+    def _listar_particoes(conexao: sqlite3.Connection) -> list[str]:
+        linhas = conexao.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE ? ORDER BY name",
+            (f"{_PREFIXO_PARTICAO}%",),
+        ).fetchall()
+        return [linha[0] for linha in linhas]
+
+    def ultimos_ciclos(self, forno_id: str, n: int = 10, tipo: str = "ciclo_concluido") -> list[dict]:
+        """Retorna os últimos `n` eventos de um forno, do mais recente ao mais antigo.
+
+        Percorre as partições da mais nova para a mais antiga e para assim que
+        tiver `n` eventos, usando o índice (forno_id, tipo, ts) de cada uma.
+
+        Args:
+            forno_id: Forno consultado.
+            n: Quantidade de eventos.
+            tipo: Tipo de evento (padrão: ciclos concluídos).
+
+        Returns:
+            list[dict]: Eventos com payload descomprimido.
+        """
+        eventos: list[dict] = []
+        with self._leitura_lock:
+            for particao in reversed(self._listar_particoes(self._leitor)):
+                linhas = self._leitor.execute(
+                    f"SELECT ts, run_id, lote_id, payload FROM {particao} "
+                    "WHERE forno_id = ? AND tipo = ? ORDER BY ts DESC LIMIT ?",
+                    (forno_id, tipo, n - len(eventos)),
+                ).fetchall()
+                eventos.extend(
+                    {
+                        "ts": ts,
+                        "run_id": run_id,
+                        "forno_id": forno_id,
+                        "lote_id": lote_id,
+                        "tipo": tipo,
+                        "payload": json.loads(zlib.decompress(payload)),
+                    }
+                    for ts, run_id, lote_id, payload in linhas
+                )
+                if len(eventos) >= n:
+                    break
+        return eventos
+
+    # Interceptador -----------------------------------------------------------
+
+    def antes(
+        self, passo: Step, step_input: StepInput, run_context: Optional[RunContext]
+    ) -> Optional[StepOutput]:
+        return None
+
+    def depois(
+        self,
+        passo: Step,
+        step_input: StepInput,
+        run_context: Optional[RunContext],
+        saida: StepOutput,
+    ) -> None:
+        dados: dict[str, Any] = step_input.additional_data or {}
+        conteudo = saida.content
+        if hasattr(conteudo, "model_dump"):
+            conteudo = conteudo.model_dump(mode="json")
+        self.registrar(
+            "passo_concluido",
+            run_id=run_context.run_id if run_context else None,
+            forno_id=dados.get("forno_id"),
+            lote_id=dados.get("lote_id"),
+            payload={"passo": passo.name, "sucesso": saida.success, "conteudo": conteudo},
+        )
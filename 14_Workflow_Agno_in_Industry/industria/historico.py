@@ -0,0 +1,255 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script historico.py
+===================
+Histórico colunar das leituras de qualidade e temperatura.
+
+Cada leitura é acumulada em memória e gravada em lote como arquivo Parquet
+(via DuckDB). A compactação é em níveis: passando de `max_arquivos` arquivos
+num nível, só os arquivos desse nível são juntados num arquivo do nível
+seguinte, de modo que o histórico antigo não é reescrito a cada compactação.
+As consultas de tendência são agregações do DuckDB sobre os arquivos
+Parquet e o buffer em memória, de modo que o agente recebe a tendência pronta
+numa única chamada, sem varrer registros brutos nem gravar arquivos.
+"""
+import re
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import duckdb
+import numpy as np
+
+# Expressões de agrupamento aceitas pelas consultas de tendência:
+AGRUPAMENTOS = {
+    "hora": "date_trunc('hour', ts)",
+    "dia": "date_trunc('day', ts)",
+    "semana": "date_trunc('week', ts)",
+}
+
+_ESQUEMAS = {
+    "qualidade": [("ts", "TIMESTAMP"), ("lote_id", "VARCHAR"), ("resultado", "VARCHAR"), ("defeitos", "INTEGER")],
+    "temperatura": [("ts", "TIMESTAMP"), ("forno_id", "VARCHAR"), ("temperatura", "INTEGER"), ("status", "VARCHAR")],
+}
+
+# Arquivos compactados levam o nível no nome (compactado2-xxxx.parquet); os
+# gravados pelo buffer são o nível 0.
+_PADRAO_NIVEL = re.compile(r"^compactado(\d*)-")
+
+
+def _nivel(arquivo: Path) -> int:
+    casamento = _PADRAO_NIVEL.match(arquivo.name)
+    if casamento is None:
+        return 0
+    return int(casamento.group(1) or 1)
+
+
+def _destino(arquivo: Path) -> str:
+    """Destino de COPY como literal SQL escapado (COPY ... TO não aceita parâmetro)."""
+    return "'" + str(arquivo).replace("'", "''") + "'"
+
+
+class HistoricoQualidade:
+    """Store colunar (Parquet + DuckDB) de leituras de qualidade e temperatura.
+
+    Attributes:
+        pasta: Pasta raiz dos arquivos Parquet.
+        tamanho_lote: Leituras acumuladas antes de gravar um arquivo.
+        max_arquivos: Arquivos de um nível acima dos quais o nível é compactado.
+    """
+
+    def __init__(
+        self, pasta: str = "tmp/historico_qualidade", tamanho_lote: int = 500, max_arquivos: int = 20
+    ) -> None:
+        """Inicializa o store.
+
+        Args:
+            pasta: Pasta raiz dos arquivos Parquet.
+            tamanho_lote: Leituras acumuladas antes de gravar um arquivo.
+            max_arquivos: Arquivos de um nível acima dos quais o nível é compactado.
+        """
+        self.pasta = Path(pasta)
+        self.tamanho_lote = tamanho_lote
+        self.max_arquivos = max_arquivos
+        self._buffers: dict[str, list[tuple]] = {nome: [] for nome in _ESQUEMAS}
+        self._lock = threading.Lock()
+
+    # Escrita -----------------------------------------------------------------
+
+    def registrar_qualidade(self, leitura: dict) -> None:
+        """Acrescenta uma leitura de `ler_qualidade_lote`."""
+        self._acrescentar("qualidade", (
+            leitura["timestamp"],
+            leitura["lote_id"],
+            leitura["resultado"],
+            int(leitura.get("defeitos", 0)),
+        ))
+
+    def registrar_temperatura(self, leitura: dict) -> None:
+        """Acrescenta uma leitura de `ler_temperatura_forno`."""
+        self._acrescentar("temperatura", (
+            leitura["timestamp"],
+            leitura["forno_id"],
+            int(leitura["temperatura"]),
+            leitura["status"],
+        ))
+
+    def _acrescentar(self, tabela: str, linha: tuple) -> None:
+        with self._lock:
+            self._buffers[tabela].append(linha)
+            if len(self._buffers[tabela]) >= self.tamanho_lote:
+                self._gravar(tabela)
+
+    def _registrar_buffer(self, conexao: duckdb.DuckDBPyConnection, tabela: str) -> str:
+        """Expõe o buffer da tabela à conexão e retorna o SELECT tipado (chamar com o lock)."""
+        # Colunas como arrays numpy lidos direto pelo DuckDB (parâmetros Python
+        # e executemany convertem valor a valor); o timestamp segue como texto ISO.
+        conexao.register("buffer", {
+            nome: np.array(valores)
+            for (nome, _), valores in zip(_ESQUEMAS[tabela], zip(*self._buffers[tabela]))
+        })
+        colunas = ", ".join(f"CAST({nome} AS {tipo}) AS {nome}" for nome, tipo in _ESQUEMAS[tabela])
+        return f"SELECT {colunas} FROM buffer"
+
+    def _gravar(self, tabela: str) -> None:
+        """Grava o buffer da tabela num novo arquivo Parquet (chamar com o lock)."""
+        if not self._buffers[tabela]:
+            return
+        # A pasta só é criada na primeira gravação (importar o workflow não cria nada em disco)
+        (self.pasta / tabela).mkdir(parents=True, exist_ok=True)
+        arquivo = self.pasta / tabela / f"{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}.parquet"
+        with duckdb.connect() as conexao:
+            selecao = self._registrar_buffer(conexao, tabela)
+            conexao.execute(f"COPY ({selecao}) TO {_destino(arquivo)} (FORMAT PARQUET, COMPRESSION ZSTD)")
+        self._buffers[tabela] = []
+        self._compactar_niveis(tabela)
+
+    def gravar(self) -> None:
+        """Grava todos os buffers pendentes."""
+        with self._lock:
+            for tabela in _ESQUEMAS:
+                self._gravar(tabela)
+
+    def compactar(self, tabela: str = "qualidade") -> None:
+        """Grava o buffer e junta os arquivos Parquet de uma tabela num único arquivo ordenado por ts."""
+        with self._lock:
+            self._gravar(tabela)
+            self._compactar(tabela)
+
+    def _compactar(self, tabela: str) -> None:
+        """Junta todos os arquivos Parquet da tabela (chamar com o lock)."""
+        arquivos = sorted((self.pasta / tabela).glob("*.parquet"))
+        if len(arquivos) >= 2:
+            self._juntar(arquivos, max(_nivel(a) for a in arquivos) + 1)
+
+    def _compactar_niveis(self, tabela: str) -> None:
+        """Compacta cada nível que passou de `max_arquivos` arquivos (chamar com o lock).
+
+        Um arquivo novo só reescreve os arquivos pequenos do nível 0; o nível
+        seguinte só é compactado depois de acumular `max_arquivos` desses.
+        """
+        nivel = 0
+        while True:
+            arquivos = sorted(a for a in (self.pasta / tabela).glob("*.parquet") if _nivel(a) == nivel)
+            if len(arquivos) <= self.max_arquivos:
+                return
+            self._juntar(arquivos, nivel + 1)
+            nivel += 1
+
+    def _juntar(self, arquivos: list[Path], nivel: int) -> None:
+        """Grava `arquivos` num único arquivo do `nivel`, ordenado por ts, e os apaga."""
+        destino = arquivos[0].parent / f"compactado{nivel}-{uuid.uuid4().hex[:8]}.parquet"
+        with duckdb.connect() as conexao:
+            conexao.execute(
+                f"COPY (SELECT * FROM read_parquet(?) ORDER BY ts) TO {_destino(destino)} "
+                "(FORMAT PARQUET, COMPRESSION ZSTD)",
+                [[str(a) for a in arquivos]],
+            )
+        for arquivo in arquivos:
+            arquivo.unlink()
+
+    # Consultas ---------------------------------------------------------------
+
+    def _consultar(self, tabela: str, sql: str, parametros: list) -> list[dict]:
+        # Com o lock: a compactação não apaga arquivos durante a leitura e o
+        # buffer não é gravado entre a leitura dos arquivos e a dele
+        with self._lock, duckdb.connect() as conexao:
+            fontes = []
+            if any((self.pasta / tabela).glob("*.parquet")):
+                # O caminho vai como parâmetro; vem antes dos demais `?` da consulta
+                fontes.append("SELECT * FROM read_parquet(?)")
+                parametros = [str(self.pasta / tabela / "*.parquet"), *parametros]
+            if self._buffers[tabela]:
+                fontes.append(self._registrar_buffer(conexao, tabela))
+            if not fontes:
+                return []
+            fonte = "(" + " UNION ALL BY NAME ".join(fontes) + ")"
+            cursor = conexao.execute(sql.format(fonte=fonte), parametros)
+            colunas = [c[0] for c in cursor.description]
+            return [dict(zip(colunas, linha)) for linha in cursor.fetchall()]
+
+    def tendencia_qualidade(self, agrupar_por: str = "dia", ultimos_lotes: int = 10_000) -> list[dict]:
+        """Tendência de defeitos e aprovação dos últimos lotes, agrupada por período.
+
+        Args:
+            agrupar_por: "hora", "dia", "semana" ou "resultado".
+            ultimos_lotes: Quantidade de lotes mais recentes considerados.
+
+        Returns:
+            list[dict]: Uma linha por grupo com lotes, defeitos e taxa de aprovação.
+        """
+        if agrupar_por == "resultado":
+            grupo = "resultado"
+        elif agrupar_por in AGRUPAMENTOS:
+            grupo = AGRUPAMENTOS[agrupar_por]
+        else:
+            raise ValueError(f"agrupar_por inválido: {agrupar_por}")
+        # Um lote relido (ex.: pela ferramenta do agente) conta uma vez, pela leitura mais recente
+        sql = f"""
+            WITH lotes AS (
+                SELECT * FROM {{fonte}}
+                QUALIFY row_number() OVER (PARTITION BY lote_id ORDER BY ts DESC) = 1
+            ),
+            recentes AS (SELECT * FROM lotes ORDER BY ts DESC LIMIT ?)
+            SELECT CAST({grupo} AS VARCHAR) AS grupo,
+                   count(*) AS lotes,
+                   sum(defeitos) AS defeitos_total,
+                   round(avg(defeitos), 3) AS media_defeitos,
+                   round(avg(CASE WHEN resultado = 'aprovado' THEN 1 ELSE 0 END), 4) AS taxa_aprovacao
+            FROM recentes GROUP BY 1 ORDER BY 1
+        """
+        return self._consultar("qualidade", sql, [ultimos_lotes])
+
+    def tendencia_temperatura(
+        self, forno_id: Optional[str] = None, agrupar_por: str = "hora", ultimas_leituras: int = 10_000
+    ) -> list[dict]:
+        """Tendência de temperatura (média, mínimo, máximo e alertas) por período.
+
+        Args:
+            forno_id: Forno consultado (None = todos).
+            agrupar_por: "hora", "dia" ou "semana".
+            ultimas_leituras: Quantidade de leituras mais recentes consideradas.
+
+        Returns:
+            list[dict]: Uma linha por (período, forno).
+        """
+        if agrupar_por not in AGRUPAMENTOS:
+            raise ValueError(f"agrupar_por inválido: {agrupar_por}")
+        filtro = "WHERE forno_id = ?" if forno_id else ""
+        parametros = [forno_id] if forno_id else []
+        sql = f"""
+            WITH recentes AS (SELECT * FROM {{fonte}} {filtro} ORDER BY ts DESC LIMIT ?)
+            SELECT CAST({AGRUPAMENTOS[agrupar_por]} AS VARCHAR) AS grupo,
+                   forno_id,
+                   count(*) AS leituras,
+                   round(avg(temperatura), 1) AS media,
+                   min(temperatura) AS minima,
+                   max(temperatura) AS maxima,
+                   sum(CASE WHEN status = 'alerta' THEN 1 ELSE 0 END) AS alertas
+            FROM recentes GROUP BY 1, 2 ORDER BY 1, 2
+        """
+        return self._consultar("temperatura", sql, parametros + [ultimas_leituras])
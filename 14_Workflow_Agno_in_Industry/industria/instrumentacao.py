@@ -0,0 +1,312 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script instrumentacao.py
+========================
+Tempo por passo e caminho crítico das execuções do workflow industrial.
+
+Para cada passo (inclusive os ramos do `Parallel`) registra início/fim,
+tempo de modelo, tempo de ferramentas e tokens; para cada `Condition`
+registra o tempo do avaliador. A partir da estrutura do workflow calcula o
+caminho crítico de cada execução (JSON e cascata no terminal) e percentis
+agregados entre execuções. Só as `max_execucoes` execuções mais recentes
+são mantidas, de modo que um processo de longa duração não acumula memória.
+"""
+import functools
+import json
+import statistics
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Optional
+
+from agno.run.base import RunContext
+from agno.workflow import Condition, Parallel, Step, StepInput, StepOutput
+
+from industria.passos import interceptar
+
+# run_id da execução corrente; propagado aos ramos do Parallel pelo Agno (copy_context)
+_run_atual: ContextVar[Optional[str]] = ContextVar("run_atual", default=None)
+# (run_id, passo) em execução; o hook de ferramenta soma o tempo nessa chave. O
+# run_id do agente só existe depois que o passo começa, por isso não serve de chave.
+_passo_atual: ContextVar[Optional[tuple[str, str]]] = ContextVar("passo_atual", default=None)
+
+
+@dataclass
+class Trecho:
+    """Intervalo medido de um passo ou avaliador.
+
+    Attributes:
+        nome: Nome do passo ou da Condition.
+        tipo: "passo" ou "avaliador".
+        inicio: Início (segundos desde o começo da execução).
+        fim: Fim (segundos desde o começo da execução).
+        tempo_modelo: Tempo gasto no modelo (s).
+        tempo_ferramentas: Tempo gasto em ferramentas (s).
+        tokens_entrada: Tokens de entrada do modelo.
+        tokens_saida: Tokens de saída do modelo.
+    """
+
+    nome: str
+    tipo: str
+    inicio: float
+    fim: float
+    tempo_modelo: float = 0.0
+    tempo_ferramentas: float = 0.0
+    tokens_entrada: int = 0
+    tokens_saida: int = 0
+
+    @property
+    def duracao(self) -> float:
+        return self.fim - self.inicio
+
+
+@dataclass
+class RegistroExecucao:
+    """Trechos medidos de uma execução do workflow."""
+
+    run_id: str
+    inicio: float = field(default_factory=time.perf_counter)
+    trechos: list[Trecho] = field(default_factory=list)
+
+    def trecho(self, nome: str) -> Optional[Trecho]:
+        """Último trecho com o nome informado."""
+        for trecho in reversed(self.trechos):
+            if trecho.nome == nome:
+                return trecho
+        return None
+
+
+def _percentil(valores: list[float], p: int) -> float:
+    if len(valores) == 1:
+        return valores[0]
+    return statistics.quantiles(valores, n=100, method="inclusive")[p - 1]
+
+
+class Instrumentacao:
+    """Coletor de tempos do workflow; interceptador de passos e hook de ferramentas.
+
+    Attributes:
+        execucoes: Registros das execuções mais recentes, da mais antiga à mais nova.
+        max_execucoes: Execuções mantidas; ao passar do limite a mais antiga é descartada.
+
+    Example:
+        >>> instr = Instrumentacao()
+        >>> wf = criar_workflow_industrial(instrumentacao=instr, sincrono=True)
+        >>> saida = wf.run(input="Lote L001, Forno F001")
+        >>> print(instr.cascata(saida.run_id))
+        >>> print(json.dumps(instr.percentis(), indent=2))
+    """
+
+    def __init__(self, max_execucoes: int = 1000) -> None:
+        self.max_execucoes = max_execucoes
+        self.execucoes: OrderedDict[str, RegistroExecucao] = OrderedDict()
+        self._estrutura: list = []
+        self._inicios: dict[tuple[str, str], float] = {}
+        self._ferramentas: dict[tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+    # Instalação --------------------------------------------------------------
+
+    def instrumentar(self, passos: list) -> list:
+        """Instrumenta passos e avaliadores e guarda a estrutura para o caminho crítico."""
+        self._envolver_avaliadores(passos)
+        passos = interceptar(passos, self, apenas_agentes=False)
+        self._estrutura = passos
+        return passos
+
+    def _envolver_avaliadores(self, passos: list) -> None:
+        for passo in passos:
+            if isinstance(passo, Condition) and callable(passo.evaluator):
+                passo.evaluator = self._avaliador_medido(passo.name or "condition", passo.evaluator)
+            if isinstance(passo, (Parallel, Condition)):
+                self._envolver_avaliadores(passo.steps)
+
+    def _avaliador_medido(self, nome: str, avaliador: Callable) -> Callable:
+        @functools.wraps(avaliador)
+        def medido(*args: Any, **kwargs: Any) -> Any:
+            inicio = time.perf_counter()
+            try:
+                return avaliador(*args, **kwargs)
+            finally:
+                registro = self._registro(_run_atual.get())
+                if registro is not None:
+                    self._adicionar(registro, Trecho(
+                        nome=nome,
+                        tipo="avaliador",
+                        inicio=inicio - registro.inicio,
+                        fim=time.perf_counter() - registro.inicio,
+                    ))
+        return medido
+
+    def hook_ferramenta(
+        self,
+        function_name: str,
+        function_call: Callable,
+        arguments: dict,
+    ) -> Any:
+        """`tool_hook` dos agentes: soma o tempo de ferramenta ao passo em execução."""
+        inicio = time.perf_counter()
+        try:
+            return function_call(**arguments)
+        finally:
+            chave = _passo_atual.get()
+            if chave is not None:
+                with self._lock:
+                    self._ferramentas[chave] = (
+                        self._ferramentas.get(chave, 0.0) + time.perf_counter() - inicio
+                    )
+
+    # Coleta ------------------------------------------------------------------
+
+    def _registro(self, run_id: Optional[str]) -> Optional[RegistroExecucao]:
+        if run_id is None:
+            return None
+        with self._lock:
+            if run_id not in self.execucoes:
+                self.execucoes[run_id] = RegistroExecucao(run_id=run_id)
+                # Descarta as mais antigas (já concluídas): relatórios e percentis ficam na janela recente
+                while len(self.execucoes) > self.max_execucoes:
+                    self.execucoes.popitem(last=False)
+            return self.execucoes[run_id]
+
+    def _adicionar(self, registro: RegistroExecucao, trecho: Trecho) -> None:
+        with self._lock:
+            registro.trechos.append(trecho)
+
+    def antes(
+        self, passo: Step, step_input: StepInput, run_context: Optional[RunContext]
+    ) -> Optional[StepOutput]:
+        if run_context is not None:
+            chave = (run_context.run_id, passo.name or "")
+            _run_atual.set(run_context.run_id)
+            _passo_atual.set(chave)
+            self._registro(run_context.run_id)
+            with self._lock:
+                self._inicios[chave] = time.perf_counter()
+                self._ferramentas.pop(chave, None)
+        return None
+
+    def depois(
+        self,
+        passo: Step,
+        step_input: StepInput,
+        run_context: Optional[RunContext],
+        saida: StepOutput,
+    ) -> None:
+        if run_context is None:
+            return
+        fim = time.perf_counter()
+        chave = (run_context.run_id, passo.name or "")
+        registro = self._registro(run_context.run_id)
+        with self._lock:
+            # Passo reproduzido por outro interceptador (cache/checkpoint): sem `antes`, duração zero
+            inicio = self._inicios.pop(chave, fim)
+            ferramentas = self._ferramentas.pop(chave, 0.0)
+        metricas = saida.metrics
+        duracao_agente = (metricas.duration or 0.0) if metricas else 0.0
+        self._adicionar(registro, Trecho(
+            nome=passo.name or "",
+            tipo="passo",
+            inicio=inicio - registro.inicio,
+            fim=fim - registro.inicio,
+            tempo_modelo=max(0.0, duracao_agente - ferramentas),
+            tempo_ferramentas=ferramentas,
+            tokens_entrada=metricas.input_tokens if metricas else 0,
+            tokens_saida=metricas.output_tokens if metricas else 0,
+        ))
+
+    # Relatórios --------------------------------------------------------------
+
+    def _caminho(self, passos: list, registro: RegistroExecucao) -> tuple[float, list[str]]:
+        """Duração e nomes do caminho crítico de uma lista sequencial de passos."""
+        total, caminho = 0.0, []
+        for passo in passos:
+            if isinstance(passo, Parallel):
+                ramos = [self._caminho([ramo], registro) for ramo in passo.steps]
+                duracao, nomes = max(ramos, default=(0.0, []))
+            elif isinstance(passo, Condition):
+                avaliador = registro.trecho(passo.name or "condition")
+                duracao, nomes = self._caminho(passo.steps, registro)
+                if avaliador is not None:
+                    duracao += avaliador.duracao
+                    nomes = [passo.name or "condition", *nomes]
+            else:
+                trecho = registro.trecho(passo.name or "")
+                duracao, nomes = (trecho.duracao, [trecho.nome]) if trecho else (0.0, [])
+            total += duracao
+            caminho.extend(nomes)
+        return total, caminho
+
+    def relatorio(self, run_id: str) -> dict:
+        """Relatório JSON-serializável de uma execução, com o caminho crítico."""
+        registro = self.execucoes[run_id]
+        duracao_critica, caminho = self._caminho(self._estrutura, registro)
+        fim = max((t.fim for t in registro.trechos), default=0.0)
+        return {
+            "run_id": run_id,
+            "duracao_total": fim,
+            "duracao_caminho_critico": duracao_critica,
+            "caminho_critico": caminho,
+            "tempo_modelo": sum(t.tempo_modelo for t in registro.trechos),
+            "tempo_ferramentas": sum(t.tempo_ferramentas for t in registro.trechos),
+            "tokens_entrada": sum(t.tokens_entrada for t in registro.trechos),
+            "tokens_saida": sum(t.tokens_saida for t in registro.trechos),
+            "trechos": [
+                {**asdict(t), "duracao": t.duracao}
+                for t in sorted(registro.trechos, key=lambda t: t.inicio)
+            ],
+        }
+
+    def relatorio_json(self, run_id: str) -> str:
+        """Relatório da execução em JSON."""
+        return json.dumps(self.relatorio(run_id), indent=2, ensure_ascii=False)
+
+    def cascata(self, run_id: str, largura: int = 50) -> str:
+        """Cascata (waterfall) da execução para o terminal; █ marca o caminho crítico."""
+        dados = self.relatorio(run_id)
+        total = dados["duracao_total"] or 1e-9
+        critico = set(dados["caminho_critico"])
+        linhas = [f"Execução {run_id} - {dados['duracao_total']:.2f}s"]
+        for t in dados["trechos"]:
+            inicio = int(t["inicio"] / total * largura)
+            tamanho = max(1, int(t["duracao"] / total * largura))
+            barra = ("█" if t["nome"] in critico else "▒") * tamanho
+            linhas.append(
+                f"{t['nome'][:24]:<24} |{' ' * inicio}{barra:<{largura - inicio}}| "
+                f"{t['duracao']:6.2f}s  modelo {t['tempo_modelo']:5.2f}s  "
+                f"ferram. {t['tempo_ferramentas']:5.2f}s  "
+                f"tokens {t['tokens_entrada']}/{t['tokens_saida']}"
+            )
+        return "\n".join(linhas)
+
+    def percentis(self) -> dict:
+        """Percentis p50/p95/p99 de duração, modelo e ferramentas por passo, entre execuções."""
+        por_nome: dict[str, dict[str, list[float]]] = {}
+        totais = []
+        with self._lock:
+            registros = list(self.execucoes.values())
+        for registro in registros:
+            totais.append(max((t.fim for t in registro.trechos), default=0.0))
+            for t in registro.trechos:
+                metricas = por_nome.setdefault(
+                    t.nome, {"duracao": [], "tempo_modelo": [], "tempo_ferramentas": []}
+                )
+                metricas["duracao"].append(t.duracao)
+                metricas["tempo_modelo"].append(t.tempo_modelo)
+                metricas["tempo_ferramentas"].append(t.tempo_ferramentas)
+
+        def resumo(valores: list[float]) -> dict:
+            return {f"p{p}": _percentil(valores, p) for p in (50, 95, 99)}
+
+        return {
+            "execucoes": len(registros),
+            "ciclo": resumo(totais) if totais else {},
+            "passos": {
+                nome: {metrica: resumo(valores) for metrica, valores in metricas.items()}
+                for nome, metricas in por_nome.items()
+            },
+        }
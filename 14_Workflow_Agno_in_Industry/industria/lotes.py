@@ -0,0 +1,228 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script lotes.py
+===============
+Execução concorrente do workflow industrial para muitos pares (lote, forno).
+
+Cada par roda numa instância própria do workflow, com `session_id` exclusivo
+no banco, sob um limite global de concorrência. As requisições ao modelo
+passam por um limitador de taxa compartilhado e os resultados são entregues
+à medida que cada execução termina.
+"""
+import asyncio
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, Optional
+
+from agno.models.base import Model
+from agno.workflow import Workflow
+
+
+class LimitadorTaxa:
+    """Token bucket compartilhado entre todas as execuções, síncronas ou assíncronas.
+
+    Aplicado ao modelo dos agentes com `limitar`: cada requisição ao provedor
+    (inclusive as rodadas de ferramentas e as novas tentativas) consome uma
+    ficha, em `run` e em `arun`.
+
+    Attributes:
+        taxa_por_segundo: Fichas repostas por segundo.
+        capacidade: Rajada máxima permitida.
+    """
+
+    def __init__(self, taxa_por_segundo: float, capacidade: Optional[int] = None) -> None:
+        """Inicializa o limitador.
+
+        Args:
+            taxa_por_segundo: Fichas repostas por segundo (ex.: RPM do provedor / 60).
+            capacidade: Rajada máxima (padrão: uma taxa por segundo, mínimo 1).
+        """
+        if taxa_por_segundo <= 0:
+            raise ValueError("taxa_por_segundo deve ser positiva")
+        self.taxa_por_segundo = taxa_por_segundo
+        self.capacidade = capacidade or max(1, int(taxa_por_segundo))
+        self._fichas = float(self.capacidade)
+        self._ultimo = time.monotonic()
+        # Lock de thread: o mesmo limitador atende o event loop e execuções síncronas
+        self._lock = threading.Lock()
+
+    def _reservar(self) -> float:
+        """Consome uma ficha (podendo ficar devendo) e retorna a espera até ela existir."""
+        with self._lock:
+            agora = time.monotonic()
+            self._fichas = min(
+                self.capacidade, self._fichas + (agora - self._ultimo) * self.taxa_por_segundo
+            )
+            self._ultimo = agora
+            self._fichas -= 1
+            return max(0.0, -self._fichas / self.taxa_por_segundo)
+
+    async def aguardar(self) -> None:
+        """Aguarda (sem bloquear o event loop) até haver uma ficha disponível e a consome."""
+        espera = self._reservar()
+        if espera > 0:
+            await asyncio.sleep(espera)
+
+    def aguardar_sync(self) -> None:
+        """Versão síncrona de `aguardar`."""
+        espera = self._reservar()
+        if espera > 0:
+            time.sleep(espera)
+
+    def limitar(self, modelo: Model) -> Model:
+        """Faz cada requisição do modelo aguardar uma ficha; retorna o próprio modelo.
+
+        Envolve `invoke`, `ainvoke` e as versões em stream da instância, que o
+        agno chama uma vez por requisição ao provedor. Aplicar duas vezes ao
+        mesmo modelo (ex.: compartilhado entre agentes) não dobra a espera.
+        """
+        if getattr(modelo, "_limitador_taxa", None) is self:
+            return modelo
+        invoke, ainvoke = modelo.invoke, modelo.ainvoke
+        invoke_stream, ainvoke_stream = modelo.invoke_stream, modelo.ainvoke_stream
+
+        def invoke_limitado(*args: Any, **kwargs: Any) -> Any:
+            self.aguardar_sync()
+            return invoke(*args, **kwargs)
+
+        async def ainvoke_limitado(*args: Any, **kwargs: Any) -> Any:
+            await self.aguardar()
+            return await ainvoke(*args, **kwargs)
+
+        def invoke_stream_limitado(*args: Any, **kwargs: Any) -> Iterator[Any]:
+            self.aguardar_sync()
+            yield from invoke_stream(*args, **kwargs)
+
+        async def ainvoke_stream_limitado(*args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+            await self.aguardar()
+            async for resposta in ainvoke_stream(*args, **kwargs):
+                yield resposta
+
+        modelo.invoke = invoke_limitado
+        modelo.ainvoke = ainvoke_limitado
+        modelo.invoke_stream = invoke_stream_limitado
+        modelo.ainvoke_stream = ainvoke_stream_limitado
+        modelo._limitador_taxa = self
+        return modelo
+
+
+@dataclass
+class ResultadoLote:
+    """Resultado de uma execução do workflow para um par (lote, forno).
+
+    Attributes:
+        lote_id: Lote processado.
+        forno_id: Forno processado.
+        session_id: Sessão exclusiva da execução no banco.
+        run_id: ID da execução do workflow.
+        status: Status do RunStatus ("COMPLETED", "ERROR", "CANCELLED"...).
+        conteudo: Relatório final do ciclo.
+        duracao: Duração da execução em segundos.
+        erro: Mensagem de erro, se houver.
+    """
+
+    lote_id: str
+    forno_id: str
+    session_id: str
+    run_id: Optional[str] = None
+    status: str = "PENDING"
+    conteudo: Optional[str] = None
+    duracao: float = 0.0
+    erro: Optional[str] = None
+
+
+@dataclass
+class ResumoTurno:
+    """Agregado dos resultados de um turno, atualizado a cada execução concluída."""
+
+    total: int = 0
+    status: Counter = field(default_factory=Counter)
+    duracao_total: float = 0.0
+    inicio: float = field(default_factory=time.monotonic)
+
+    def registrar(self, resultado: ResultadoLote) -> None:
+        """Acrescenta um resultado ao agregado."""
+        self.total += 1
+        self.status[resultado.status] += 1
+        self.duracao_total += resultado.duracao
+
+    @property
+    def ciclos_por_minuto(self) -> float:
+        """Vazão observada desde o início do turno."""
+        decorrido = time.monotonic() - self.inicio
+        return self.total * 60 / decorrido if decorrido > 0 else 0.0
+
+    @property
+    def duracao_media(self) -> float:
+        """Duração média de um ciclo em segundos."""
+        return self.duracao_total / self.total if self.total else 0.0
+
+
+async def _executar_um(
+    fabrica: Callable[[], Workflow],
+    lote_id: str,
+    forno_id: str,
+    semaforo: asyncio.Semaphore,
+) -> ResultadoLote:
+    """Executa um ciclo isolado, respeitando o limite de concorrência."""
+    session_id = f"{lote_id}-{forno_id}-{uuid.uuid4().hex[:8]}"
+    resultado = ResultadoLote(lote_id=lote_id, forno_id=forno_id, session_id=session_id)
+    async with semaforo:
+        inicio = time.perf_counter()
+        try:
+            saida = await fabrica().arun(
+                input=f"Iniciar ciclo de produção - Lote {lote_id}, Forno {forno_id}. "
+                "IMPORTANTE: Responder APENAS em português brasileiro.",
+                additional_data={"lote_id": lote_id, "forno_id": forno_id},
+                session_id=session_id,
+            )
+            resultado.run_id = saida.run_id
+            resultado.status = getattr(saida.status, "value", str(saida.status))
+            resultado.conteudo = str(saida.content) if saida.content is not None else None
+        except Exception as e:
+            resultado.status = "ERROR"
+            resultado.erro = str(e)
+        resultado.duracao = time.perf_counter() - inicio
+    return resultado
+
+
+async def executar_lotes(
+    pares: Iterable[tuple[str, str]],
+    fabrica: Callable[[], Workflow],
+    max_concorrencia: int = 8,
+) -> AsyncIterator[ResultadoLote]:
+    """Executa o workflow para vários pares (lote, forno) de forma concorrente.
+
+    Args:
+        pares: Pares (lote_id, forno_id) a processar.
+        fabrica: Cria uma instância nova do workflow por execução
+            (ex.: `lambda: criar_workflow_industrial(limitador=limitador)`).
+        max_concorrencia: Número máximo de ciclos simultâneos.
+
+    Yields:
+        ResultadoLote: Resultado de cada ciclo assim que ele termina.
+
+    Example:
+        >>> limitador = LimitadorTaxa(taxa_por_segundo=5)
+        >>> async for r in executar_lotes(pares, lambda: criar_workflow_industrial(limitador=limitador)):
+        ...     print(r.lote_id, r.status)
+    """
+    if max_concorrencia < 1:
+        raise ValueError("max_concorrencia deve ser >= 1")
+    semaforo = asyncio.Semaphore(max_concorrencia)
+    tarefas = [
+        asyncio.create_task(_executar_um(fabrica, lote_id, forno_id, semaforo))
+        for lote_id, forno_id in pares
+    ]
+    try:
+        for proxima in asyncio.as_completed(tarefas):
+            yield await proxima
+    finally:
+        # Consumidor desistiu antes do fim: não deixar ciclos órfãos
+        for tarefa in tarefas:
+            tarefa.cancel()
@@ -0,0 +1,253 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script paralelo.py
+==================
+`Parallel` assíncrono com prazo por ramo e cancelamento antecipado.
+
+O `Parallel` do Agno espera todos os ramos (`asyncio.gather`), então um ramo
+preso numa chamada lenta ao modelo segura o ciclo inteiro. O
+`ParaleloComPrazo` executa cada ramo como uma task do asyncio e:
+
+- encerra o ramo que excede o seu prazo (saída com `success=False`);
+- com `min_sucessos=N`, cancela os ramos restantes assim que N terminarem bem;
+- com `ramo_necessario`, cancela ramos pendentes que os passos seguintes
+  não vão mais usar, reavaliado a cada ramo concluído.
+
+Ramos encerrados ou cancelados entram no resultado agregado como saídas com
+`success=False`, de modo que as Conditions seguintes decidem com o que há.
+Vale para `arun` (com ou sem stream); no `run` síncrono o comportamento é o
+do `Parallel` do Agno.
+"""
+import asyncio
+from copy import deepcopy
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+from uuid import uuid4
+
+from agno.run.workflow import ParallelExecutionCompletedEvent, ParallelExecutionStartedEvent
+from agno.utils.log import logger
+from agno.utils.merge_dict import merge_parallel_session_states
+from agno.workflow import Parallel, StepInput, StepOutput
+
+# Sinal de fim da fila de eventos do modo stream:
+_FIM = object()
+
+
+def _saida_interrompida(nome: str, motivo: str) -> StepOutput:
+    return StepOutput(step_name=nome, content=f"Ramo {nome} interrompido: {motivo}", success=False, error=motivo)
+
+
+class ParaleloComPrazo(Parallel):
+    """Parallel com prazo por ramo, "primeiros N" e cancelamento de ramos dispensáveis.
+
+    Attributes:
+        timeout_ramo: Prazo padrão de cada ramo em segundos (None = sem prazo).
+        timeouts: Prazo por nome de ramo, sobrepondo `timeout_ramo`.
+        min_sucessos: Encerra o bloco quando N ramos terminam com sucesso
+            (uma Condition não satisfeita conta como sucesso).
+        ramo_necessario: `f(nome_ramo, concluidos) -> bool`; recebe as saídas
+            dos ramos já concluídos por nome e devolve False para cancelar o
+            ramo pendente.
+
+    Example:
+        >>> ParaleloComPrazo(
+        ...     Condition(name="forno_anomalo", evaluator=forno_anomalo, steps=[...]),
+        ...     Condition(name="qualidade_anomala", evaluator=qualidade_anomala, steps=[...]),
+        ...     name="monitoramento_paralelo",
+        ...     timeout_ramo=60,
+        ...     timeouts={"qualidade_anomala": 30},
+        ... )
+    """
+
+    def __init__(
+        self,
+        *steps: Any,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        timeout_ramo: Optional[float] = None,
+        timeouts: Optional[dict[str, float]] = None,
+        min_sucessos: Optional[int] = None,
+        ramo_necessario: Optional[Callable[[str, dict[str, list[StepOutput]]], bool]] = None,
+    ) -> None:
+        super().__init__(*steps, name=name, description=description)
+        self.timeout_ramo = timeout_ramo
+        self.timeouts = timeouts or {}
+        self.min_sucessos = min_sucessos
+        self.ramo_necessario = ramo_necessario
+
+    def _nome_ramo(self, idx: int) -> str:
+        return getattr(self.steps[idx], "name", None) or f"ramo_{idx}"
+
+    def _copias_estado(self, run_context: Any, session_state: Optional[dict]) -> list[dict]:
+        """Uma cópia do session_state por ramo (mesma regra do Parallel do Agno)."""
+        if run_context is not None and run_context.session_state is not None:
+            return [run_context.session_state] * len(self.steps)
+        return [deepcopy(session_state) if session_state is not None else {} for _ in self.steps]
+
+    async def _com_prazo(self, idx: int, executar_ramo: Callable[[int], Awaitable[list[StepOutput]]]) -> list[StepOutput]:
+        nome = self._nome_ramo(idx)
+        prazo = self.timeouts.get(nome, self.timeout_ramo)
+        try:
+            return await asyncio.wait_for(executar_ramo(idx), prazo)
+        except TimeoutError:
+            logger.warning(f"Ramo {nome} excedeu o prazo de {prazo}s")
+            return [_saida_interrompida(nome, f"prazo de {prazo}s excedido")]
+        except Exception as exc:
+            logger.error(f"Ramo {nome} falhou: {exc}")
+            return [StepOutput(step_name=nome, content=f"Ramo {nome} falhou: {exc}", success=False, error=str(exc))]
+
+    async def _coordenar(
+        self, executar_ramo: Callable[[int], Awaitable[list[StepOutput]]]
+    ) -> list[StepOutput]:
+        """Executa os ramos, aplica prazos e cancelamentos e devolve as saídas na ordem dos ramos."""
+        tarefas = {
+            asyncio.create_task(self._com_prazo(idx, executar_ramo)): idx for idx in range(len(self.steps))
+        }
+        resultados: dict[int, list[StepOutput]] = {}
+        pendentes = set(tarefas)
+        sucessos = 0
+        try:
+            while pendentes:
+                concluidas, pendentes = await asyncio.wait(pendentes, return_when=asyncio.FIRST_COMPLETED)
+                for tarefa in concluidas:
+                    saidas = tarefa.result()
+                    resultados[tarefas[tarefa]] = saidas
+                    if all(saida.success is not False for saida in saidas):
+                        sucessos += 1
+
+                if self.min_sucessos is not None and sucessos >= self.min_sucessos:
+                    dispensados = {t: f"{self.min_sucessos} ramo(s) já concluídos" for t in pendentes}
+                elif self.ramo_necessario is not None:
+                    concluidos = {self._nome_ramo(i): saidas for i, saidas in resultados.items()}
+                    dispensados = {
+                        t: "dispensado pelos passos seguintes"
+                        for t in pendentes
+                        if not self.ramo_necessario(self._nome_ramo(tarefas[t]), concluidos)
+                    }
+                else:
+                    dispensados = {}
+
+                for tarefa, motivo in dispensados.items():
+                    tarefa.cancel()
+                    nome = self._nome_ramo(tarefas[tarefa])
+                    logger.info(f"Ramo {nome} cancelado: {motivo}")
+                    resultados[tarefas[tarefa]] = [_saida_interrompida(nome, motivo)]
+                pendentes -= set(dispensados)
+                await asyncio.gather(*dispensados, return_exceptions=True)
+        finally:
+            # Saída antecipada (ex.: a própria execução foi cancelada): não deixa ramos órfãos
+            for tarefa in pendentes:
+                tarefa.cancel()
+            await asyncio.gather(*pendentes, return_exceptions=True)
+
+        planas: list[StepOutput] = []
+        for idx in sorted(resultados):
+            planas.extend(resultados[idx])
+        return planas
+
+    async def aexecute(
+        self,
+        step_input: StepInput,
+        session_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        run_context: Optional[Any] = None,
+        session_state: Optional[dict] = None,
+        **kwargs: Any,
+    ) -> StepOutput:
+        self._prepare_steps()
+        estados = self._copias_estado(run_context, session_state)
+
+        async def executar_ramo(idx: int) -> list[StepOutput]:
+            saida = await self.steps[idx].aexecute(
+                step_input,
+                session_id=session_id,
+                user_id=user_id,
+                run_context=run_context,
+                session_state=estados[idx],
+                **kwargs,
+            )
+            return saida if isinstance(saida, list) else [saida]
+
+        saidas = await self._coordenar(executar_ramo)
+        if run_context is None and session_state is not None:
+            merge_parallel_session_states(session_state, estados)
+        return self._aggregate_results(saidas)
+
+    async def aexecute_stream(
+        self,
+        step_input: StepInput,
+        session_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        stream_events: bool = False,
+        stream_intermediate_steps: bool = False,
+        workflow_run_response: Optional[Any] = None,
+        step_index: Optional[Any] = None,
+        run_context: Optional[Any] = None,
+        session_state: Optional[dict] = None,
+        parent_step_id: Optional[str] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[Any]:
+        self._prepare_steps()
+        estados = self._copias_estado(run_context, session_state)
+        stream_events = stream_events or stream_intermediate_steps
+        id_paralelo = str(uuid4())
+        dados_evento = {}
+        if stream_events and workflow_run_response:
+            dados_evento = {
+                "run_id": workflow_run_response.run_id or "",
+                "workflow_name": workflow_run_response.workflow_name or "",
+                "workflow_id": workflow_run_response.workflow_id or "",
+                "session_id": workflow_run_response.session_id or "",
+                "step_name": self.name,
+                "step_index": step_index,
+                "parallel_step_count": len(self.steps),
+                "step_id": id_paralelo,
+                "parent_step_id": parent_step_id,
+            }
+            yield ParallelExecutionStartedEvent(**dados_evento)
+
+        fila: asyncio.Queue = asyncio.Queue()
+
+        async def executar_ramo(idx: int) -> list[StepOutput]:
+            # Sub-passos de um Parallel principal recebem índices 1.1, 1.2...; aninhado, o mesmo do pai
+            indice = (step_index or 0, idx) if step_index is None or isinstance(step_index, int) else step_index
+            saidas = []
+            async for evento in self.steps[idx].aexecute_stream(
+                step_input,
+                session_id=session_id,
+                user_id=user_id,
+                stream_events=stream_events,
+                workflow_run_response=workflow_run_response,
+                step_index=indice,
+                run_context=run_context,
+                session_state=estados[idx],
+                parent_step_id=id_paralelo,
+                **kwargs,
+            ):
+                if isinstance(evento, StepOutput):
+                    saidas.append(evento)
+                else:
+                    await fila.put(evento)
+            return saidas
+
+        async def coordenar() -> list[StepOutput]:
+            try:
+                return await self._coordenar(executar_ramo)
+            finally:
+                await fila.put(_FIM)
+
+        coordenador = asyncio.create_task(coordenar())
+        try:
+            while (evento := await fila.get()) is not _FIM:
+                yield evento
+            saidas = await coordenador
+        finally:
+            coordenador.cancel()
+
+        if run_context is None and session_state is not None:
+            merge_parallel_session_states(session_state, estados)
+        yield self._aggregate_results(saidas)
+
+        if dados_evento:
+            yield ParallelExecutionCompletedEvent(**dados_evento, step_results=saidas)
@@ -0,0 +1,236 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script passos.py
+================
+Interceptação de passos do workflow industrial.
+
+`PassoInterceptado` é um `Step` do Agno que consulta uma lista de
+interceptadores antes e depois da execução, nos quatro modos do Agno
+(sync, async e as respectivas versões em streaming). Um interceptador pode
+devolver uma saída pronta em `antes` (o passo não é executado) e observar a
+saída em `depois`. Quando um interceptador devolve a saída pronta (cache ou
+checkpoint), os demais ainda a recebem em `depois`, de modo que eventos e
+tempos cobrem também os passos reproduzidos. Cache, checkpoints e
+instrumentação são construídos sobre esse ponto de extensão.
+"""
+import hashlib
+import importlib
+import json
+from typing import Any, AsyncIterator, Iterator, Optional, Protocol
+
+from agno.run.base import RunContext
+from agno.workflow import Condition, Parallel, Step, StepInput, StepOutput
+from agno.workflow.types import StepType
+from agno.workflow.workflow import STEP_TYPE_MAPPING
+from pydantic import BaseModel
+
+from industria.paralelo import ParaleloComPrazo
+
+
+class Interceptador(Protocol):
+    """Contrato dos interceptadores de passo."""
+
+    def antes(
+        self, passo: Step, step_input: StepInput, run_context: Optional[RunContext]
+    ) -> Optional[StepOutput]:
+        """Retorna uma saída para pular a execução, ou None para executar."""
+        ...
+
+    def depois(
+        self,
+        passo: Step,
+        step_input: StepInput,
+        run_context: Optional[RunContext],
+        saida: StepOutput,
+    ) -> None:
+        """Observa a saída do passo (executado ou devolvido pronto por outro interceptador)."""
+        ...
+
+
+class PassoInterceptado(Step):
+    """Step que executa interceptadores em volta da execução original.
+
+    Attributes:
+        interceptadores: Interceptadores consultados na ordem da lista.
+    """
+
+    def __init__(self, *args: Any, interceptadores: Optional[list] = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.interceptadores: list[Interceptador] = list(interceptadores or [])
+
+    @classmethod
+    def de_passo(cls, passo: Step) -> "PassoInterceptado":
+        """Cria um PassoInterceptado com a mesma configuração de `passo`."""
+        return cls(
+            name=passo.name,
+            agent=passo.agent,
+            team=passo.team,
+            executor=passo.executor,
+            step_id=passo.step_id,
+            description=passo.description,
+            max_retries=passo.max_retries,
+            timeout_seconds=passo.timeout_seconds,
+            skip_on_failure=passo.skip_on_failure,
+            strict_input_validation=passo.strict_input_validation,
+            add_workflow_history=passo.add_workflow_history,
+            num_history_runs=passo.num_history_runs,
+        )
+
+    def _antes(self, step_input: StepInput, run_context: Optional[RunContext]) -> Optional[StepOutput]:
+        for interceptador in self.interceptadores:
+            saida = interceptador.antes(self, step_input, run_context)
+            if saida is not None:
+                saida.step_name = self.name
+                saida.step_id = self.step_id
+                saida.step_type = StepType.STEP
+                # Quem devolveu a saída já a tem; os demais a observam como uma execução
+                self._depois(step_input, run_context, saida, exceto=interceptador)
+                return saida
+        return None
+
+    def _depois(
+        self,
+        step_input: StepInput,
+        run_context: Optional[RunContext],
+        saida: StepOutput,
+        exceto: Optional[Interceptador] = None,
+    ) -> None:
+        for interceptador in self.interceptadores:
+            if interceptador is not exceto:
+                interceptador.depois(self, step_input, run_context, saida)
+
+    def execute(self, step_input: StepInput, *args: Any, **kwargs: Any) -> StepOutput:
+        run_context = kwargs.get("run_context")
+        pronta = self._antes(step_input, run_context)
+        if pronta is not None:
+            return pronta
+        saida = super().execute(step_input, *args, **kwargs)
+        self._depois(step_input, run_context, saida)
+        return saida
+
+    async def aexecute(self, step_input: StepInput, *args: Any, **kwargs: Any) -> StepOutput:
+        run_context = kwargs.get("run_context")
+        pronta = self._antes(step_input, run_context)
+        if pronta is not None:
+            return pronta
+        saida = await super().aexecute(step_input, *args, **kwargs)
+        self._depois(step_input, run_context, saida)
+        return saida
+
+    def execute_stream(self, step_input: StepInput, *args: Any, **kwargs: Any) -> Iterator[Any]:
+        run_context = kwargs.get("run_context")
+        pronta = self._antes(step_input, run_context)
+        if pronta is not None:
+            yield pronta
+            return
+        for evento in super().execute_stream(step_input, *args, **kwargs):
+            if isinstance(evento, StepOutput):
+                self._depois(step_input, run_context, evento)
+            yield evento
+
+    async def aexecute_stream(self, step_input: StepInput, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        run_context = kwargs.get("run_context")
+        pronta = self._antes(step_input, run_context)
+        if pronta is not None:
+            yield pronta
+            return
+        async for evento in super().aexecute_stream(step_input, *args, **kwargs):
+            if isinstance(evento, StepOutput):
+                self._depois(step_input, run_context, evento)
+            yield evento
+
+
+def registrar_tipos_passos() -> None:
+    """Registra as subclasses de passo do pacote no `STEP_TYPE_MAPPING` do Agno.
+
+    Chamada por `criar_workflow_industrial`; repetir a chamada não tem efeito.
+    """
+    # O Agno resolve o tipo do passo por `type(step)` exato (não por isinstance);
+    # sem o registro ele não reconhece as subclasses ao serializar a sessão.
+    STEP_TYPE_MAPPING[PassoInterceptado] = StepType.STEP
+    STEP_TYPE_MAPPING[ParaleloComPrazo] = StepType.PARALLEL
+
+
+def interceptar(passos: list, interceptador: Interceptador, apenas_agentes: bool = True) -> list:
+    """Acrescenta um interceptador a todos os passos folha, inclusive os aninhados.
+
+    Percorre `Parallel` e `Condition` recursivamente. Os contêineres são
+    modificados no lugar; os `Step` são trocados por `PassoInterceptado`.
+
+    Args:
+        passos: Lista de passos do workflow.
+        interceptador: Interceptador a acrescentar.
+        apenas_agentes: Se True, ignora passos de função (ex.: o pré-filtro de regras).
+
+    Returns:
+        list: Nova lista de passos.
+    """
+    resultado = []
+    for passo in passos:
+        if isinstance(passo, (Parallel, Condition)):
+            passo.steps = interceptar(passo.steps, interceptador, apenas_agentes)
+        elif isinstance(passo, Step) and (passo.agent is not None or not apenas_agentes):
+            if not isinstance(passo, PassoInterceptado):
+                passo = PassoInterceptado.de_passo(passo)
+            passo.interceptadores.append(interceptador)
+        resultado.append(passo)
+    return resultado
+
+
+def _normalizar(valor: Any) -> Any:
+    """Converte para estruturas JSON estáveis, sem carimbos de tempo."""
+    if isinstance(valor, BaseModel):
+        valor = valor.model_dump(mode="json")
+    if isinstance(valor, dict):
+        return {
+            str(k): _normalizar(v) for k, v in valor.items() if k != "timestamp"
+        }
+    if isinstance(valor, (list, tuple)):
+        return [_normalizar(v) for v in valor]
+    if isinstance(valor, (str, int, float, bool)) or valor is None:
+        return valor
+    return str(valor)
+
+
+def hash_entrada(step_input: StepInput) -> str:
+    """Hash estável do que o passo recebe (entrada, saída anterior e dados extras).
+
+    Carimbos de tempo das leituras são ignorados, de modo que a mesma leitura
+    de sensor produz o mesmo hash em execuções diferentes.
+    """
+    conteudo = {
+        "entrada": _normalizar(step_input.input),
+        "anterior": _normalizar(step_input.get_last_step_content()),
+        "dados": _normalizar(step_input.additional_data),
+    }
+    serializado = json.dumps(conteudo, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(serializado.encode("utf-8")).hexdigest()
+
+
+def serializar_saida(saida: StepOutput) -> str:
+    """Serializa conteúdo e `stop` de uma saída para gravação em banco.
+
+    Conteúdos Pydantic (ex.: `RelatorioRegras`) guardam o caminho da classe
+    para serem reconstruídos com o mesmo tipo.
+    """
+    conteudo = saida.content
+    registro: dict[str, Any] = {"stop": saida.stop}
+    if isinstance(conteudo, BaseModel):
+        classe = type(conteudo)
+        registro["modelo"] = f"{classe.__module__}:{classe.__qualname__}"
+        registro["conteudo"] = conteudo.model_dump(mode="json")
+    else:
+        registro["conteudo"] = conteudo
+    return json.dumps(registro, default=str, ensure_ascii=False)
+
+
+def desserializar_saida(texto: str) -> StepOutput:
+    """Reconstrói a StepOutput gravada por `serializar_saida`."""
+    registro = json.loads(texto)
+    conteudo = registro.get("conteudo")
+    if modelo := registro.get("modelo"):
+        modulo, nome = modelo.split(":", 1)
+        conteudo = getattr(importlib.import_module(modulo), nome).model_validate(conteudo)
+    return StepOutput(content=conteudo, stop=registro.get("stop", False))
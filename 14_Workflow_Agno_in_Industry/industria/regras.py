@@ -0,0 +1,181 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script regras.py
+================
+Motor de regras determinístico que roda antes dos agentes do workflow industrial.
+
+As faixas de temperatura dos fornos e o resultado da qualidade são avaliados
+em código. Quando tudo está nominal o ciclo termina com um relatório padrão
+(zero chamadas ao LLM); caso contrário, apenas os ativos anômalos são
+escalados para os agentes.
+"""
+import re
+from typing import Optional
+
+from agno.workflow import StepInput
+from pydantic import BaseModel, Field
+
+# Faixa nominal de operação dos fornos (°C):
+LIMITE_TEMPERATURA_MIN = 850
+LIMITE_TEMPERATURA_MAX = 1150
+
+# Número máximo de defeitos tolerados num lote aprovado:
+LIMITE_DEFEITOS = 0
+
+NOME_PASSO_REGRAS = "pre_filtro_regras"
+
+_PADRAO_LOTE = re.compile(r"\blote\s+([A-Za-z0-9_-]+)", re.IGNORECASE)
+_PADRAO_FORNO = re.compile(r"\bforno\s+([A-Za-z0-9_-]+)", re.IGNORECASE)
+
+
+class RelatorioRegras(BaseModel):
+    """Resultado da avaliação determinística de um ciclo de produção.
+
+    Attributes:
+        lote_id: Lote avaliado.
+        forno_id: Forno avaliado.
+        leitura_forno: Leitura bruta do forno.
+        leitura_qualidade: Leitura bruta do controle de qualidade.
+        anomalias_forno: Violações de regra encontradas no forno.
+        anomalias_qualidade: Violações de regra encontradas no lote.
+    """
+
+    lote_id: str = Field(description="Lote avaliado")
+    forno_id: str = Field(description="Forno avaliado")
+    leitura_forno: dict = Field(default_factory=dict, description="Leitura do forno")
+    leitura_qualidade: dict = Field(
+        default_factory=dict, description="Leitura da qualidade"
+    )
+    anomalias_forno: list[str] = Field(
+        default_factory=list, description="Anomalias do forno"
+    )
+    anomalias_qualidade: list[str] = Field(
+        default_factory=list, description="Anomalias do lote"
+    )
+
+    @property
+    def forno_anomalo(self) -> bool:
+        """True se o forno violou alguma regra."""
+        return bool(self.anomalias_forno)
+
+    @property
+    def qualidade_anomala(self) -> bool:
+        """True se o lote violou alguma regra."""
+        return bool(self.anomalias_qualidade)
+
+    @property
+    def nominal(self) -> bool:
+        """True se nenhum ativo precisa ser escalado aos agentes."""
+        return not (self.forno_anomalo or self.qualidade_anomala)
+
+    def resumo(self) -> str:
+        """Relatório padrão em português, usado quando o ciclo é nominal."""
+        linhas = [
+            f"Relatório automático do ciclo - Lote {self.lote_id}, Forno {self.forno_id}",
+            f"- Forno {self.forno_id}: {self.leitura_forno.get('temperatura')} °C "
+            f"(faixa {LIMITE_TEMPERATURA_MIN}-{LIMITE_TEMPERATURA_MAX} °C)",
+            f"- Lote {self.lote_id}: {self.leitura_qualidade.get('resultado')} "
+            f"({self.leitura_qualidade.get('defeitos', 0)} defeitos)",
+        ]
+        if self.nominal:
+            linhas.append("Todos os parâmetros dentro da faixa nominal. Nenhuma ação necessária.")
+        else:
+            linhas.extend(f"- ANOMALIA: {a}" for a in self.anomalias_forno)
+            linhas.extend(f"- ANOMALIA: {a}" for a in self.anomalias_qualidade)
+        return "\n".join(linhas)
+
+
+def avaliar_forno(leitura: dict) -> list[str]:
+    """Aplica as regras de temperatura a uma leitura de forno.
+
+    Args:
+        leitura: Leitura retornada por `ler_temperatura_forno`.
+
+    Returns:
+        list[str]: Anomalias encontradas (vazia se nominal).
+    """
+    temperatura = leitura.get("temperatura")
+    if temperatura is None:
+        return ["leitura de temperatura ausente"]
+    if temperatura < LIMITE_TEMPERATURA_MIN:
+        return [f"temperatura {temperatura} °C abaixo de {LIMITE_TEMPERATURA_MIN} °C"]
+    if temperatura > LIMITE_TEMPERATURA_MAX:
+        return [f"temperatura {temperatura} °C acima de {LIMITE_TEMPERATURA_MAX} °C"]
+    return []
+
+
+def avaliar_qualidade(leitura: dict) -> list[str]:
+    """Aplica as regras de qualidade a uma leitura de lote.
+
+    Args:
+        leitura: Leitura retornada por `ler_qualidade_lote`.
+
+    Returns:
+        list[str]: Anomalias encontradas (vazia se nominal).
+    """
+    anomalias = []
+    resultado = leitura.get("resultado")
+    if resultado != "aprovado":
+        anomalias.append(f"lote com resultado '{resultado}'")
+    defeitos = leitura.get("defeitos", 0)
+    if defeitos > LIMITE_DEFEITOS:
+        anomalias.append(f"{defeitos} defeitos encontrados")
+    return anomalias
+
+
+def avaliar_ciclo(leitura_forno: dict, leitura_qualidade: dict) -> RelatorioRegras:
+    """Avalia forno e lote de um ciclo e monta o relatório de regras.
+
+    Args:
+        leitura_forno: Leitura do forno.
+        leitura_qualidade: Leitura do lote.
+
+    Returns:
+        RelatorioRegras: Relatório com as anomalias de cada ativo.
+    """
+    return RelatorioRegras(
+        lote_id=leitura_qualidade.get("lote_id", ""),
+        forno_id=leitura_forno.get("forno_id", ""),
+        leitura_forno=leitura_forno,
+        leitura_qualidade=leitura_qualidade,
+        anomalias_forno=avaliar_forno(leitura_forno),
+        anomalias_qualidade=avaliar_qualidade(leitura_qualidade),
+    )
+
+
+def extrair_ids(step_input: StepInput) -> tuple[Optional[str], Optional[str]]:
+    """Obtém (lote_id, forno_id) do `additional_data` ou do texto de entrada.
+
+    Args:
+        step_input: Entrada do passo do workflow.
+
+    Returns:
+        tuple: (lote_id, forno_id); None para o que não foi encontrado.
+    """
+    dados = step_input.additional_data or {}
+    lote_id = dados.get("lote_id")
+    forno_id = dados.get("forno_id")
+
+    texto = step_input.get_input_as_string() or ""
+    if lote_id is None and (match := _PADRAO_LOTE.search(texto)):
+        lote_id = match.group(1)
+    if forno_id is None and (match := _PADRAO_FORNO.search(texto)):
+        forno_id = match.group(1)
+    return lote_id, forno_id
+
+
+def obter_relatorio(step_input: StepInput) -> Optional[RelatorioRegras]:
+    """Recupera o relatório produzido pelo passo de regras, se existir.
+
+    Args:
+        step_input: Entrada de um passo posterior ao pré-filtro.
+
+    Returns:
+        RelatorioRegras | None: Relatório do pré-filtro.
+    """
+    saida = step_input.get_step_output(NOME_PASSO_REGRAS)
+    if saida is None or not isinstance(saida.content, RelatorioRegras):
+        return None
+    return saida.content
@@ -0,0 +1,58 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script sensores.py
+==================
+Leituras brutas dos equipamentos da planta (fornos e controle de qualidade).
+
+As ferramentas dos agentes e o pré-filtro de regras usam as mesmas funções,
+de modo que a leitura avaliada em código é a mesma que o agente veria. Os
+dados vêm do simulador determinístico da planta (`configurar_simulador`
+troca a planta, ex.: em benchmarks). `versao_dados` identifica a planta em
+uso e invalida resultados de passos em cache quando ela muda.
+"""
+from industria.simulador import ConfiguracaoPlanta, SimuladorPlanta
+
+_simulador = SimuladorPlanta(ConfiguracaoPlanta())
+
+
+def configurar_simulador(simulador: SimuladorPlanta) -> None:
+    """Define a planta simulada usada por todas as leituras."""
+    global _simulador
+    _simulador = simulador
+
+
+def simulador_atual() -> SimuladorPlanta:
+    """Planta simulada em uso."""
+    return _simulador
+
+
+def versao_dados() -> str:
+    """Versão dos dados das ferramentas: derivada da configuração e do código da planta em uso."""
+    return _simulador.versao
+
+
+def ler_temperatura_forno(forno_id: str, lote_id: str | None = None) -> dict:
+    """Lê a temperatura atual do forno industrial.
+
+    Args:
+        forno_id: Identificador do forno (ex.: "F001").
+        lote_id: Lote em processamento (fixa a leitura do ciclo no simulador).
+
+    Returns:
+        dict: Leitura com temperatura, status e timestamp.
+    """
+    return _simulador.ler_temperatura(forno_id, lote_id)
+
+
+def ler_qualidade_lote(lote_id: str) -> dict:
+    """Lê o resultado do controle de qualidade do lote.
+
+    Args:
+        lote_id: Identificador do lote (ex.: "L001").
+
+    Returns:
+        dict: Resultado (aprovado/reprovado/retrabalho), defeitos e timestamp.
+    """
+    return _simulador.ler_qualidade(lote_id)
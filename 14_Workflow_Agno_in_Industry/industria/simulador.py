@@ -0,0 +1,162 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script simulador.py
+===================
+Simulador determinístico da planta (fornos, lotes e sensores).
+
+Todas as leituras derivam da semente: a qualidade de um lote é fixa para
+a semente (reler o lote devolve o mesmo resultado) e a temperatura lida
+para um ciclo (forno, lote) também, independentemente da ordem em que
+ciclos concorrentes chegam. Assim, duas execuções com a mesma configuração
+produzem as mesmas anomalias e o mesmo número de escalonamentos. O
+pré-filtro e a ferramenta do agente leem com o lote do ciclo, portanto o
+agente vê a mesma leitura que foi escalada; leituras sem lote (consultas
+avulsas) seguem a sequência própria de cada forno. `versao` identifica
+esse conjunto de leituras (configuração e código do simulador).
+"""
+import hashlib
+import inspect
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from datetime import datetime
+
+from industria.regras import LIMITE_TEMPERATURA_MAX, LIMITE_TEMPERATURA_MIN
+
+# Margem entre a faixa nominal sorteada e os limites das regras:
+MARGEM_NOMINAL = 20
+
+
+@dataclass
+class ConfiguracaoPlanta:
+    """Parâmetros da planta simulada.
+
+    Attributes:
+        num_fornos: Quantidade de fornos (F001, F002, ...).
+        num_lotes: Quantidade de lotes do plano de produção (L00001, ...).
+        taxa_anomalia_forno: Probabilidade de uma leitura de forno fora da faixa.
+        taxa_anomalia_qualidade: Probabilidade de um lote não aprovado.
+        latencia_sensor_min: Latência mínima de uma leitura (s).
+        latencia_sensor_max: Latência máxima de uma leitura (s).
+        semente: Semente de todas as leituras.
+    """
+
+    num_fornos: int = 3
+    num_lotes: int = 100
+    taxa_anomalia_forno: float = 0.1
+    taxa_anomalia_qualidade: float = 0.1
+    latencia_sensor_min: float = 0.0
+    latencia_sensor_max: float = 0.0
+    semente: int = 42
+
+
+class SimuladorPlanta:
+    """Fonte de dados determinística das ferramentas e do pré-filtro.
+
+    Example:
+        >>> sim = SimuladorPlanta(ConfiguracaoPlanta(num_fornos=10, semente=7))
+        >>> configurar_simulador(sim)  # industria.sensores
+        >>> sim.plano_producao()[:2]
+        [('L00001', 'F001'), ('L00002', 'F002')]
+    """
+
+    def __init__(self, config: ConfiguracaoPlanta | None = None) -> None:
+        self.config = config or ConfiguracaoPlanta()
+        self.versao = _versao(self.config)
+        self._leituras_forno: dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    @property
+    def fornos(self) -> list[str]:
+        return [f"F{i:03d}" for i in range(1, self.config.num_fornos + 1)]
+
+    def plano_producao(self) -> list[tuple[str, str]]:
+        """Pares (lote_id, forno_id) do plano, com os lotes distribuídos entre os fornos."""
+        fornos = self.fornos
+        return [
+            (f"L{i:05d}", fornos[(i - 1) % len(fornos)])
+            for i in range(1, self.config.num_lotes + 1)
+        ]
+
+    def _gerador(self, *chave: object) -> random.Random:
+        # Semente em texto: estável entre processos (não depende do hash aleatório)
+        return random.Random(":".join(str(c) for c in (self.config.semente, *chave)))
+
+    def _latencia(self, gerador: random.Random) -> None:
+        atraso = gerador.uniform(self.config.latencia_sensor_min, self.config.latencia_sensor_max)
+        if atraso > 0:
+            time.sleep(atraso)
+
+    def ler_temperatura(self, forno_id: str, lote_id: str | None = None) -> dict:
+        """Leitura de temperatura do forno.
+
+        Args:
+            forno_id: Forno lido.
+            lote_id: Lote em processamento; se informado, a leitura é fixa
+                para o par (forno, lote). Sem lote, devolve a próxima leitura
+                da sequência do forno.
+        """
+        if lote_id is not None:
+            gerador = self._gerador("forno", forno_id, "lote", lote_id)
+        else:
+            with self._lock:
+                self._leituras_forno[forno_id] += 1
+                numero = self._leituras_forno[forno_id]
+            gerador = self._gerador("forno", forno_id, numero)
+        if gerador.random() < self.config.taxa_anomalia_forno:
+            temp = (
+                gerador.randint(800, LIMITE_TEMPERATURA_MIN - 1)
+                if gerador.random() < 0.5
+                else gerador.randint(LIMITE_TEMPERATURA_MAX + 1, 1200)
+            )
+        else:
+            temp = gerador.randint(
+                LIMITE_TEMPERATURA_MIN + MARGEM_NOMINAL, LIMITE_TEMPERATURA_MAX - MARGEM_NOMINAL
+            )
+        self._latencia(gerador)
+        return {
+            "forno_id": forno_id,
+            "temperatura": temp,
+            "status": (
+                "normal"
+                if LIMITE_TEMPERATURA_MIN <= temp <= LIMITE_TEMPERATURA_MAX
+                else "alerta"
+            ),
+            "timestamp": datetime.now().isoformat(),
+        }
+
+    def ler_qualidade(self, lote_id: str) -> dict:
+        """Resultado do controle de qualidade do lote (fixo para a semente)."""
+        gerador = self._gerador("lote", lote_id)
+        if gerador.random() < self.config.taxa_anomalia_qualidade:
+            qualidade = gerador.choice(["reprovado", "retrabalho"])
+            defeitos = gerador.randint(1, 5)
+        else:
+            qualidade, defeitos = "aprovado", 0
+        self._latencia(gerador)
+        return {
+            "lote_id": lote_id,
+            "resultado": qualidade,
+            "defeitos": defeitos,
+            "timestamp": datetime.now().isoformat(),
+        }
+
+
+def _versao(config: ConfiguracaoPlanta) -> str:
+    """Hash de tudo o que define as leituras: configuração, limites e código do simulador.
+
+    As latências ficam de fora (não mudam nenhuma leitura), de modo que a mesma
+    planta com sensores mais lentos reaproveita os passos em cache.
+    """
+    campos = {k: v for k, v in asdict(config).items() if not k.startswith("latencia_")}
+    base = "|".join((
+        json.dumps(campos, sort_keys=True),
+        f"{LIMITE_TEMPERATURA_MIN}-{LIMITE_TEMPERATURA_MAX}-{MARGEM_NOMINAL}",
+        inspect.getsource(SimuladorPlanta),
+    ))
+    return hashlib.sha256(base.encode("utf-8")).hexdigest()[:16]
@@ -0,0 +1,285 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script streaming.py
+===================
+Consumo incremental das execuções em stream do workflow industrial.
+
+Os eventos do Agno (início/fim de passo, deltas de conteúdo dos agentes,
+resultado de ferramentas) são convertidos em `EventoCiclo` e repassados
+assim que chegam a um ou mais destinos: terminal, arquivo JSONL ou fila
+SSE. Nada é acumulado além do conteúdo final de cada passo.
+"""
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterator, Optional, Protocol, TextIO
+
+from agno.workflow import Workflow
+from pydantic import BaseModel
+
+# Evento do Agno -> tipo do EventoCiclo
+_TIPOS = {
+    "WorkflowStarted": "ciclo_iniciado",
+    "StepStarted": "passo_iniciado",
+    "StepCompleted": "passo_concluido",
+    "RunContent": "conteudo",
+    "ToolCallCompleted": "ferramenta",
+    "StepError": "erro",
+    "WorkflowError": "erro",
+    "WorkflowCompleted": "ciclo_concluido",
+}
+
+
+@dataclass
+class EventoCiclo:
+    """Evento normalizado de um ciclo em andamento.
+
+    Attributes:
+        tipo: ciclo_iniciado, passo_iniciado, passo_concluido, conteudo,
+            ferramenta, erro ou ciclo_concluido.
+        run_id: Execução do workflow.
+        passo: Passo de origem (None para eventos do ciclo).
+        conteudo: Delta de texto, resultado do passo/ferramenta ou erro.
+        t: Segundos desde o início do consumo.
+    """
+
+    tipo: str
+    run_id: Optional[str]
+    passo: Optional[str] = None
+    conteudo: Optional[str] = None
+    t: float = 0.0
+    dados: dict = field(default_factory=dict)
+
+    def json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False, default=str)
+
+
+def _texto(conteudo: Any) -> Optional[str]:
+    if conteudo is None:
+        return None
+    if isinstance(conteudo, BaseModel):
+        return conteudo.model_dump_json()
+    return conteudo if isinstance(conteudo, str) else json.dumps(conteudo, ensure_ascii=False, default=str)
+
+
+def normalizar(evento: Any, inicio: float) -> Optional[EventoCiclo]:
+    """Converte um evento do Agno em EventoCiclo (None se não for repassado)."""
+    tipo = _TIPOS.get(getattr(evento, "event", None))
+    if tipo is None:
+        return None
+    dados = {}
+    if tipo == "ferramenta":
+        ferramenta = getattr(evento, "tool", None)
+        conteudo = ferramenta.result if ferramenta else None
+        dados["ferramenta"] = ferramenta.tool_name if ferramenta else None
+    elif tipo == "erro":
+        conteudo = getattr(evento, "error", None)
+    else:
+        conteudo = _texto(getattr(evento, "content", None))
+    # Eventos de agente trazem o run_id do agente; o do workflow vem em workflow_run_id
+    run_id = getattr(evento, "workflow_run_id", None) or getattr(evento, "run_id", None)
+    return EventoCiclo(
+        tipo=tipo,
+        run_id=run_id,
+        passo=getattr(evento, "step_name", None),
+        conteudo=conteudo,
+        t=time.perf_counter() - inicio,
+        dados=dados,
+    )
+
+
+# Fontes ----------------------------------------------------------------------
+
+
+async def eventos_ciclo(workflow: Workflow, **kwargs: Any) -> AsyncIterator[EventoCiclo]:
+    """Executa `workflow.arun` em stream e produz os eventos do ciclo à medida que chegam."""
+    inicio = time.perf_counter()
+    async for evento in workflow.arun(stream=True, stream_events=True, **kwargs):
+        if (normalizado := normalizar(evento, inicio)) is not None:
+            yield normalizado
+
+
+def eventos_ciclo_sync(workflow: Workflow, **kwargs: Any) -> Iterator[EventoCiclo]:
+    """Versão síncrona de `eventos_ciclo` (workflow.run em stream; workflow criado com `sincrono=True`)."""
+    inicio = time.perf_counter()
+    for evento in workflow.run(stream=True, stream_events=True, **kwargs):
+        if (normalizado := normalizar(evento, inicio)) is not None:
+            yield normalizado
+
+
+# Destinos --------------------------------------------------------------------
+
+
+class Destino(Protocol):
+    """Recebe os eventos de um ciclo."""
+
+    def enviar(self, evento: EventoCiclo) -> None: ...
+
+    def fechar(self) -> None: ...
+
+
+class RenderizadorTerminal:
+    """Mostra o ciclo no terminal conforme acontece (deltas impressos sem quebra)."""
+
+    def __init__(self, saida: TextIO = sys.stdout) -> None:
+        self.saida = saida
+        self._passo_em_linha: Optional[str] = None
+
+    def _linha(self, texto: str) -> None:
+        if self._passo_em_linha is not None:
+            self.saida.write("\n")
+            self._passo_em_linha = None
+        self.saida.write(texto + "\n")
+
+    def enviar(self, evento: EventoCiclo) -> None:
+        if evento.tipo == "conteudo":
+            if evento.passo != self._passo_em_linha:
+                # Ramos paralelos intercalam deltas: reabre a linha com o nome do passo
+                self._linha(f"💬 [{evento.passo}]")
+                self._passo_em_linha = evento.passo
+            self.saida.write(evento.conteudo or "")
+        elif evento.tipo == "passo_iniciado":
+            self._linha(f"▶️  {evento.passo} ({evento.t:.1f}s)")
+        elif evento.tipo == "passo_concluido":
+            self._linha(f"✅ {evento.passo} ({evento.t:.1f}s)")
+        elif evento.tipo == "ferramenta":
+            self._linha(f"🔧 {evento.dados.get('ferramenta')} → {evento.conteudo} ({evento.t:.1f}s)")
+        elif evento.tipo == "erro":
+            self._linha(f"❌ {evento.passo or 'ciclo'}: {evento.conteudo}")
+        elif evento.tipo == "ciclo_concluido":
+            self._linha(f"\n📊 Relatório do Ciclo ({evento.t:.1f}s):\n{evento.conteudo}")
+        self.saida.flush()
+
+    def fechar(self) -> None:
+        self.saida.flush()
+
+
+class DestinoJSONL:
+    """Acrescenta um evento por linha num arquivo JSONL (com flush por evento)."""
+
+    def __init__(self, caminho: str | Path) -> None:
+        Path(caminho).parent.mkdir(parents=True, exist_ok=True)
+        self._arquivo = open(caminho, "a", encoding="utf-8")
+
+    def enviar(self, evento: EventoCiclo) -> None:
+        self._arquivo.write(evento.json() + "\n")
+        self._arquivo.flush()
+
+    def fechar(self) -> None:
+        self._arquivo.close()
+
+
+class DestinoSSE:
+    """Fila de eventos formatados como Server-Sent Events para um endpoint HTTP.
+
+    Com o cliente lento e a fila cheia, só deltas de conteúdo são descartados:
+    um delta novo não entra, e um evento de passo, ferramenta ou ciclo toma o
+    lugar do delta mais antigo da fila (ou entra além do limite, pois são
+    poucos por ciclo).
+
+    Example:
+        >>> sse = DestinoSSE()
+        >>> asyncio.create_task(transmitir(wf, [sse], input="..."))
+        >>> return StreamingResponse(sse.mensagens(), media_type="text/event-stream")
+    """
+
+    def __init__(self, tamanho_max: int = 1000) -> None:
+        self.tamanho_max = tamanho_max
+        self.deltas_descartados = 0
+        # (é delta de conteúdo, mensagem); None encerra o stream
+        self._fila: deque[Optional[tuple[bool, str]]] = deque()
+        self._deltas = 0
+        self._disponivel = asyncio.Event()
+
+    @staticmethod
+    def formatar(evento: EventoCiclo) -> str:
+        return f"event: {evento.tipo}\ndata: {evento.json()}\n\n"
+
+    def enviar(self, evento: EventoCiclo) -> None:
+        delta = evento.tipo == "conteudo"
+        if len(self._fila) >= self.tamanho_max:
+            # Cliente lento: descarta deltas, mas nunca eventos de passo/ciclo
+            if delta:
+                self.deltas_descartados += 1
+                return
+            self._descartar_delta()
+        self._fila.append((delta, self.formatar(evento)))
+        self._deltas += delta
+        self._disponivel.set()
+
+    def _descartar_delta(self) -> bool:
+        """Remove o delta de conteúdo mais antigo da fila; False se não houver nenhum."""
+        if not self._deltas:
+            return False
+        for i, item in enumerate(self._fila):
+            if item is not None and item[0]:
+                del self._fila[i]
+                self._deltas -= 1
+                self.deltas_descartados += 1
+                return True
+        return False
+
+    def fechar(self) -> None:
+        self._fila.append(None)
+        self._disponivel.set()
+
+    async def mensagens(self) -> AsyncIterator[str]:
+        """Mensagens SSE até o fim do ciclo."""
+        while True:
+            while not self._fila:
+                self._disponivel.clear()
+                await self._disponivel.wait()
+            item = self._fila.popleft()
+            if item is None:
+                return
+            delta, mensagem = item
+            self._deltas -= delta
+            yield mensagem
+
+
+# Consumidores ----------------------------------------------------------------
+
+
+async def transmitir(workflow: Workflow, destinos: list[Destino], **kwargs: Any) -> Optional[str]:
+    """Executa o ciclo em stream repassando cada evento a todos os destinos.
+
+    Args:
+        workflow: Workflow a executar.
+        destinos: Destinos dos eventos (fechados ao final).
+        **kwargs: Argumentos de `workflow.arun` (input, additional_data, ...).
+
+    Returns:
+        Optional[str]: Conteúdo final do ciclo.
+    """
+    final = None
+    try:
+        async for evento in eventos_ciclo(workflow, **kwargs):
+            for destino in destinos:
+                destino.enviar(evento)
+            if evento.tipo == "ciclo_concluido":
+                final = evento.conteudo
+    finally:
+        for destino in destinos:
+            destino.fechar()
+    return final
+
+
+def transmitir_sync(workflow: Workflow, destinos: list[Destino], **kwargs: Any) -> Optional[str]:
+    """Versão síncrona de `transmitir`."""
+    final = None
+    try:
+        for evento in eventos_ciclo_sync(workflow, **kwargs):
+            for destino in destinos:
+                destino.enviar(evento)
+            if evento.tipo == "ciclo_concluido":
+                final = evento.conteudo
+    finally:
+        for destino in destinos:
+            destino.fechar()
+    return final
@@ -0,0 +1,55 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script servidor_ciclos.py
+=========================
+Endpoint SSE que dispara um ciclo de produção e transmite os eventos
+(início/fim de passo, deltas dos agentes, leituras das ferramentas) enquanto
+o ciclo acontece. Cada ciclo também é gravado em JSONL.
+
+Run:
+uv run servidor_ciclos.py
+
+curl -N "http://localhost:7780/ciclos/stream?lote_id=L001&forno_id=F001"
+"""
+import asyncio
+
+import uvicorn
+from agno.db.sqlite import SqliteDb
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+from industria.streaming import DestinoJSONL, DestinoSSE, transmitir
+from teste_industry import criar_workflow_industrial
+
+ARQUIVO_EVENTOS = "tmp/ciclos_eventos.jsonl"
+
+app = FastAPI(title="Ciclos de Produção Industrial")
+db = SqliteDb(session_table="producao_industrial", db_file="tmp/industrial.db")
+# Ciclos em andamento: seguem até o fim mesmo se o cliente desconectar
+_ciclos: set[asyncio.Task] = set()
+
+
+@app.get("/ciclos/stream")
+async def ciclo_stream(lote_id: str, forno_id: str) -> StreamingResponse:
+    """Executa o ciclo do lote/forno e transmite os eventos como text/event-stream."""
+    sse = DestinoSSE()
+    ciclo = asyncio.create_task(transmitir(
+        criar_workflow_industrial(db=db),
+        [sse, DestinoJSONL(ARQUIVO_EVENTOS)],
+        input=f"Iniciar ciclo de produção - Lote {lote_id}, Forno {forno_id}. "
+        "IMPORTANTE: Responder APENAS em português brasileiro.",
+        additional_data={"lote_id": lote_id, "forno_id": forno_id},
+    ))
+    _ciclos.add(ciclo)
+    ciclo.add_done_callback(_ciclos.discard)
+    return StreamingResponse(
+        sse.mensagens(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+if __name__ == "__main__":
+    uvicorn.run(app, host="0.0.0.0", port=7780)
@@ -5,42 +5,83 @@ Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
 from agno.agent import Agent
 from agno.models.openai import OpenAIChat
 from agno.tools import tool
-from agno.workflow.v2 import Workflow, Step, Condition, Parallel
-from agno.storage.sqlite import SqliteStorage
+from agno.workflow import Workflow, Step, Condition, StepInput, StepOutput
+from agno.db.sqlite import SqliteDb
 from datetime import datetime
 
+import asyncio
 import sys
 import os
 # Adiciona o diretório raiz do projeto ao PATH do Python:
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config.settings import OPENAI_API_KEY
+from industria.historico import HistoricoQualidade
+from industria.paralelo import ParaleloComPrazo
+from industria.passos import interceptar, registrar_tipos_passos
+from industria.regras import NOME_PASSO_REGRAS, avaliar_ciclo, extrair_ids, obter_relatorio
+from industria.sensores import ler_qualidade_lote, ler_temperatura_forno
+from industria.streaming import DestinoJSONL, RenderizadorTerminal, transmitir
+
+# Histórico colunar de todas as leituras (Parquet + DuckDB):
+historico = HistoricoQualidade()
+
+def configurar_historico(novo: HistoricoQualidade) -> None:
+    """Define o histórico usado pelas leituras e ferramentas (ex.: pasta temporária em benchmarks)"""
+    global historico
+    historico = novo
+
+def medir_temperatura(forno_id: str, lote_id: str | None = None, registrar: bool = True) -> dict:
+    """Lê a temperatura do forno e, se `registrar`, grava a leitura no histórico"""
+    leitura = ler_temperatura_forno(forno_id, lote_id)
+    if registrar:
+        historico.registrar_temperatura(leitura)
+    return leitura
+
+def medir_qualidade(lote_id: str, registrar: bool = True) -> dict:
+    """Lê a qualidade do lote e, se `registrar`, grava a leitura no histórico"""
+    leitura = ler_qualidade_lote(lote_id)
+    if registrar:
+        historico.registrar_qualidade(leitura)
+    return leitura
 
 # 1. FERRAMENTAS PERSONALIZADAS PARA INDÚSTRIA
+# O pré-filtro grava a leitura de cada ciclo; as ferramentas releem a mesma
+# leitura (fixa por forno/lote) e não a gravam de novo no histórico.
 
 @tool
-def verificar_temperatura_forno(forno_id: str) -> dict:
-    """Verifica temperatura atual do forno industrial"""
-    # Simulação - conectaria com sistema real
-    import random
-    temp = random.randint(800, 1200)
-    return {
-        "forno_id": forno_id,
-        "temperatura": temp,
-        "status": "normal" if 850 <= temp <= 1150 else "alerta",
-        "timestamp": datetime.now().isoformat()
-    }
+def verificar_temperatura_forno(forno_id: str, lote_id: str) -> dict:
+    """Verifica temperatura do forno industrial no ciclo do lote
+
+    Args:
+        forno_id: Forno verificado (ex.: "F001").
+        lote_id: Lote do ciclo em andamento, informado no relatório do ciclo.
+    """
+    return medir_temperatura(forno_id, lote_id, registrar=False)
 
 @tool
 def verificar_qualidade_produto(lote_id: str) -> dict:
     """Executa controle de qualidade do lote"""
-    import random
-    qualidade = random.choice(["aprovado", "reprovado", "retrabalho"])
-    return {
-        "lote_id": lote_id,
-        "resultado": qualidade,
-        "defeitos": random.randint(0, 5) if qualidade != "aprovado" else 0,
-        "timestamp": datetime.now().isoformat()
-    }
+    return medir_qualidade(lote_id, registrar=False)
+
+@tool
+def consultar_tendencia_qualidade(agrupar_por: str = "dia", ultimos_lotes: int = 10000) -> list:
+    """Tendência de defeitos e taxa de aprovação dos últimos lotes.
+
+    Args:
+        agrupar_por: "hora", "dia", "semana" ou "resultado".
+        ultimos_lotes: Quantidade de lotes mais recentes considerados.
+    """
+    return historico.tendencia_qualidade(agrupar_por, ultimos_lotes)
+
+@tool
+def consultar_tendencia_temperatura(forno_id: str = "", agrupar_por: str = "hora") -> list:
+    """Tendência de temperatura (média, mínima, máxima e alertas) por período.
+
+    Args:
+        forno_id: Forno consultado (vazio = todos os fornos).
+        agrupar_por: "hora", "dia" ou "semana".
+    """
+    return historico.tendencia_temperatura(forno_id or None, agrupar_por)
 
 @tool
 def ajustar_parametros_maquina(maquina_id: str, parametros: dict) -> dict:
@@ -58,12 +99,14 @@ def ajustar_parametros_maquina(maquina_id: str, parametros: dict) -> dict:
 monitor_agent = Agent(
     name="Monitor Industrial",
     model=OpenAIChat(id="gpt-4o-mini", api_key=OPENAI_API_KEY),
-    tools=[verificar_temperatura_forno, verificar_qualidade_produto],
+    tools=[verificar_temperatura_forno, verificar_qualidade_produto, consultar_tendencia_temperatura],
     #markdown=True,
     instructions="""
     Você é um especialista em monitoramento industrial. SEMPRE responda EXCLUSIVAMENTE em português brasileiro.
     - Monitore equipamentos continuamente
+    - Ao verificar o forno, informe o forno_id e o lote_id do relatório do ciclo
     - Identifique anomalias e alertas
+    - Para histórico do forno use consultar_tendencia_temperatura
     - Forneça relatórios claros sobre status
     - OBRIGATÓRIO: Use apenas português brasileiro em todas as respostas
     - PROIBIDO: Nunca use palavras em inglês ou outras línguas
@@ -75,13 +118,14 @@ monitor_agent = Agent(
 qualidade_agent = Agent(
     name="Controle de Qualidade",
     model=OpenAIChat(id="gpt-4o-mini", api_key=OPENAI_API_KEY),
-    tools=[verificar_qualidade_produto],
+    tools=[verificar_qualidade_produto, consultar_tendencia_qualidade],
     #markdown=True,
     instructions="""
     Você é responsável pelo controle de qualidade. SEMPRE responda EXCLUSIVAMENTE em português brasileiro.
     - Analise resultados de testes
     - Classifique produtos (aprovado/reprovado/retrabalho)
     - Identifique padrões de defeitos
+    - Para tendências use consultar_tendencia_qualidade (já retorna os dados agregados)
     - OBRIGATÓRIO: Use apenas português brasileiro em todas as respostas
     - PROIBIDO: Nunca use palavras em inglês ou outras línguas
     - Todas as suas respostas devem ser 100% em português do Brasil
@@ -107,50 +151,154 @@ manutencao_agent = Agent(
 
 # 3. FUNÇÕES DE AVALIAÇÃO PARA WORKFLOW
 
+def _filtrar_leituras(leitura_forno: dict, leitura_qualidade: dict) -> StepOutput:
+    """Avalia as leituras em código e encerra o ciclo se tudo estiver nominal"""
+    relatorio = avaliar_ciclo(leitura_forno, leitura_qualidade)
+    if relatorio.nominal:
+        # Ciclo saudável: relatório padrão, nenhuma chamada ao LLM
+        return StepOutput(content=relatorio.resumo(), stop=True)
+    # O relatório segue como entrada dos agentes escalados
+    return StepOutput(content=relatorio)
+
+async def pre_filtro_regras(step_input: StepInput) -> StepOutput:
+    """Pré-filtro do arun: sensores e histórico (bloqueantes) rodam fora do event loop"""
+    lote_id, forno_id = extrair_ids(step_input)
+    lote_id, forno_id = lote_id or "L001", forno_id or "F001"
+    return _filtrar_leituras(
+        await asyncio.to_thread(medir_temperatura, forno_id, lote_id),
+        await asyncio.to_thread(medir_qualidade, lote_id),
+    )
+
+def pre_filtro_regras_sync(step_input: StepInput) -> StepOutput:
+    """Versão síncrona de `pre_filtro_regras` (workflow.run)"""
+    lote_id, forno_id = extrair_ids(step_input)
+    lote_id, forno_id = lote_id or "L001", forno_id or "F001"
+    return _filtrar_leituras(medir_temperatura(forno_id, lote_id), medir_qualidade(lote_id))
+
+def forno_anomalo(step_input: StepInput) -> bool:
+    """Escala o forno ao agente de monitoramento apenas se houver anomalia"""
+    relatorio = obter_relatorio(step_input)
+    return relatorio is None or relatorio.forno_anomalo
+
+def qualidade_anomala(step_input: StepInput) -> bool:
+    """Escala o lote ao agente de qualidade apenas se houver anomalia"""
+    relatorio = obter_relatorio(step_input)
+    return relatorio is None or relatorio.qualidade_anomala
+
 def precisa_manutencao(step_input) -> bool:
     """Avalia se equipamento precisa manutenção"""
+    relatorio = obter_relatorio(step_input)
+    if relatorio is not None and relatorio.forno_anomalo:
+        return True
     try:
         # Analisa resultado do monitoramento
-        content = step_input.previous_step_content
+        content = str(step_input.previous_step_content)
         return "alerta" in content.lower() or "problema" in content.lower()
     except (AttributeError, TypeError):
         return False
 
 def qualidade_aprovada(step_input) -> bool:
     """Verifica se qualidade foi aprovada"""
+    relatorio = obter_relatorio(step_input)
+    if relatorio is not None:
+        return not relatorio.qualidade_anomala
     try:
-        content = step_input.previous_step_content
+        content = str(step_input.previous_step_content)
         return "aprovado" in content.lower()
     except (AttributeError, TypeError):
         return False
 
 # 4. WORKFLOW INDUSTRIAL COMPLETO
 
-workflow_industrial = Workflow(
-    name="Sistema de Produção Industrial",
-    description="Workflow completo de monitoramento, qualidade e manutenção",
-    storage=SqliteStorage(
-        table_name="producao_industrial",
-        db_file="tmp/industrial.db",
-        mode="workflow_v2"
-    ),
-    steps=[
-        # Etapa 1: Monitoramento paralelo
-        Parallel(
-            Step(
-                name="monitorar_forno",
-                agent=monitor_agent,
-                description="Monitorar temperatura dos fornos"
+# Prazo de cada ramo do monitoramento paralelo (arun); um ramo lento não segura o ciclo
+TIMEOUT_RAMO_SEGUNDOS = 90
+
+def criar_workflow_industrial(
+    db=None, limitador=None, cache=None, checkpoints=None, eventos=None, instrumentacao=None,
+    modelo=None, timeout_ramo=TIMEOUT_RAMO_SEGUNDOS, sincrono=False,
+) -> Workflow:
+    """Cria uma instância independente do workflow industrial.
+
+    Args:
+        db: Banco de sessões do agno (padrão: SqliteDb em tmp/industrial.db;
+            sem banco quando `eventos` é informado). Cada execução regrava o
+            blob de runs da sessão; com um EventStore o histórico já fica nos
+            eventos append-only, então só passe `db` junto se ainda precisar
+            das sessões do agno e aceitar essa regravação.
+        limitador: LimitadorTaxa compartilhado; se informado, cada requisição
+            ao modelo dos agentes aguarda uma ficha (run e arun).
+        cache: CachePassos opcional; passos de agente com a mesma entrada
+            são reproduzidos do banco em vez de executados.
+        checkpoints: CheckpointStore opcional; grava cada passo concluído
+            (inclusive o pré-filtro) para permitir `retomar(run_id)`.
+        eventos: EventStore opcional; grava um evento append-only por passo
+            e substitui a persistência de sessões do agno (ver `db`).
+        instrumentacao: Instrumentacao opcional; mede tempo de cada passo,
+            avaliador, modelo e ferramenta para o relatório de caminho crítico.
+        modelo: Modelo opcional que substitui o dos agentes (ex.: FakeModel
+            em benchmarks).
+        timeout_ramo: Prazo (s) de cada ramo do monitoramento paralelo; o
+            ramo que excede é encerrado e o ciclo segue sem ele.
+        sincrono: Se True, usa o pré-filtro síncrono para `workflow.run`;
+            o padrão (assíncrono) só executa em `workflow.arun`.
+
+    Returns:
+        Workflow: Workflow com agentes próprios, isolado de outras execuções.
+    """
+    registrar_tipos_passos()
+    # Cada instância recebe cópias dos agentes para não compartilhar estado de execução
+    atualizacao = {}
+    if instrumentacao is not None:
+        atualizacao["tool_hooks"] = [instrumentacao.hook_ferramenta]
+    if modelo is not None:
+        atualizacao["model"] = modelo
+    monitor = monitor_agent.deep_copy(update=atualizacao)
+    qualidade = qualidade_agent.deep_copy(update=atualizacao)
+    manutencao = manutencao_agent.deep_copy(update=atualizacao)
+    if limitador is not None:
+        # Depois das cópias: o limite vale por requisição ao modelo, não por execução de agente
+        for agente in (monitor, qualidade, manutencao):
+            limitador.limitar(agente.model)
+
+    passos = [
+        # Etapa 0: Pré-filtro determinístico (encerra o ciclo se tudo estiver nominal)
+        Step(
+            name=NOME_PASSO_REGRAS,
+            executor=pre_filtro_regras_sync if sincrono else pre_filtro_regras,
+            description="Avaliar limites do forno e resultado da qualidade em código"
+        ),
+
+        # Etapa 1: Monitoramento paralelo apenas dos ativos anômalos, com prazo por ramo
+        ParaleloComPrazo(
+            Condition(
+                name="forno_anomalo",
+                description="Escalar o forno somente se fora da faixa",
+                evaluator=forno_anomalo,
+                steps=[
+                    Step(
+                        name="monitorar_forno",
+                        agent=monitor,
+                        description="Monitorar temperatura dos fornos"
+                    )
+                ]
             ),
-            Step(
-                name="controle_qualidade",
-                agent=qualidade_agent,
-                description="Verificar qualidade dos produtos"
+            Condition(
+                name="qualidade_anomala",
+                description="Escalar o lote somente se não aprovado",
+                evaluator=qualidade_anomala,
+                steps=[
+                    Step(
+                        name="controle_qualidade",
+                        agent=qualidade,
+                        description="Verificar qualidade dos produtos"
+                    )
+                ]
             ),
             name="monitoramento_paralelo",
-            description="Monitoramento simultâneo de equipamentos e qualidade"
+            description="Monitoramento simultâneo de equipamentos e qualidade",
+            timeout_ramo=timeout_ramo,
         ),
-        
+
         # Etapa 2: Manutenção condicional
         Condition(
             name="verificar_manutencao",
@@ -159,12 +307,12 @@ workflow_industrial = Workflow(
             steps=[
                 Step(
                     name="executar_manutencao",
-                    agent=manutencao_agent,
+                    agent=manutencao,
                     description="Executar ajustes e manutenção"
                 )
             ]
         ),
-        
+
         # Etapa 3: Reprocessamento condicional
         Condition(
             name="verificar_reprocessamento",
@@ -173,34 +321,45 @@ workflow_industrial = Workflow(
             steps=[
                 Step(
                     name="reprocessar",
-                    agent=qualidade_agent,
+                    agent=qualidade,
                     description="Reprocessar lote com problemas"
                 )
             ]
         )
     ]
-)
+    if checkpoints is not None:
+        # Primeiro interceptador: numa retomada, o checkpoint tem prioridade sobre o cache
+        passos = interceptar(passos, checkpoints, apenas_agentes=False)
+    if cache is not None:
+        passos = interceptar(passos, cache)
+    if eventos is not None:
+        passos = interceptar(passos, eventos, apenas_agentes=False)
+    if instrumentacao is not None:
+        passos = instrumentacao.instrumentar(passos)
+
+    return Workflow(
+        name="Sistema de Produção Industrial",
+        description="Workflow completo de monitoramento, qualidade e manutenção",
+        db=db if db is not None or eventos is not None else SqliteDb(
+            session_table="producao_industrial",
+            db_file="tmp/industrial.db",
+        ),
+        steps=passos,
+    )
+
+workflow_industrial = criar_workflow_industrial()
 
 # 5. EXECUÇÃO DO SISTEMA
 
 if __name__ == "__main__":
     print("🏭 Iniciando Sistema Industrial Agno")
     print("=" * 50)
-    
-    # Simular ciclo de produção
-    resultado = workflow_industrial.run(
-        message="Iniciar ciclo de produção - Lote L001, Forno F001. IMPORTANTE: Responder APENAS em português brasileiro, nunca usar palavras em inglês.",
-        stream=True
-    )
-    
-    print("\n📊 Relatório do Ciclo:")
-    
-    # Coleta todo o conteúdo do stream
-    conteudo_completo = ""
-    for response in resultado:
-        if hasattr(response, 'content') and response.content:
-            conteudo_completo += response.content
-    
-    # Imprime o conteúdo completo de uma vez
-    print(conteudo_completo)
-            
\ No newline at end of file
+
+    # Simular ciclo de produção: cada evento é mostrado e gravado assim que acontece
+    asyncio.run(transmitir(
+        workflow_industrial,
+        [RenderizadorTerminal(), DestinoJSONL("tmp/ciclos_eventos.jsonl")],
+        input="Iniciar ciclo de produção - Lote L001, Forno F001. IMPORTANTE: Responder APENAS em português brasileiro, nunca usar palavras em inglês.",
+        additional_data={"lote_id": "L001", "forno_id": "F001"},
+    ))
+    historico.gravar()
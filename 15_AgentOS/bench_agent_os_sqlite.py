@@ -0,0 +1,106 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script bench_agent_os_sqlite.py
+===============================
+Run-persistence latency of the AgentOS SQLite database under concurrency.
+
+Each simulated session repeats what the AgentOS does around a run: read the
+session, append the run output and upsert it. The default `AsyncSqliteDb` is
+compared with `TunedAsyncSqliteDb` (WAL, synchronous=NORMAL, cache, mmap, busy
+timeout, reader pool plus a single writer) at 1, 10 and 100 concurrent sessions.
+
+Run:
+uv run bench_agent_os_sqlite.py
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from uuid import uuid4
+
+from agno.db.base import SessionType
+from agno.db.sqlite import AsyncSqliteDb
+from agno.run.agent import RunOutput
+from agno.session import AgentSession
+
+# Add the root directory to the Python path to import config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.sqlite_engine import SqliteTuning, TunedAsyncSqliteDb
+
+CONCURRENCY = [1, 10, 100]
+RUNS_PER_SESSION = 10
+RUN_CONTENT = "Persisted run output used by the benchmark. " * 40  # ~1.8 KB per run
+
+
+async def _session(db: AsyncSqliteDb, latencies: list[float], errors: list[str]) -> None:
+    """Persist RUNS_PER_SESSION runs of one session, measuring each read + upsert."""
+    session_id = str(uuid4())
+    for _ in range(RUNS_PER_SESSION):
+        start = time.perf_counter()
+        try:
+            session = await db.get_session(session_id, SessionType.AGENT)
+            if session is None:
+                session = AgentSession(
+                    session_id=session_id, agent_id="agenteddy", runs=[], created_at=int(time.time())
+                )
+            session.runs.append(
+                RunOutput(run_id=str(uuid4()), agent_id="agenteddy", session_id=session_id, content=RUN_CONTENT)
+            )
+            session.updated_at = int(time.time())
+            await db.upsert_session(session)
+            latencies.append(time.perf_counter() - start)
+        except Exception as e:
+            errors.append(type(e).__name__)
+
+
+async def measure(name: str, db: AsyncSqliteDb, sessions: int) -> dict:
+    """Run `sessions` concurrent sessions against `db`."""
+    latencies: list[float] = []
+    errors: list[str] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_session(db, latencies, errors) for _ in range(sessions)))
+    wall_time = time.perf_counter() - start
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else [0.0] * 99
+    return {
+        "db": name,
+        "sessions": sessions,
+        "runs_per_s": len(latencies) / wall_time,
+        "errors": len(errors),
+        "p50": quantiles[49] * 1000,
+        "p95": quantiles[94] * 1000,
+        "p99": quantiles[98] * 1000,
+    }
+
+
+async def main() -> None:
+    """Run the benchmark for both databases at each concurrency level."""
+    results = []
+    with tempfile.TemporaryDirectory() as folder:
+        for sessions in CONCURRENCY:
+            for name, factory in (
+                ("default", lambda f: AsyncSqliteDb(db_file=f)),
+                ("tuned", lambda f: TunedAsyncSqliteDb(db_file=f, tuning=SqliteTuning())),
+            ):
+                db = factory(str(Path(folder) / f"{name}_{sessions}.db"))
+                await db._create_all_tables()
+                results.append(await measure(name, db, sessions))
+                await db.close()
+
+    print("📊 AgentOS SQLite run-persistence benchmark")
+    print(f"runs/session={RUNS_PER_SESSION} | run size≈{len(RUN_CONTENT) / 1024:.1f} KB")
+    print("=" * 66)
+    print(f"{'db':>8} {'sessions':>9} {'runs/s':>8} {'errors':>7} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9}")
+    for r in results:
+        print(
+            f"{r['db']:>8} {r['sessions']:>9} {r['runs_per_s']:>8.1f} {r['errors']:>7} "
+            f"{r['p50']:>9.1f} {r['p95']:>9.1f} {r['p99']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
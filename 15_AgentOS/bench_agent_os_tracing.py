@@ -0,0 +1,122 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script bench_agent_os_tracing.py
+================================
+Per-request tracing overhead at different sampling rates.
+
+The same agent (fake model, no network) runs RUNS times per configuration:
+without tracing, with the Agno default (every span written synchronously to
+SQLite) and with `config.sampled_tracing` at several head ratios, where the
+kept spans are written to SQLite in batches by a background thread. A small
+share of the runs is slow, so the tail rule has something to keep. The
+overhead is the mean run time above the untraced baseline.
+
+Run:
+uv run bench_agent_os_tracing.py
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from agno.agent import Agent
+from agno.db.sqlite import SqliteDb
+from agno.tracing.exporter import DatabaseSpanExporter
+from openinference.instrumentation.agno import AgnoInstrumentor
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+
+# Add the root directory to the Python path to import config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.fake_model import FakeModel
+from config.sampled_tracing import TraceSampling, build_tracer_provider
+
+RUNS = 300
+WARMUP_RUNS = 20
+SAMPLING = {
+    "sampled 100% + tail": dict(head_ratio=1.0),
+    "sampled 10% + tail": dict(head_ratio=0.1),
+    "sampled 1% + tail": dict(head_ratio=0.01),
+    "sampled 0% + tail": dict(head_ratio=0.0),
+    "sampled 10%, no tail": dict(head_ratio=0.1, slow_threshold_ms=None, keep_errors=False),
+}
+SLOW_EVERY = 50  # one run in SLOW_EVERY is slow
+SLOW_LATENCY = 0.2  # seconds
+SLOW_THRESHOLD_MS = 150.0
+
+
+async def _run_all(agent: Agent) -> list[float]:
+    """Run the agent RUNS times and return the duration of the fast runs."""
+    durations = []
+    for i in range(WARMUP_RUNS + RUNS):
+        slow = i % SLOW_EVERY == SLOW_EVERY - 1
+        agent.model.latency = SLOW_LATENCY if slow else 0.0
+        start = time.perf_counter()
+        await agent.arun(f"Benchmark message {i}")
+        if i >= WARMUP_RUNS and not slow:
+            durations.append(time.perf_counter() - start)
+    return durations
+
+
+async def measure(label: str, agent: Agent, provider: TracerProvider | None) -> dict:
+    """Measure the agent with `provider` instrumenting Agno (None = no tracing)."""
+    instrumentor = AgnoInstrumentor()
+    if provider is not None:
+        instrumentor.instrument(tracer_provider=provider)
+    try:
+        durations = await _run_all(agent)
+        if provider is not None:
+            provider.force_flush()
+    finally:
+        if provider is not None:
+            instrumentor.uninstrument()
+            provider.shutdown()
+    return {"label": label, "mean": statistics.fmean(durations), "p95": statistics.quantiles(durations, n=20)[18]}
+
+
+async def main() -> None:
+    """Run the benchmark for each tracing configuration."""
+    agent = Agent(
+        name="BenchAgent",
+        model=FakeModel(latency=0.0, reply="Benchmark reply from the fake model."),
+        telemetry=False,
+    )
+    results, kept = [], {}
+    with tempfile.TemporaryDirectory() as folder:
+        results.append(await measure("no tracing", agent, None))
+
+        provider = TracerProvider()
+        provider.add_span_processor(
+            SimpleSpanProcessor(DatabaseSpanExporter(db=SqliteDb(db_file=str(Path(folder) / "default.db"))))
+        )
+        results.append(await measure("agno default (100%, sync)", agent, provider))
+
+        for i, (label, settings) in enumerate(SAMPLING.items()):
+            exporter = DatabaseSpanExporter(db=SqliteDb(db_file=str(Path(folder) / f"sampled_{i}.db")))
+            provider, processor = build_tracer_provider(
+                exporter, TraceSampling(**{"slow_threshold_ms": SLOW_THRESHOLD_MS, **settings})
+            )
+            results.append(await measure(label, agent, provider))
+            kept[label] = processor.stats
+
+    baseline = results[0]["mean"]
+    print("📊 AgentOS tracing overhead per request (fake model)")
+    print(f"runs={RUNS} | slow runs: 1 in {SLOW_EVERY} ({SLOW_LATENCY}s, excluded from the timings)")
+    print("=" * 86)
+    print(f"{'configuration':<28} {'mean (ms)':>10} {'p95 (ms)':>9} {'overhead (ms)':>14} {'overhead':>9} {'kept head/tail':>14}")
+    for r in results:
+        stats = kept.get(r["label"])
+        print(
+            f"{r['label']:<28} {r['mean'] * 1000:>10.2f} {r['p95'] * 1000:>9.2f} "
+            f"{(r['mean'] - baseline) * 1000:>14.2f} {(r['mean'] / baseline - 1):>9.0%} "
+            f"{(f'{stats.head_traces}/{stats.tail_traces}' if stats else '-'):>14}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
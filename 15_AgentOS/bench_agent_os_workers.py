@@ -0,0 +1,115 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script bench_agent_os_workers.py
+================================
+Throughput of the AgentOS in production mode as the number of workers grows.
+
+For each worker count, a server is started with `AgentOSManager.serve_production`
+using a local fake model (no network calls) and a temporary database, and is
+driven by the load test from `load_test_agent_os.py` with no think time. The
+report shows requests per second, the speedup over one worker and the client
+latency p50/p95. Scaling is bounded by the number of CPU cores.
+
+Run:
+uv run bench_agent_os_workers.py
+"""
+import asyncio
+import multiprocessing
+import os
+import signal
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the root directory to the Python path to import config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.fake_model import FakeModel
+from load_test_agent_os import LoadTestConfig, run_load_test
+from my_agent_os import manager
+
+WORKER_COUNTS = [1, 2, 4]
+PORT = 7790
+SESSIONS = 64
+TURNS_PER_SESSION = 8
+MODEL_LATENCY = 0.05  # seconds per model call
+READY_TIMEOUT = 60.0
+
+
+def _serve(workers: int, folder: str) -> None:
+    """Run the production server (in a child process) with a fake model."""
+    manager.model_copy(
+        update={
+            "model": FakeModel(latency=MODEL_LATENCY, reply="Benchmark reply from the fake model."),
+            "db_file": str(Path(folder) / f"bench_{workers}.db"),
+            "host": "127.0.0.1",
+            "port": PORT,
+            "workers": workers,
+            "ready_file": str(Path(folder) / "ready"),
+            "telemetry": False,
+            "tracing": False,
+        }
+    ).serve_production()
+
+
+def measure(workers: int, folder: str) -> dict:
+    """Start a server with `workers` workers, load it and shut it down."""
+    ready_file = Path(folder) / "ready"
+    server = multiprocessing.get_context("fork").Process(target=_serve, args=(workers, folder))
+    server.start()
+    try:
+        deadline = time.monotonic() + READY_TIMEOUT
+        while not ready_file.exists():
+            if time.monotonic() > deadline or not server.is_alive():
+                raise RuntimeError(f"Server with {workers} worker(s) did not become ready")
+            time.sleep(0.1)
+
+        report = asyncio.run(run_load_test(LoadTestConfig(
+            base_url=f"http://127.0.0.1:{PORT}",
+            agent_id=manager.agent_name.lower(),
+            sessions=SESSIONS,
+            script=[f"Message {i}" for i in range(TURNS_PER_SESSION)],
+            think_time_min=0.0,
+            think_time_max=0.0,
+            ramp_up=0.0,
+            stream=False,
+        )))
+    finally:
+        os.kill(server.pid, signal.SIGTERM)
+        server.join()
+    return {
+        "workers": workers,
+        "requests": report.requests,
+        "errors": report.errors,
+        "rps": report.throughput_rps,
+        "p50": report.client_latency.p50,
+        "p95": report.client_latency.p95,
+    }
+
+
+def main() -> None:
+    """Run the benchmark for each worker count."""
+    results = []
+    for workers in WORKER_COUNTS:
+        with tempfile.TemporaryDirectory() as folder:
+            results.append(measure(workers, folder))
+
+    print("📊 AgentOS production serving benchmark (fake model)")
+    print(
+        f"cores={os.cpu_count()} | sessions={SESSIONS} | turns/session={TURNS_PER_SESSION} | "
+        f"model latency={MODEL_LATENCY}s"
+    )
+    print("=" * 66)
+    print(f"{'workers':>7} {'requests':>9} {'errors':>7} {'req/s':>8} {'speedup':>8} {'p50 (s)':>8} {'p95 (s)':>8}")
+    baseline = results[0]["rps"] or 1.0
+    for r in results:
+        print(
+            f"{r['workers']:>7} {r['requests']:>9} {r['errors']:>7} {r['rps']:>8.1f} "
+            f"{r['rps'] / baseline:>7.2f}x {r['p50']:>8.3f} {r['p95']:>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script check_session_compaction.py
+==================================
+Concurrency check of the compaction job of `compact_agent_os_db.py`.
+
+The job runs on a temporary database while the AgentOS appends a run to the
+session between the read and the write of the job, in the same second (so
+`updated_at` does not change). The run must survive and the session must be
+left for the next execution.
+
+Run:
+uv run check_session_compaction.py
+"""
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the root directory to the Python path to import config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import session_compaction
+from config.session_compaction import compact_database
+
+from compact_agent_os_db import POLICY
+
+
+def check_concurrent_append() -> None:
+    """Compact a session while a run is appended to it in the same second as the read."""
+    now = int(time.time())
+    old = now - 90 * 86400
+    runs = [
+        {"run_id": f"old-{i}", "created_at": old + i, "content": "answer", "messages": [{"role": "user", "content": "q"}]}
+        for i in range(POLICY.max_runs_per_session + 20)
+    ]
+    with tempfile.TemporaryDirectory() as folder:
+        db_file = Path(folder) / "check.db"
+        conn = sqlite3.connect(db_file, isolation_level=None)
+        conn.execute("CREATE TABLE agno_sessions (session_id TEXT PRIMARY KEY, session_data JSON, runs JSON, summary JSON, updated_at BIGINT)")
+        conn.execute("INSERT INTO agno_sessions VALUES (?, NULL, ?, NULL, ?)", ("s1", json.dumps(runs), now))
+
+        compact_session = session_compaction.compact_session
+
+        def append_then_compact(*args, **kwargs):
+            # The AgentOS saves a new run between the read and the write of the job,
+            # within the same second (updated_at does not change)
+            stored = json.loads(conn.execute("SELECT runs FROM agno_sessions WHERE session_id='s1'").fetchone()[0])
+            stored.append({"run_id": "new", "created_at": now, "content": "answer"})
+            conn.execute("UPDATE agno_sessions SET runs=?, updated_at=? WHERE session_id='s1'", (json.dumps(stored), now))
+            return compact_session(*args, **kwargs)
+
+        session_compaction.compact_session = append_then_compact
+        try:
+            report = compact_database(db_file, POLICY)
+        finally:
+            session_compaction.compact_session = compact_session
+        stored = json.loads(conn.execute("SELECT runs FROM agno_sessions WHERE session_id='s1'").fetchone()[0])
+        conn.close()
+    assert stored[-1]["run_id"] == "new", "the run added during the compaction was lost"
+    assert report.sessions_skipped == 1 and report.sessions_compacted == 0, report.summary()
+    print("✅ run added in the same second as the read was kept (session left for the next execution)")
+
+
+if __name__ == "__main__":
+    check_concurrent_append()
@@ -0,0 +1,51 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script compact_agent_os_db.py
+=============================
+Compaction and vacuum job for the AgentOS SQLite databases.
+
+Safe to run while the AgentOS is serving (e.g. from cron): write transactions
+are short, sessions changed during the job are left for the next execution,
+and the report shows the file size and session load latency before and after.
+`check_session_compaction.py` checks the job against a concurrent append.
+
+Run:
+uv run compact_agent_os_db.py
+"""
+import os
+import sys
+from pathlib import Path
+
+# Add the root directory to the Python path to import config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.session_compaction import CompactionPolicy, compact_database
+
+ROOT = Path(__file__).parent.parent
+DB_FILES = [
+    ROOT / "15_AgentOS" / "my_agent_os.db",
+    ROOT / "15_AgentOS" / "my_agent_os_traces.db",
+    ROOT / "13_AgentOS_as_MCP_Server" / "tmp" / "agentos.db",
+    ROOT / "13_AgentOS_as_MCP_Server" / "tmp" / "agentos_traces.db",
+]
+
+POLICY = CompactionPolicy(
+    retention_days=30,  # older runs lose messages, events and reasoning
+    keep_recent_runs=10,  # history used by the agents is never touched
+    max_runs_per_session=50,  # older runs are folded into the session summary
+    trace_retention_days=14,
+    max_lock_ms=50,  # target duration of each write transaction
+    allow_full_vacuum=False,  # True once (off-peak) for databases created without incremental auto-vacuum
+)
+
+
+def main() -> None:
+    """Compact every AgentOS database that exists."""
+    for db_file in DB_FILES:
+        if db_file.exists():
+            print(compact_database(db_file, POLICY).summary())
+
+
+if __name__ == "__main__":
+    main()
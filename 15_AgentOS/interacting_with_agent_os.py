@@ -11,13 +11,24 @@ Run
 ---
 uv run interacting_with_agent_os.py
 """
-from typing import Optional
+import csv
+import json
+import statistics
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterator, Iterator, Optional
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
 from pydantic import BaseModel, Field
 from rich.console import Console
 from rich.panel import Panel
+from rich.live import Live
 from rich.markdown import Markdown
 from rich.prompt import Prompt
+from rich.table import Table
 
 
 class AgentMetrics(BaseModel):
@@ -30,6 +41,9 @@ class AgentMetrics(BaseModel):
         reasoning_tokens: Tokens usados para raciocínio (se aplicável).
         time_to_first_token: Tempo até o primeiro token (segundos).
         duration: Duração total da execução (segundos).
+        client_time_to_first_token: Tempo até o primeiro token medido no
+            cliente, incluindo rede e fila do servidor (apenas em streaming).
+        client_duration: Duração total medida no cliente (segundos).
     """
     input_tokens: int = Field(default=0, description="Tokens de entrada")
     output_tokens: int = Field(default=0, description="Tokens de saída")
@@ -37,6 +51,8 @@ class AgentMetrics(BaseModel):
     reasoning_tokens: int = Field(default=0, description="Tokens de raciocínio")
     time_to_first_token: float = Field(default=0.0, description="Tempo até primeiro token")
     duration: float = Field(default=0.0, description="Duração em segundos")
+    client_time_to_first_token: float = Field(default=0.0, description="Tempo até primeiro token no cliente")
+    client_duration: float = Field(default=0.0, description="Duração medida no cliente")
 
 
 class AgentResponse(BaseModel):
@@ -109,11 +125,168 @@ class AgentResponse(BaseModel):
         )
 
 
-class AgentOSClient:
+class StreamEvent(BaseModel):
+    """Evento recebido durante uma execução em streaming.
+
+    Attributes:
+        event: Nome do evento do AgentOS (RunContent, ToolCallStarted,
+            ToolCallCompleted, RunCompleted...).
+        content: Delta de texto (RunContent) ou resultado da ferramenta.
+        tool_name: Nome da ferramenta (eventos de ferramenta).
+        elapsed: Segundos desde o envio da mensagem.
+        response: Resposta final completa (apenas no RunCompleted).
+    """
+    event: str
+    content: str = ""
+    tool_name: Optional[str] = None
+    elapsed: float = 0.0
+    response: Optional[AgentResponse] = None
+
+
+class _SSEParser:
+    """Monta eventos Server-Sent Events a partir das linhas recebidas."""
+
+    def __init__(self) -> None:
+        self._event: Optional[str] = None
+        self._data: list[str] = []
+
+    def feed(self, line: str) -> Optional[tuple[str, dict]]:
+        """Processa uma linha; devolve (evento, dados) quando um evento termina."""
+        if line.startswith("event:"):
+            self._event = line[6:].strip()
+        elif line.startswith("data:"):
+            self._data.append(line[5:].strip())
+        elif not line and self._data:
+            data = json.loads("\n".join(self._data))
+            event = self._event or data.get("event", "message")
+            self._event, self._data = None, []
+            return event, data
+        return None
+
+
+class _BaseAgentOSClient:
+    """Configuração e lógica comum aos clientes síncrono e assíncrono.
+
+    Attributes:
+        base_url: URL base do AgentOS (padrão: http://localhost:7777).
+        agent_id: ID do agente para interação (padrão: assistant).
+        session_id: ID da sessão para manter contexto entre mensagens.
+        timeout: Timeout para requisições em segundos.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:7777",
+        agent_id: str = "agenteddy", # Assistant
+        session_id: Optional[str] = None,
+        timeout: int = 60
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.agent_id = agent_id
+        self.session_id = session_id
+        self.timeout = timeout
+
+    @property
+    def _endpoint(self) -> str:
+        """Retorna o endpoint completo para execução do agente."""
+        return f"{self.base_url}/agents/{self.agent_id}/runs"
+
+    def _form_data(self, message: str, stream: bool, user_id: Optional[str]) -> dict[str, str]:
+        """Monta o formulário do endpoint de execução (o AgentOS recebe Form)."""
+        data: dict[str, str] = {
+            "message": message,
+            "stream": str(stream).lower()
+        }
+
+        if self.session_id:
+            data["session_id"] = self.session_id
+
+        if user_id:
+            data["user_id"] = user_id
+
+        return data
+
+    def _parse_result(self, resultado: dict) -> AgentResponse:
+        """Atualiza o session_id e converte o JSON da API em AgentResponse."""
+        # Atualizar session_id se retornado
+        if "session_id" in resultado:
+            self.session_id = resultado["session_id"]
+
+        # Criar resposta usando Pydantic (valida e converte tipos automaticamente)
+        return AgentResponse.from_api_response(resultado)
+
+    def _stream_event(
+        self, event: str, data: dict, start: float, state: dict
+    ) -> Optional[StreamEvent]:
+        """Converte um evento SSE do AgentOS e atualiza o estado do streaming.
+
+        Args:
+            event: Nome do evento SSE.
+            data: Dados JSON do evento.
+            start: Instante do envio (time.perf_counter).
+            state: Estado do streaming (`ttft`, conteúdo acumulado, modelo).
+
+        Returns:
+            Optional[StreamEvent]: Evento para o chamador (None se ignorado).
+
+        Raises:
+            ValueError: Se o AgentOS reportar erro na execução.
+        """
+        elapsed = time.perf_counter() - start
+        if event == "RunStarted":
+            # O RunCompleted não repete o modelo: guarda-o para a resposta final
+            state["model"] = data.get("model")
+            state["model_provider"] = data.get("model_provider")
+            return None
+        if event == "RunContent":
+            content = data.get("content") or ""
+            if not isinstance(content, str) or not content:
+                return None
+            if state.get("ttft") is None:
+                state["ttft"] = elapsed
+            state["content"] = state.get("content", "") + content
+            return StreamEvent(event=event, content=content, elapsed=elapsed)
+        if event in ("ToolCallStarted", "ToolCallCompleted"):
+            tool = data.get("tool") or {}
+            return StreamEvent(
+                event=event,
+                content=str(tool.get("result") or ""),
+                tool_name=tool.get("tool_name"),
+                elapsed=elapsed
+            )
+        if event == "RunCompleted":
+            if not data.get("content"):
+                data["content"] = state.get("content", "")
+            for key in ("model", "model_provider"):
+                if not data.get(key):
+                    data[key] = state.get(key)
+            response = self._parse_result(data)
+            response.metrics.client_time_to_first_token = state.get("ttft") or elapsed
+            response.metrics.client_duration = elapsed
+            return StreamEvent(event=event, content=response.content, elapsed=elapsed, response=response)
+        if event == "RunError":
+            raise ValueError(f"Erro na execução do agente: {data.get('content') or data.get('error')}")
+        return None
+
+    def _connection_error(self) -> ConnectionError:
+        return ConnectionError(
+            f"Não foi possível conectar ao AgentOS em {self.base_url}. "
+            "Verifique se o servidor está rodando."
+        )
+
+    def _timeout_error(self) -> TimeoutError:
+        return TimeoutError(
+            f"Timeout ao aguardar resposta do agente ({self.timeout}s)."
+        )
+
+
+class AgentOSClient(_BaseAgentOSClient):
     """Cliente para interagir com o AgentOS via API REST.
     
     Esta classe fornece uma interface simples e profissional para 
-    comunicação com agentes do AgentOS.
+    comunicação com agentes do AgentOS. As requisições usam uma
+    `requests.Session` com pool de conexões (keep-alive), que pode ser
+    compartilhada entre vários clientes/sessões do mesmo processo.
     
     Attributes:
         base_url: URL base do AgentOS (padrão: http://localhost:7777).
@@ -126,6 +299,10 @@ class AgentOSClient:
         >>> response = client.send_message("Qual é a capital do Brasil?")
         >>> print(response.content)
         A capital do Brasil é Brasília.
+
+        >>> # Várias sessões reaproveitando as mesmas conexões
+        >>> http = AgentOSClient.create_http_session(pool_size=32)
+        >>> clients = [AgentOSClient(http_session=http) for _ in range(32)]
     """
     
     def __init__(
@@ -133,7 +310,9 @@ class AgentOSClient:
         base_url: str = "http://localhost:7777",
         agent_id: str = "agenteddy", # Assistant
         session_id: Optional[str] = None,
-        timeout: int = 60
+        timeout: int = 60,
+        http_session: Optional[requests.Session] = None,
+        pool_size: int = 10
     ) -> None:
         """Inicializa o cliente do AgentOS.
         
@@ -142,17 +321,30 @@ class AgentOSClient:
             agent_id: ID do agente para interação.
             session_id: ID da sessão (opcional, para manter contexto).
             timeout: Timeout para requisições em segundos.
+            http_session: Sessão HTTP compartilhada (opcional). Se não
+                fornecida, o cliente cria e fecha a própria.
+            pool_size: Conexões mantidas no pool da sessão criada.
         """
-        self.base_url = base_url.rstrip("/")
-        self.agent_id = agent_id
-        self.session_id = session_id
-        self.timeout = timeout
+        super().__init__(base_url, agent_id, session_id, timeout)
+        self._owns_http = http_session is None
+        self._http = http_session or self.create_http_session(pool_size)
         self._console = Console()
-    
-    @property
-    def _endpoint(self) -> str:
-        """Retorna o endpoint completo para execução do agente."""
-        return f"{self.base_url}/agents/{self.agent_id}/runs"
+
+    @staticmethod
+    def create_http_session(pool_size: int = 10) -> requests.Session:
+        """Cria uma sessão HTTP com pool de conexões keep-alive.
+
+        Args:
+            pool_size: Conexões mantidas abertas por host.
+
+        Returns:
+            requests.Session: Sessão pronta para ser compartilhada.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
     
     def send_message(
         self,
@@ -179,45 +371,84 @@ class AgentOSClient:
             >>> response = client.send_message("Olá!")
             >>> print(response.content)
         """
-        data: dict[str, str] = {
-            "message": message,
-            "stream": str(stream).lower()
-        }
-        
-        if self.session_id:
-            data["session_id"] = self.session_id
-        
-        if user_id:
-            data["user_id"] = user_id
-        
+        if stream:
+            # Consome o stream de eventos e devolve apenas a resposta final
+            for event in self.stream_message(message, user_id=user_id):
+                if event.response is not None:
+                    return event.response
+            raise ValueError("Stream encerrado sem o evento RunCompleted.")
+
+        start = time.perf_counter()
         try:
-            response = requests.post(
+            response = self._http.post(
                 self._endpoint,
-                data=data,
+                data=self._form_data(message, stream, user_id),
                 timeout=self.timeout
             )
             response.raise_for_status()
             
         except requests.exceptions.ConnectionError as e:
-            raise ConnectionError(
-                f"Não foi possível conectar ao AgentOS em {self.base_url}. "
-                "Verifique se o servidor está rodando."
-            ) from e
+            raise self._connection_error() from e
         except requests.exceptions.Timeout as e:
-            raise TimeoutError(
-                f"Timeout ao aguardar resposta do agente ({self.timeout}s)."
-            ) from e
+            raise self._timeout_error() from e
         except requests.exceptions.HTTPError as e:
             raise ValueError(f"Erro na requisição: {e}") from e
         
-        resultado = response.json()
-        
-        # Atualizar session_id se retornado
-        if "session_id" in resultado:
-            self.session_id = resultado["session_id"]
-        
-        # Criar resposta usando Pydantic (valida e converte tipos automaticamente)
-        return AgentResponse.from_api_response(resultado)
+        result = self._parse_result(response.json())
+        result.metrics.client_duration = time.perf_counter() - start
+        return result
+
+    def stream_message(
+        self,
+        message: str,
+        user_id: Optional[str] = None
+    ) -> Iterator[StreamEvent]:
+        """Envia uma mensagem e produz os eventos da resposta conforme chegam.
+
+        Os deltas de conteúdo (RunContent) e os eventos de ferramenta são
+        repassados imediatamente; o último evento (RunCompleted) traz a
+        resposta completa, com o tempo até o primeiro token medido no cliente.
+
+        Args:
+            message: A mensagem a ser enviada ao agente.
+            user_id: ID do usuário (opcional).
+
+        Yields:
+            StreamEvent: Deltas, eventos de ferramenta e a resposta final.
+
+        Raises:
+            ConnectionError: Se não conseguir conectar ao AgentOS.
+            TimeoutError: Se o agente ficar sem enviar dados além do timeout.
+            ValueError: Se a requisição ou a execução falhar.
+
+        Example:
+            >>> for event in client.stream_message("Olá!"):
+            ...     print(event.content, end="", flush=True)
+        """
+        start = time.perf_counter()
+        state: dict = {}
+        parser = _SSEParser()
+        try:
+            with self._http.post(
+                self._endpoint,
+                data=self._form_data(message, True, user_id),
+                timeout=self.timeout,
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines(decode_unicode=True):
+                    parsed = parser.feed(line)
+                    if parsed is not None:
+                        event = self._stream_event(*parsed, start, state)
+                        if event is not None:
+                            yield event
+
+        except requests.exceptions.ConnectionError as e:
+            raise self._connection_error() from e
+        except requests.exceptions.Timeout as e:
+            raise self._timeout_error() from e
+        except requests.exceptions.HTTPError as e:
+            raise ValueError(f"Erro na requisição: {e}") from e
     
     def health_check(self) -> bool:
         """Verifica se o AgentOS está disponível.
@@ -226,7 +457,7 @@ class AgentOSClient:
             bool: True se o servidor está disponível, False caso contrário.
         """
         try:
-            response = requests.get(
+            response = self._http.get(
                 f"{self.base_url}/health",
                 timeout=5
             )
@@ -234,6 +465,341 @@ class AgentOSClient:
         except requests.exceptions.RequestException:
             return False
 
+    def close(self) -> None:
+        """Fecha as conexões do pool (apenas se a sessão HTTP for do cliente)."""
+        if self._owns_http:
+            self._http.close()
+
+    def __enter__(self) -> "AgentOSClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class AsyncAgentOSClient(_BaseAgentOSClient):
+    """Versão assíncrona do AgentOSClient, baseada em `httpx.AsyncClient`.
+
+    Mantém um pool de conexões keep-alive (opcionalmente HTTP/2) e devolve o
+    mesmo `AgentResponse`. Um único `httpx.AsyncClient` pode ser
+    compartilhado por muitas sessões concorrentes.
+
+    Example:
+        >>> async with AsyncAgentOSClient() as client:
+        ...     response = await client.send_message("Olá!")
+        ...     print(response.content)
+
+        >>> http = AsyncAgentOSClient.create_http_client(max_connections=100)
+        >>> clients = [AsyncAgentOSClient(http_client=http) for _ in range(100)]
+        >>> await asyncio.gather(*(c.send_message("Olá!") for c in clients))
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:7777",
+        agent_id: str = "agenteddy", # Assistant
+        session_id: Optional[str] = None,
+        timeout: int = 60,
+        http_client: Optional[httpx.AsyncClient] = None,
+        max_connections: int = 100,
+        http2: bool = False
+    ) -> None:
+        """Inicializa o cliente assíncrono do AgentOS.
+
+        Args:
+            base_url: URL base do AgentOS.
+            agent_id: ID do agente para interação.
+            session_id: ID da sessão (opcional, para manter contexto).
+            timeout: Timeout para requisições em segundos.
+            http_client: Cliente httpx compartilhado (opcional). Se não
+                fornecido, o cliente cria e fecha o próprio.
+            max_connections: Tamanho do pool do cliente criado.
+            http2: Habilita HTTP/2 no cliente criado (requer `httpx[http2]`).
+        """
+        super().__init__(base_url, agent_id, session_id, timeout)
+        self._owns_http = http_client is None
+        self._http = http_client or self.create_http_client(max_connections, http2)
+
+    @staticmethod
+    def create_http_client(max_connections: int = 100, http2: bool = False) -> httpx.AsyncClient:
+        """Cria um `httpx.AsyncClient` com pool de conexões keep-alive.
+
+        Args:
+            max_connections: Conexões simultâneas máximas (todas mantidas vivas).
+            http2: Habilita HTTP/2 (requer o pacote `h2`, via `httpx[http2]`).
+
+        Returns:
+            httpx.AsyncClient: Cliente pronto para ser compartilhado.
+        """
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            ),
+            http2=http2
+        )
+
+    async def send_message(
+        self,
+        message: str,
+        stream: bool = False,
+        user_id: Optional[str] = None
+    ) -> AgentResponse:
+        """Envia uma mensagem ao agente e retorna a resposta.
+
+        Args:
+            message: A mensagem a ser enviada ao agente.
+            stream: Se True, habilita streaming da resposta.
+            user_id: ID do usuário (opcional).
+
+        Returns:
+            AgentResponse: Objeto contendo a resposta e metadados.
+
+        Raises:
+            ConnectionError: Se não conseguir conectar ao AgentOS.
+            TimeoutError: Se o agente não responder dentro do timeout.
+            ValueError: Se a resposta for inválida.
+        """
+        if stream:
+            async for event in self.stream_message(message, user_id=user_id):
+                if event.response is not None:
+                    return event.response
+            raise ValueError("Stream encerrado sem o evento RunCompleted.")
+
+        start = time.perf_counter()
+        try:
+            response = await self._http.post(
+                self._endpoint,
+                data=self._form_data(message, stream, user_id),
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+
+        except httpx.ConnectError as e:
+            raise self._connection_error() from e
+        except httpx.TimeoutException as e:
+            raise self._timeout_error() from e
+        except httpx.HTTPStatusError as e:
+            raise ValueError(f"Erro na requisição: {e}") from e
+
+        result = self._parse_result(response.json())
+        result.metrics.client_duration = time.perf_counter() - start
+        return result
+
+    async def stream_message(
+        self,
+        message: str,
+        user_id: Optional[str] = None
+    ) -> AsyncIterator[StreamEvent]:
+        """Versão assíncrona de `AgentOSClient.stream_message`.
+
+        Args:
+            message: A mensagem a ser enviada ao agente.
+            user_id: ID do usuário (opcional).
+
+        Yields:
+            StreamEvent: Deltas, eventos de ferramenta e a resposta final.
+        """
+        start = time.perf_counter()
+        state: dict = {}
+        parser = _SSEParser()
+        try:
+            async with self._http.stream(
+                "POST",
+                self._endpoint,
+                data=self._form_data(message, True, user_id),
+                timeout=self.timeout
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    parsed = parser.feed(line)
+                    if parsed is not None:
+                        event = self._stream_event(*parsed, start, state)
+                        if event is not None:
+                            yield event
+
+        except httpx.ConnectError as e:
+            raise self._connection_error() from e
+        except httpx.TimeoutException as e:
+            raise self._timeout_error() from e
+        except httpx.HTTPStatusError as e:
+            raise ValueError(f"Erro na requisição: {e}") from e
+
+    async def health_check(self) -> bool:
+        """Verifica se o AgentOS está disponível.
+
+        Returns:
+            bool: True se o servidor está disponível, False caso contrário.
+        """
+        try:
+            response = await self._http.get(f"{self.base_url}/health", timeout=5)
+            return response.status_code == 200
+        except httpx.HTTPError:
+            return False
+
+    async def aclose(self) -> None:
+        """Fecha as conexões do pool (apenas se o cliente httpx for do próprio cliente)."""
+        if self._owns_http:
+            await self._http.aclose()
+
+    async def __aenter__(self) -> "AsyncAgentOSClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+
+class PerformanceSample(BaseModel):
+    """Métricas de uma resposta, como gravadas no CSV de desempenho.
+
+    Os tempos são os medidos no cliente (incluem rede e fila do servidor);
+    sem streaming não há TTFT no cliente e usa-se o reportado pelo servidor.
+
+    Attributes:
+        timestamp: Momento em que a resposta terminou (ISO 8601).
+        model: Modelo que respondeu.
+        session_id: ID da sessão.
+        run_id: ID da execução.
+        ttft: Tempo até o primeiro token (segundos).
+        duration: Duração total (segundos).
+        tokens_per_second: Tokens de saída por segundo de geração
+            (após o primeiro token, quando o TTFT é conhecido).
+        input_tokens: Tokens de entrada.
+        output_tokens: Tokens de saída.
+        total_tokens: Total de tokens.
+    """
+    timestamp: str
+    model: str
+    session_id: Optional[str] = None
+    run_id: Optional[str] = None
+    ttft: float = 0.0
+    duration: float = 0.0
+    tokens_per_second: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    total_tokens: int = 0
+
+    @classmethod
+    def from_response(cls, response: AgentResponse) -> "PerformanceSample":
+        """Extrai a amostra de uma resposta do agente."""
+        metrics = response.metrics
+        ttft = metrics.client_time_to_first_token or metrics.time_to_first_token
+        duration = metrics.client_duration or metrics.duration
+        generation = duration - ttft if 0 < ttft < duration else duration
+        return cls(
+            timestamp=datetime.now().isoformat(timespec="seconds"),
+            model=response.model or "desconhecido",
+            session_id=response.session_id,
+            run_id=response.run_id,
+            ttft=ttft,
+            duration=duration,
+            tokens_per_second=metrics.output_tokens / generation if generation > 0 else 0.0,
+            input_tokens=metrics.input_tokens,
+            output_tokens=metrics.output_tokens,
+            total_tokens=metrics.total_tokens,
+        )
+
+
+class PerformanceTracker:
+    """Acumula as métricas das respostas da sessão de chat.
+
+    Os percentis usam as últimas `window` respostas (janela móvel); os totais
+    de tokens e o CSV usam todas as respostas da sessão.
+
+    Example:
+        >>> tracker = PerformanceTracker(window=50)
+        >>> tracker.record(response)
+        >>> console.print(tracker.panel())
+        >>> tracker.export_csv("tmp/chat_performance.csv")
+    """
+
+    def __init__(self, window: int = 50) -> None:
+        """Inicializa o acumulador.
+
+        Args:
+            window: Número de respostas recentes usadas nos percentis.
+        """
+        self.window = window
+        self.samples: list[PerformanceSample] = []
+        self._recent: dict[str, deque[PerformanceSample]] = {}
+
+    def record(self, response: AgentResponse) -> PerformanceSample:
+        """Registra as métricas de uma resposta.
+
+        Args:
+            response: Resposta do agente.
+
+        Returns:
+            PerformanceSample: Amostra registrada.
+        """
+        sample = PerformanceSample.from_response(response)
+        self.samples.append(sample)
+        for key in ("todos", sample.model):
+            self._recent.setdefault(key, deque(maxlen=self.window)).append(sample)
+        return sample
+
+    @staticmethod
+    def _percentiles(values: list[float]) -> tuple[float, float]:
+        """p50 e p95 de uma lista de valores (0.0 se vazia)."""
+        if not values:
+            return 0.0, 0.0
+        if len(values) == 1:
+            return values[0], values[0]
+        q = statistics.quantiles(values, n=100, method="inclusive")
+        return q[49], q[94]
+
+    def panel(self) -> Panel:
+        """Painel rich com os percentis por modelo e os totais da sessão."""
+        table = Table(box=None, header_style="bold magenta", pad_edge=False)
+        table.add_column("Modelo")
+        table.add_column("n", justify="right")
+        table.add_column("TTFT p50/p95 (s)", justify="right")
+        table.add_column("Duração p50/p95 (s)", justify="right")
+        table.add_column("Tokens/s p50", justify="right")
+        table.add_column("Tokens in/out (sessão)", justify="right")
+
+        models = sorted(key for key in self._recent if key != "todos")
+        for key in models + (["todos"] if len(models) > 1 else []):
+            recent = [s for s in self._recent[key] if s.duration > 0]
+            ttft = self._percentiles([s.ttft for s in recent if s.ttft > 0])
+            duration = self._percentiles([s.duration for s in recent])
+            rate, _ = self._percentiles([s.tokens_per_second for s in recent if s.tokens_per_second > 0])
+            session = [s for s in self.samples if key == "todos" or s.model == key]
+            table.add_row(
+                f"[bold]{key}[/bold]" if key == "todos" else key,
+                str(len(session)),
+                f"{ttft[0]:.2f} / {ttft[1]:.2f}" if ttft[1] > 0 else "-",
+                f"{duration[0]:.2f} / {duration[1]:.2f}",
+                f"{rate:.1f}",
+                f"{sum(s.input_tokens for s in session)} / {sum(s.output_tokens for s in session)}",
+            )
+        return Panel(
+            table,
+            title="[bold magenta]📈 Desempenho[/bold magenta]",
+            subtitle=f"[dim]percentis das últimas {self.window} respostas[/dim]",
+            border_style="magenta",
+            expand=False
+        )
+
+    def export_csv(self, path: str) -> Optional[Path]:
+        """Grava todas as amostras da sessão num CSV.
+
+        Args:
+            path: Caminho do arquivo CSV.
+
+        Returns:
+            Optional[Path]: Caminho gravado (None se não houver amostras).
+        """
+        if not self.samples:
+            return None
+        output = Path(path)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with output.open("w", newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=list(PerformanceSample.model_fields))
+            writer.writeheader()
+            writer.writerows(sample.model_dump() for sample in self.samples)
+        return output
+
 
 class InteractiveChat:
     """Interface interativa para bate-papo com o AgentOS.
@@ -248,16 +814,28 @@ class InteractiveChat:
     def __init__(
         self,
         client: Optional[AgentOSClient] = None,
-        show_metrics: bool = True
+        show_metrics: bool = True,
+        stream: bool = True,
+        show_performance: bool = False,
+        performance_csv: Optional[str] = "tmp/chat_performance.csv"
     ) -> None:
         """Inicializa o chat interativo.
         
         Args:
             client: Cliente do AgentOS (opcional, cria um novo se não fornecido).
             show_metrics: Se True, exibe métricas após cada resposta.
+            stream: Se True, exibe a resposta progressivamente conforme chega.
+            show_performance: Se True, exibe o painel de desempenho após cada
+                resposta (alternado com o comando 'perf').
+            performance_csv: CSV gravado ao sair com as métricas de todas as
+                respostas, em tmp/ (fora do git); None desativa.
         """
         self.client = client or AgentOSClient()
         self.show_metrics = show_metrics
+        self.stream = stream
+        self.show_performance = show_performance
+        self.performance_csv = performance_csv
+        self.performance = PerformanceTracker()
         self._console = Console()
         self._running = False
     
@@ -271,6 +849,7 @@ class InteractiveChat:
             "[dim]  • 'sair' ou 'exit' - Encerra o chat[/dim]\n"
             "[dim]  • 'limpar' ou 'clear' - Limpa a tela[/dim]\n"
             "[dim]  • 'metrics on/off' - Ativa/desativa métricas[/dim]\n"
+            "[dim]  • 'perf' - Mostra/oculta o painel de desempenho[/dim]\n"
             "[dim]  • 'nova sessão' - Inicia nova sessão[/dim]",
             title="[bold white]AgentOS Interactive Chat[/bold white]",
             border_style="cyan",
@@ -278,29 +857,70 @@ class InteractiveChat:
         ))
         self._console.print()
     
-    def _print_response(self, response: AgentResponse) -> None:
-        """Exibe a resposta do agente formatada.
-        
-        Args:
-            response: Resposta do agente a ser exibida.
-        """
-        # Renderizar como Markdown
-        md = Markdown(response.content)
-        self._console.print()
-        self._console.print(Panel(
-            md,
+    @staticmethod
+    def _response_panel(content: str) -> Panel:
+        """Painel da resposta do assistente (conteúdo renderizado como Markdown)."""
+        return Panel(
+            Markdown(content),
             title="[bold green]🤖 Assistente[/bold green]",
             border_style="green",
             expand=False
-        ))
-        
-        # Exibir métricas se habilitado
+        )
+
+    def _print_metrics(self, response: AgentResponse) -> None:
+        """Registra as métricas da resposta e as exibe, se habilitado."""
+        self.performance.record(response)
+        if self.show_performance:
+            self._console.print(self.performance.panel())
         if self.show_metrics and response.metrics.duration > 0:
+            ttft = response.metrics.client_time_to_first_token
             self._console.print(
                 f"[dim]⏱️ {response.metrics.duration:.2f}s | "
-                f"📊 {response.metrics.input_tokens} in | {response.metrics.output_tokens} out | "
+                + (f"⚡ 1º token em {ttft:.2f}s | " if ttft > 0 else "")
+                + f"📊 {response.metrics.input_tokens} in | {response.metrics.output_tokens} out | "
                 f"{response.metrics.total_tokens} total tokens[/dim]"
             )
+
+    def _print_response(self, response: AgentResponse) -> None:
+        """Exibe a resposta do agente formatada.
+        
+        Args:
+            response: Resposta do agente a ser exibida.
+        """
+        self._console.print()
+        self._console.print(self._response_panel(response.content))
+        self._print_metrics(response)
+
+    def _stream_response(self, message: str) -> Optional[AgentResponse]:
+        """Envia a mensagem e atualiza o painel da resposta a cada delta recebido.
+
+        Args:
+            message: Mensagem do usuário.
+
+        Returns:
+            Optional[AgentResponse]: Resposta final (None se o stream terminar sem ela).
+        """
+        content = ""
+        final = None
+        self._console.print()
+        with Live(
+            self._response_panel("⏳ ..."),
+            console=self._console,
+            refresh_per_second=12,
+            vertical_overflow="visible"
+        ) as live:
+            for event in self.client.stream_message(message):
+                if event.event == "RunContent":
+                    content += event.content
+                    live.update(self._response_panel(content))
+                elif event.event == "ToolCallStarted":
+                    live.console.print(f"[dim]🔧 {event.tool_name}...[/dim]")
+                elif event.response is not None:
+                    final = event.response
+                    live.update(self._response_panel(final.content or content))
+        if final is not None:
+            self._print_metrics(final)
+        return final
     
     def _print_user_message(self, message: str) -> None:
         """Exibe a mensagem do usuário formatada.
@@ -346,6 +966,14 @@ class InteractiveChat:
             self._console.print("[yellow]⚠️ Métricas desativadas[/yellow]")
             return True
         
+        if cmd in ("perf", "desempenho"):
+            self.show_performance = not self.show_performance
+            if self.show_performance:
+                self._console.print(self.performance.panel())
+            else:
+                self._console.print("[yellow]⚠️ Painel de desempenho oculto[/yellow]")
+            return True
+        
         if cmd in ("nova sessão", "nova sessao", "new session"):
             self.client.session_id = None
             self._console.print("[green]✅ Nova sessão iniciada[/green]")
@@ -383,12 +1011,17 @@ class InteractiveChat:
                 # Verificar se é um comando
                 if message.lower().strip() in (
                     "sair", "exit", "quit", "q", "limpar", "clear", "cls",
-                    "metrics on", "metrics off", "nova sessão", "nova sessao", "new session"
+                    "metrics on", "metrics off", "perf", "desempenho",
+                    "nova sessão", "nova sessao", "new session"
                 ):
                     self._running = self._handle_command(message)
                     continue
                 
                 # Enviar mensagem ao agente
+                if self.stream:
+                    self._stream_response(message)
+                    continue
+
                 self._console.print("[dim]⏳ Aguardando resposta...[/dim]")
                 
                 response = self.client.send_message(message)
@@ -403,11 +1036,25 @@ class InteractiveChat:
             except Exception as e:
                 self._console.print(f"\n[bold red]❌ Erro: {e}[/bold red]\n")
 
+        self._export_performance()
+
+    def _export_performance(self) -> None:
+        """Grava o CSV de desempenho da sessão ao sair (se houver respostas)."""
+        if self.performance_csv is None:
+            return
+        path = self.performance.export_csv(self.performance_csv)
+        if path is not None:
+            self._console.print(self.performance.panel())
+            self._console.print(f"[dim]📁 Métricas de {len(self.performance.samples)} respostas em {path}[/dim]\n")
+
 
 def main() -> None:
     """Função principal para executar o chat interativo."""
     chat = InteractiveChat(show_metrics=True)
-    chat.start()
+    try:
+        chat.start()
+    finally:
+        chat.client.close()
 
 
 if __name__ == "__main__":
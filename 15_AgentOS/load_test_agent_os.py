@@ -0,0 +1,278 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script load_test_agent_os.py
+============================
+Gerador de carga para o AgentOS: simula N sessões simultâneas, cada uma
+seguindo um roteiro de mensagens com tempo de reflexão entre os turnos.
+
+Coleta as métricas reportadas pelo servidor (`AgentMetrics`) e a latência
+medida no cliente, e gera um relatório de percentis (p50/p95/p99),
+vazão e taxa de erro em JSON e numa tabela rich.
+
+Run
+---
+uv run my_agent_os.py            # em outro terminal
+uv run load_test_agent_os.py
+"""
+import asyncio
+import random
+import statistics
+import time
+from pathlib import Path
+from typing import Optional
+
+from pydantic import BaseModel, Field
+from rich.console import Console
+from rich.table import Table
+
+from interacting_with_agent_os import AgentResponse, AsyncAgentOSClient
+
+BASE_URL = "http://localhost:7777"
+AGENT_ID = "agenteddy"
+SESSIONS = 20
+RAMP_UP_SECONDS = 5.0
+REPORT_FILE = "tmp/load_test_report.json"  # tmp/ fica fora do git
+
+DEFAULT_SCRIPT = [
+    "Olá! Quem é você?",
+    "Explique em duas frases o que é aprendizado de máquina.",
+    "Dê um exemplo prático disso na indústria.",
+    "Obrigado! Resuma nossa conversa em uma frase.",
+]
+
+
+class LoadTestConfig(BaseModel):
+    """Configuração do teste de carga.
+
+    Attributes:
+        base_url: URL base do AgentOS.
+        agent_id: Agente exercitado.
+        sessions: Número de sessões (usuários) simultâneas.
+        script: Mensagens enviadas em sequência por cada sessão.
+        iterations: Quantas vezes cada sessão repete o roteiro.
+        think_time_min: Tempo mínimo de reflexão entre turnos (s).
+        think_time_max: Tempo máximo de reflexão entre turnos (s).
+        ramp_up: Intervalo (s) em que as sessões são iniciadas.
+        stream: Se True, usa streaming e mede o primeiro token no cliente.
+        timeout: Timeout de cada requisição (s).
+        seed: Semente dos tempos de reflexão.
+    """
+    base_url: str = BASE_URL
+    agent_id: str = AGENT_ID
+    sessions: int = Field(default=SESSIONS, ge=1)
+    script: list[str] = Field(default_factory=lambda: list(DEFAULT_SCRIPT))
+    iterations: int = Field(default=1, ge=1)
+    think_time_min: float = Field(default=1.0, ge=0.0)
+    think_time_max: float = Field(default=3.0, ge=0.0)
+    ramp_up: float = Field(default=RAMP_UP_SECONDS, ge=0.0)
+    stream: bool = True
+    timeout: int = 120
+    seed: int = 42
+
+
+class RequestSample(BaseModel):
+    """Medição de um turno (uma mensagem enviada).
+
+    Attributes:
+        session: Índice da sessão.
+        turn: Índice do turno no roteiro.
+        started_at: Início relativo ao começo do teste (s).
+        ok: True se a resposta foi recebida sem erro.
+        error: Mensagem de erro (se houver).
+        client_latency: Latência total medida no cliente (s).
+        client_ttft: Tempo até o primeiro token no cliente (s, streaming).
+        server_ttft: `time_to_first_token` reportado pelo servidor (s).
+        server_duration: `duration` reportado pelo servidor (s).
+        input_tokens: Tokens de entrada reportados.
+        output_tokens: Tokens de saída reportados.
+    """
+    session: int
+    turn: int
+    started_at: float
+    ok: bool = True
+    error: Optional[str] = None
+    client_latency: float = 0.0
+    client_ttft: float = 0.0
+    server_ttft: float = 0.0
+    server_duration: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+class Percentiles(BaseModel):
+    """Percentis de uma métrica (em segundos)."""
+    p50: float = 0.0
+    p95: float = 0.0
+    p99: float = 0.0
+    mean: float = 0.0
+    max: float = 0.0
+
+    @classmethod
+    def of(cls, values: list[float]) -> "Percentiles":
+        if not values:
+            return cls()
+        if len(values) == 1:
+            return cls(p50=values[0], p95=values[0], p99=values[0], mean=values[0], max=values[0])
+        q = statistics.quantiles(values, n=100, method="inclusive")
+        return cls(p50=q[49], p95=q[94], p99=q[98], mean=statistics.fmean(values), max=max(values))
+
+
+class LoadReport(BaseModel):
+    """Relatório agregado do teste de carga."""
+    config: LoadTestConfig
+    wall_time: float
+    requests: int
+    errors: int
+    error_rate: float
+    throughput_rps: float
+    output_tokens_per_second: float
+    client_latency: Percentiles
+    client_ttft: Percentiles
+    server_ttft: Percentiles
+    server_duration: Percentiles
+    errors_by_type: dict[str, int] = Field(default_factory=dict)
+    samples: list[RequestSample] = Field(default_factory=list)
+
+    @classmethod
+    def build(cls, config: LoadTestConfig, samples: list[RequestSample], wall_time: float) -> "LoadReport":
+        ok = [s for s in samples if s.ok]
+        errors: dict[str, int] = {}
+        for s in samples:
+            if not s.ok:
+                kind = (s.error or "erro").split(":")[0]
+                errors[kind] = errors.get(kind, 0) + 1
+        return cls(
+            config=config,
+            wall_time=wall_time,
+            requests=len(samples),
+            errors=len(samples) - len(ok),
+            error_rate=(len(samples) - len(ok)) / len(samples) if samples else 0.0,
+            throughput_rps=len(ok) / wall_time if wall_time else 0.0,
+            output_tokens_per_second=sum(s.output_tokens for s in ok) / wall_time if wall_time else 0.0,
+            client_latency=Percentiles.of([s.client_latency for s in ok]),
+            client_ttft=Percentiles.of([s.client_ttft for s in ok if s.client_ttft > 0]),
+            server_ttft=Percentiles.of([s.server_ttft for s in ok if s.server_ttft > 0]),
+            server_duration=Percentiles.of([s.server_duration for s in ok]),
+            errors_by_type=errors,
+            samples=samples,
+        )
+
+    def to_table(self) -> Table:
+        """Tabela rich com os percentis de latência."""
+        table = Table(
+            title=(
+                f"AgentOS - {self.config.sessions} sessões | {self.requests} requisições | "
+                f"{self.throughput_rps:.2f} req/s | erros {self.error_rate:.1%}"
+            )
+        )
+        table.add_column("Métrica", style="cyan")
+        for name in ("p50", "p95", "p99", "média", "máx"):
+            table.add_column(name, justify="right")
+        for label, p in (
+            ("Latência (cliente)", self.client_latency),
+            ("1º token (cliente)", self.client_ttft),
+            ("1º token (servidor)", self.server_ttft),
+            ("Duração (servidor)", self.server_duration),
+        ):
+            table.add_row(label, *(f"{v:.3f}s" for v in (p.p50, p.p95, p.p99, p.mean, p.max)))
+        return table
+
+
+async def _send(client: AsyncAgentOSClient, message: str, stream: bool) -> AgentResponse:
+    """Envia uma mensagem; em streaming consome os deltas até a resposta final."""
+    if not stream:
+        return await client.send_message(message)
+    async for event in client.stream_message(message):
+        if event.response is not None:
+            return event.response
+    raise ValueError("Stream encerrado sem o evento RunCompleted.")
+
+
+async def _run_session(
+    index: int,
+    config: LoadTestConfig,
+    client: AsyncAgentOSClient,
+    rng: random.Random,
+    origin: float,
+    samples: list[RequestSample],
+) -> None:
+    """Executa o roteiro de uma sessão, registrando uma amostra por turno."""
+    await asyncio.sleep(config.ramp_up * index / config.sessions)
+    turns = config.script * config.iterations
+    for turn, message in enumerate(turns):
+        start = time.perf_counter()
+        sample = RequestSample(session=index, turn=turn, started_at=start - origin)
+        try:
+            response = await _send(client, message, config.stream)
+            sample.client_latency = time.perf_counter() - start
+            sample.client_ttft = response.metrics.client_time_to_first_token
+            sample.server_ttft = response.metrics.time_to_first_token
+            sample.server_duration = response.metrics.duration
+            sample.input_tokens = response.metrics.input_tokens
+            sample.output_tokens = response.metrics.output_tokens
+        except Exception as e:
+            sample.ok = False
+            sample.error = f"{type(e).__name__}: {e}"
+            sample.client_latency = time.perf_counter() - start
+        samples.append(sample)
+        if turn < len(turns) - 1:
+            await asyncio.sleep(rng.uniform(config.think_time_min, config.think_time_max))
+
+
+async def run_load_test(config: LoadTestConfig) -> LoadReport:
+    """Executa o teste de carga e devolve o relatório.
+
+    Todas as sessões compartilham o mesmo pool de conexões httpx; cada uma
+    mantém o próprio `session_id` no AgentOS.
+
+    Args:
+        config: Configuração do teste.
+
+    Returns:
+        LoadReport: Percentis, vazão, taxa de erro e amostras.
+    """
+    rng = random.Random(config.seed)
+    http = AsyncAgentOSClient.create_http_client(max_connections=config.sessions)
+    samples: list[RequestSample] = []
+    try:
+        clients = [
+            AsyncAgentOSClient(
+                base_url=config.base_url,
+                agent_id=config.agent_id,
+                timeout=config.timeout,
+                http_client=http,
+            )
+            for _ in range(config.sessions)
+        ]
+        origin = time.perf_counter()
+        await asyncio.gather(*(
+            _run_session(i, config, client, random.Random(rng.random()), origin, samples)
+            for i, client in enumerate(clients)
+        ))
+        wall_time = time.perf_counter() - origin
+    finally:
+        await http.aclose()
+    return LoadReport.build(config, samples, wall_time)
+
+
+def main() -> None:
+    """Executa o teste de carga com a configuração padrão e salva o relatório."""
+    console = Console()
+    config = LoadTestConfig()
+    console.print(
+        f"[cyan]🚀 {config.sessions} sessões x {len(config.script) * config.iterations} turnos "
+        f"contra {config.base_url} (agente {config.agent_id})[/cyan]"
+    )
+    report = asyncio.run(run_load_test(config))
+    Path(REPORT_FILE).parent.mkdir(parents=True, exist_ok=True)
+    Path(REPORT_FILE).write_text(report.model_dump_json(indent=2), encoding="utf-8")
+    console.print(report.to_table())
+    if report.errors_by_type:
+        console.print(f"[red]Erros: {report.errors_by_type}[/red]")
+    console.print(f"[dim]Relatório completo em {REPORT_FILE}[/dim]")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,19 +9,64 @@ It provides a runtime AgentOS with persistence, telemetry and tracing capabiliti
 The runtime AgentOS is a FastAPI server that orchestrates AI agents.
 
 Run:
-uv run my_agent_os.py
+uv run my_agent_os.py                                  # development (auto-reload)
+AGENT_OS_MODE=production AGENT_OS_WORKERS=4 uv run my_agent_os.py
 """
+import asyncio
+import hashlib
+import json
 import os
+import signal
+import socket
 import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Any
+
+import uvicorn
+from fastapi import FastAPI
 from pydantic import BaseModel, Field, PrivateAttr
 
 # Add the root directory to the Python path to import config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from agno.agent import Agent
+from agno.models.base import Model
 from agno.models.openai import OpenAIChat
-from agno.db.sqlite import AsyncSqliteDb
+from agno.db.sqlite import AsyncSqliteDb, SqliteDb
 from agno.os import AgentOS
+from agno.tracing.exporter import DatabaseSpanExporter
+from config.agent_warmup import AgentOSWarmup
+from config.sampled_tracing import TailSamplingProcessor, TraceSampling, setup_sampled_tracing
 from config.settings import OPENAI_API_KEY
+from config.sqlite_engine import SqliteTuning, TunedAsyncSqliteDb
+
+
+class AgentVariant(BaseModel):
+    """
+    Agent variant served next to the main agent by the same AgentOS.
+
+    Fields left as None inherit the value from the AgentOSManager.
+
+    Attributes:
+        name: Agent name (its id in the AgentOS routes is derived from it).
+        model_id: OpenAI model identifier.
+        temperature: Temperature for text generation (0.0 to 2.0).
+        max_tokens: Maximum number of tokens in the response.
+        instructions: Agent behavior instructions.
+        markdown: If True, enables markdown formatting in responses.
+
+    Example:
+        >>> AgentVariant(name="AgentEddyCreative", temperature=0.9)
+    """
+
+    name: str = Field(min_length=1, description="Name of the agent variant")
+    model_id: str | None = Field(default=None, description="OpenAI model identifier")
+    temperature: float | None = Field(default=None, ge=0.0, le=2.0)
+    max_tokens: int | None = Field(default=None, gt=200, le=600)
+    instructions: list[str] | None = Field(default=None)
+    markdown: bool | None = Field(default=None)
 
 
 class AgentOSManager(BaseModel):
@@ -38,6 +83,8 @@ class AgentOSManager(BaseModel):
         max_tokens: Maximum number of tokens in the generated response.
         agent_name: Agent identifier name.
         db_file: Path to the SQLite database file for persistence.
+        db_tuning: SQLite pragmas (WAL, synchronous, cache, mmap, busy timeout)
+            and reader pool size. None uses a plain AsyncSqliteDb.
         instructions: List of agent behavior instructions.
         markdown: If True, enables markdown formatting in responses.
         os_id: Unique identifier of the runtime AgentOS.
@@ -46,6 +93,28 @@ class AgentOSManager(BaseModel):
         version: Version of the runtime AgentOS.
         telemetry: If True, enables telemetry collection. (default: True)
         tracing: If True, enables execution tracing. (default: True)
+        trace_sampling: Head ratio and tail rules (slow/failed runs) for
+            tracing, exported in batches off the request path. None traces
+            every run with the Agno default exporter.
+        traces_db_file: SQLite file where the sampled traces are stored.
+        model: Model instance used instead of OpenAIChat(model_id), e.g. a
+            fake model for benchmarks. (default: None)
+        host: Interface the server binds to.
+        port: Port the server listens on.
+        workers: Number of worker processes in production mode.
+        graceful_timeout: Seconds each worker waits for in-flight requests
+            to finish after a shutdown signal.
+        ready_file: File created once every worker accepts requests and
+            removed on shutdown (readiness probe). (default: None)
+        warmup: If True, each process warms up the databases, model clients,
+            tools and system prompts right after startup, and `/ready`
+            answers 200 only once that is done. (default: True)
+        warmup_ping_model: If True, the warm-up also sends a tiny request to
+            each model (costs a few tokens per process start). (default: False)
+        variants: Extra agents served by the same AgentOS. Agents are cached
+            per configuration hash; variants with the same model settings
+            share the model, and all of them share the OpenAI clients and
+            the database.
 
     Example:
         >>> manager = AgentOSManager(
@@ -55,6 +124,10 @@ class AgentOSManager(BaseModel):
         ... )
         >>> app = manager.get_app()
         >>> manager.serve()
+        >>> manager.model_copy(update={"workers": 4}).serve_production()
+        >>> manager.model_copy(
+        ...     update={"variants": [AgentVariant(name="AgentEddyCreative", temperature=0.9)]}
+        ... ).get_agent("AgentEddyCreative")
     """
 
     # Model configuration:
@@ -77,6 +150,10 @@ class AgentOSManager(BaseModel):
         default="AgentEddy", min_length=1, description="Name of the agent"
     )
     db_file: str = Field(default="my_agent_os.db", description="SQLite database file")
+    db_tuning: SqliteTuning | None = Field(
+        default_factory=SqliteTuning,
+        description="SQLite pragmas and reader pool (None = AsyncSqliteDb defaults)",
+    )
     instructions: list[str] = Field(
         default=[
             "You are an AI assistant that responds educatively, kindly and factually to the user.",
@@ -104,37 +181,189 @@ class AgentOSManager(BaseModel):
     version: str = Field(default="1.0", description="Version of the AgentOS")
     telemetry: bool = Field(default=True, description="Enables telemetry")
     tracing: bool = Field(default=True, description="Enables tracing")
+    trace_sampling: TraceSampling | None = Field(
+        default_factory=TraceSampling,
+        description="Trace sampling (None = trace every run)",
+    )
+    traces_db_file: str = Field(
+        default="my_agent_os_traces.db", description="SQLite file for the traces"
+    )
+    model: Any = Field(
+        default=None, exclude=True, description="Model instance overriding model_id"
+    )
+
+    # Serving configuration:
+    host: str = Field(default="localhost", description="Interface the server binds to")
+    port: int = Field(default=7777, description="Port the server listens on")
+    workers: int = Field(
+        default=1, ge=1, description="Number of worker processes in production mode"
+    )
+    graceful_timeout: float = Field(
+        default=30.0,
+        gt=0.0,
+        description="Seconds to drain in-flight requests on shutdown",
+    )
+    ready_file: str | None = Field(
+        default=None, description="File created once all workers are ready"
+    )
+    warmup: bool = Field(default=True, description="Warm up before reporting ready")
+    warmup_ping_model: bool = Field(
+        default=False, description="Ping each model during the warm-up"
+    )
+
+    # Agent variants served by the same AgentOS:
+    variants: list[AgentVariant] = Field(
+        default_factory=list, description="Extra agent variants"
+    )
 
     # Lazy initialization pattern: cache the instances for performance optimization
     # Use PrivateAttr from Pydantic v2 for attributes that should not be serialized
-    _agent: Agent | None = PrivateAttr(default=None)
+    _agents: dict[str, Agent] = PrivateAttr(default_factory=dict)
+    _models: dict[str, Model] = PrivateAttr(default_factory=dict)
+    _database: AsyncSqliteDb | None = PrivateAttr(default=None)
+    _openai_clients: tuple | None = PrivateAttr(default=None)
+    _tracing: TailSamplingProcessor | None = PrivateAttr(default=None)
+    _warmup: AgentOSWarmup | None = PrivateAttr(default=None)
     _agent_os: AgentOS | None = PrivateAttr(default=None)
+    _app: FastAPI | None = PrivateAttr(default=None)
 
-    def _create_agent(self) -> Agent:
+    @staticmethod
+    def config_key(settings: dict) -> str:
         """
-        Create and configure the AI agent with lazy initialization.
+        Stable hash of an agent or model configuration.
+
+        Args:
+            settings: JSON-serializable settings.
 
         Returns:
-            Agent: Configured instance of the Agent with model, database and instructions.
+            str: Short hexadecimal digest used as cache key.
         """
-        if self._agent is None:
-            model = OpenAIChat(
+        payload = json.dumps(settings, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+    def _resolve(self, variant: AgentVariant | None) -> dict:
+        """
+        Merge a variant with the manager defaults.
+
+        Args:
+            variant: Variant to resolve, or None for the main agent.
+
+        Returns:
+            dict: Complete agent settings.
+        """
+        settings = {
+            "name": self.agent_name,
+            "model_id": self.model_id,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "instructions": self.instructions,
+            "markdown": self.markdown,
+        }
+        if variant is not None:
+            settings.update(variant.model_dump(exclude_none=True))
+        return settings
+
+    def _get_database(self) -> AsyncSqliteDb:
+        """
+        Create the database shared by every agent (lazy initialization).
+
+        Returns:
+            AsyncSqliteDb: Database handle.
+        """
+        if self._database is None:
+            self._database = (
+                TunedAsyncSqliteDb(db_file=self.db_file, tuning=self.db_tuning)
+                if self.db_tuning is not None
+                else AsyncSqliteDb(db_file=self.db_file)
+            )
+        return self._database
+
+    def _get_model(self, model_id: str, temperature: float, max_tokens: int) -> Model:
+        """
+        Return the model for these settings, shared by the variants that use them.
+
+        Every OpenAIChat created here reuses the same sync and async OpenAI
+        clients (and therefore the same HTTP connection pool).
+
+        Args:
+            model_id: OpenAI model identifier.
+            temperature: Temperature for text generation.
+            max_tokens: Maximum number of tokens in the response.
+
+        Returns:
+            Model: Cached model instance (or `model` when it is set).
+        """
+        if self.model is not None:
+            return self.model
+        key = self.config_key(
+            {"model_id": model_id, "temperature": temperature, "max_tokens": max_tokens}
+        )
+        if key not in self._models:
+            if self._openai_clients is None:
+                base = OpenAIChat(api_key=OPENAI_API_KEY)
+                self._openai_clients = (base.get_client(), base.get_async_client())
+            client, async_client = self._openai_clients
+            self._models[key] = OpenAIChat(
                 api_key=OPENAI_API_KEY,
-                id=self.model_id,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
+                id=model_id,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                client=client,
+                async_client=async_client,
             )
+        return self._models[key]
+
+    def _build_agent(self, settings: dict) -> Agent:
+        """
+        Build (or return the cached) agent for complete settings.
 
-            database = AsyncSqliteDb(db_file=self.db_file)
+        Args:
+            settings: Settings returned by `_resolve`.
 
-            self._agent = Agent(
-                name=self.agent_name,
-                model=model,
-                db=database,
-                instructions=self.instructions,
-                markdown=self.markdown,
+        Returns:
+            Agent: Agent with the shared model and database.
+        """
+        key = self.config_key(settings)
+        if key not in self._agents:
+            self._agents[key] = Agent(
+                name=settings["name"],
+                model=self._get_model(
+                    settings["model_id"], settings["temperature"], settings["max_tokens"]
+                ),
+                db=self._get_database(),
+                instructions=settings["instructions"],
+                markdown=settings["markdown"],
             )
-        return self._agent
+        return self._agents[key]
+
+    def get_agent(self, name: str | None = None) -> Agent:
+        """
+        Return the main agent or one of the variants by name.
+
+        Args:
+            name: Variant name; None (or the manager agent_name) for the main agent.
+
+        Returns:
+            Agent: Cached agent.
+
+        Raises:
+            KeyError: If there is no variant with this name.
+        """
+        if name is None or name == self.agent_name:
+            return self._build_agent(self._resolve(None))
+        for variant in self.variants:
+            if variant.name == name:
+                return self._build_agent(self._resolve(variant))
+        raise KeyError(f"Unknown agent variant: {name}")
+
+    def _create_agent(self) -> Agent:
+        """
+        Create and configure the main AI agent with lazy initialization.
+
+        Returns:
+            Agent: Configured instance of the Agent with model, database and instructions.
+        """
+        return self.get_agent()
 
     def _create_agent_os(self) -> AgentOS:
         """
@@ -144,7 +373,16 @@ class AgentOSManager(BaseModel):
             AgentOS: Configured instance of the runtime AgentOS.
         """
         if self._agent_os is None:
-            agent = self._create_agent()
+            agents = [self.get_agent()] + [self.get_agent(v.name) for v in self.variants]
+            tracing_db = None
+            if self.tracing and self.trace_sampling is not None:
+                # Traces go to their own file so exports never wait on the sessions writer
+                tracing_db = SqliteDb(db_file=self.traces_db_file)
+                self._tracing = setup_sampled_tracing(
+                    DatabaseSpanExporter(db=tracing_db), self.trace_sampling
+                )
+            if self.warmup:
+                self._warmup = AgentOSWarmup(agents=agents, ping_model=self.warmup_ping_model)
             self._agent_os = AgentOS(
                 id=self.os_id,
                 name=self.os_name,
@@ -152,19 +390,26 @@ class AgentOSManager(BaseModel):
                 version=self.version,
                 telemetry=self.telemetry,
                 tracing=self.tracing,
-                agents=[agent],
+                tracing_db=tracing_db,
+                agents=agents,
+                lifespan=self._warmup.lifespan if self._warmup is not None else None,
             )
         return self._agent_os
 
-    def get_app(self):
+    def get_app(self) -> FastAPI:
         """
-        Returns the FastAPI application of the AgentOS.
+        Returns the FastAPI application of the AgentOS (built once and cached).
+
+        Besides the AgentOS routes it serves `/ready` when `warmup` is enabled.
 
         Returns:
             FastAPI: Configured application ready to serve.
         """
-        agent_os = self._create_agent_os()
-        return agent_os.get_app()
+        if self._app is None:
+            self._app = self._create_agent_os().get_app()
+            if self._warmup is not None:
+                self._app.include_router(self._warmup.router())
+        return self._app
 
     def serve(self, app_path: str = "my_agent_os:app", reload: bool = True) -> None:
         """
@@ -175,7 +420,155 @@ class AgentOSManager(BaseModel):
             reload: If True, enables automatic reload in development (default: True).
         """
         agent_os = self._create_agent_os()
-        agent_os.serve(app=app_path, reload=reload)
+        agent_os.serve(app=app_path, host=self.host, port=self.port, reload=reload)
+
+    def serve_production(self, app_path: str = "my_agent_os:app") -> None:
+        """
+        Start the AgentOS in production mode with pre-forked workers.
+
+        The app (model, database and routes) is built once in this process and
+        the listening socket is opened before forking, so every worker inherits
+        both instead of re-importing the module. The databases are still
+        opened inside each worker by the app lifespan, which also runs the
+        warm-up; `ready_file` is created once every worker is warmed up. SIGTERM/SIGINT stop the
+        workers from accepting new connections and let in-flight requests finish
+        within `graceful_timeout`. Workers that die unexpectedly are replaced.
+
+        On platforms without fork it falls back to uvicorn's own workers, which
+        import `app_path` in every process.
+
+        Args:
+            app_path: Application path used by the fallback without fork.
+        """
+        if not hasattr(os, "fork"):
+            self._create_agent_os().serve(
+                app=app_path,
+                host=self.host,
+                port=self.port,
+                workers=self.workers,
+                timeout_graceful_shutdown=int(self.graceful_timeout),
+            )
+            return
+
+        app = self.get_app()
+        asyncio.run(self._provision_databases())
+        sock = socket.create_server((self.host, self.port), backlog=2048)
+        sock.set_inheritable(True)
+        ready_read, ready_write = os.pipe()
+        workers = {self._fork_worker(app, sock, ready_read, ready_write) for _ in range(self.workers)}
+        os.close(ready_write)
+
+        stopping = False
+
+        def stop(signum, frame) -> None:
+            nonlocal stopping
+            stopping = True
+            for pid in workers:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        # Readiness: every worker writes one byte to the pipe once it is serving
+        ready = 0
+        while ready < self.workers and not stopping:
+            try:
+                chunk = os.read(ready_read, self.workers - ready)
+            except InterruptedError:
+                continue
+            if not chunk:
+                break
+            ready += len(chunk)
+        if ready == self.workers:
+            print(f"AgentOS ready: {self.workers} worker(s) on http://{self.host}:{self.port}")
+            if self.ready_file:
+                Path(self.ready_file).touch()
+
+        try:
+            while workers:
+                try:
+                    pid, status = os.wait()
+                except ChildProcessError:
+                    break
+                workers.discard(pid)
+                if not stopping:
+                    print(f"Worker {pid} exited (status {status}), starting a replacement")
+                    time.sleep(1.0)
+                    workers.add(self._fork_worker(app, sock, ready_read, None))
+        finally:
+            os.close(ready_read)
+            sock.close()
+            if self.ready_file:
+                Path(self.ready_file).unlink(missing_ok=True)
+
+    async def _provision_databases(self) -> None:
+        """
+        Create the database tables before forking.
+
+        Otherwise every worker runs the table creation at startup and they
+        race on the same SQLite file. The connection pool is released so no
+        connection crosses the fork.
+        """
+        agent_os = self._create_agent_os()
+        agent_os._initialize_sync_databases()
+        await agent_os._initialize_async_databases()
+        await agent_os._close_databases()
+
+    def _fork_worker(
+        self, app: FastAPI, sock: socket.socket, ready_read: int, ready_write: int | None
+    ) -> int:
+        """
+        Fork one worker that serves `app` on the shared socket.
+
+        Args:
+            app: Application built in the parent process.
+            sock: Listening socket shared by all workers.
+            ready_read: Read end of the readiness pipe (closed in the worker).
+            ready_write: Write end of the readiness pipe, or None for replacements.
+
+        Returns:
+            int: PID of the worker.
+        """
+        pid = os.fork()
+        if pid:
+            return pid
+
+        os.close(ready_read)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        server = uvicorn.Server(
+            uvicorn.Config(
+                app,
+                lifespan="on",
+                access_log=False,
+                timeout_graceful_shutdown=int(self.graceful_timeout),
+            )
+        )
+
+        def warming_up() -> bool:
+            return self._warmup is not None and self._warmup.report.status == "warming_up"
+
+        def notify_ready() -> None:
+            # A worker counts as ready once it is serving and its warm-up succeeded
+            while (not server.started or warming_up()) and not server.should_exit:
+                time.sleep(0.05)
+            if server.started and (self._warmup is None or self._warmup.ready) and ready_write is not None:
+                os.write(ready_write, b"1")
+                os.close(ready_write)
+
+        threading.Thread(target=notify_ready, daemon=True).start()
+        try:
+            server.run(sockets=[sock])
+        except Exception:
+            traceback.print_exc()
+            os._exit(1)
+        if self._tracing is not None:
+            # os._exit skips atexit: export the spans still queued in this worker
+            self._tracing.force_flush()
+        os._exit(0)
 
 
 manager = AgentOSManager(
@@ -184,6 +577,14 @@ manager = AgentOSManager(
     max_tokens=500,  # Maximum number of tokens in the response
     agent_name="AgentEddy",  # Assistant
     db_file="my_agent_os.db",
+    db_tuning=SqliteTuning(
+        journal_mode="WAL",  # readers do not block the writer
+        synchronous="NORMAL",  # fsync at checkpoints instead of every commit
+        cache_size_kib=64 * 1024,
+        mmap_size=256 * 1024 * 1024,
+        busy_timeout_ms=5000,  # wait for the lock instead of "database is locked"
+        reader_pool_size=8,
+    ),
     instructions=[
         "You are an AI assistant, called AgentEddy, that responds educatively and usefully.",
         "Always respond in the language of the user and at the end always add an emoji.",
@@ -195,11 +596,40 @@ manager = AgentOSManager(
     version="1.0",
     telemetry=True,
     tracing=True,
+    trace_sampling=TraceSampling(
+        head_ratio=0.1,  # 10% of the runs traced in full
+        slow_threshold_ms=5000,  # plus every run slower than 5s
+        keep_errors=True,  # and every run that failed
+    ),
+    variants=[
+        AgentVariant(name="AgentEddyCreative", temperature=0.9),  # shares db and OpenAI clients
+        AgentVariant(
+            name="AgentEddyConcise",  # same model settings as AgentEddy: shares its model
+            instructions=[
+                "You are an AI assistant, called AgentEddyConcise, that answers in at most three sentences.",
+                "Always respond in the language of the user and at the end always add an emoji.",
+            ],
+        ),
+    ],
+    workers=int(os.getenv("AGENT_OS_WORKERS", "1")),
+    ready_file=os.getenv("AGENT_OS_READY_FILE"),
 )
 
 
-app = manager.get_app()
+def __getattr__(name: str) -> Any:
+    """
+    Build `app` lazily on first access (`my_agent_os:app` for uvicorn).
+
+    Importing the module does not create the model, database or routes; the
+    production server builds them once before forking the workers.
+    """
+    if name == "app":
+        return manager.get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
-    manager.serve(app_path="my_agent_os:app", reload=True)
+    if os.getenv("AGENT_OS_MODE", "development") == "production":
+        manager.serve_production(app_path="my_agent_os:app")
+    else:
+        manager.serve(app_path="my_agent_os:app", reload=True)
@@ -31,6 +31,7 @@ from agno.tools.duckduckgo import DuckDuckGoTools
 from agno.knowledge.pdf_url import PDFUrlKnowledgeBase
 from agno.vectordb.lancedb import LanceDb, SearchType
 from config.settings import OPENAI_API_KEY
+from config.embedding_cache import CachedEmbedder
 
 agent = Agent(
     model=OpenAIChat(id="o3-mini", api_key=OPENAI_API_KEY),  # o3-mini  gpt-4o
@@ -53,9 +54,12 @@ agent = Agent(
             uri="tmp/lancedb",
             table_name="receitas",
             search_type=SearchType.hybrid,
-            embedder=OpenAIEmbedder(
-                id="text-embedding-3-small", api_key=OPENAI_API_KEY
-            ),  # text-embedding-3-small     text-embedding-3-large
+            # Cache em disco: recarregar a base não paga de novo pelos mesmos embeddings
+            embedder=CachedEmbedder(
+                embedder=OpenAIEmbedder(
+                    id="text-embedding-3-small", api_key=OPENAI_API_KEY
+                ),  # text-embedding-3-small     text-embedding-3-large
+            ),
         ),
     ),
     # tools=[DuckDuckGoTools()], # OBS: Se uso internet não traz o resultado esperado ou melhor dito não traz o conteúdo exato do meu PDF.
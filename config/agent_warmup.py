@@ -0,0 +1,224 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script agent_warmup.py
+======================
+Aquecimento (warm-up) do AgentOS na inicialização e endpoint de prontidão `/ready`.
+
+Sem aquecimento, a primeira requisição depois de cada deploy paga pela criação
+das tabelas, pelas conexões com o banco, pelos clientes HTTP do modelo e pela
+montagem das ferramentas e do prompt de sistema. Aqui, assim que o servidor
+sobe, uma tarefa em segundo plano:
+
+- cria as tabelas e abre uma conexão com cada banco;
+- inicializa os clientes dos modelos (e o cliente HTTP/2 da telemetria);
+- resolve as ferramentas e monta o prompt de sistema de cada agente;
+- opcionalmente envia um "ping" mínimo a cada modelo.
+
+`/health` responde desde o início (liveness); `/ready` responde 503 até o
+aquecimento terminar e 200 depois (readiness).
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, Optional
+from uuid import uuid4
+
+from agno.agent import Agent
+from agno.db.base import AsyncBaseDb, SessionType
+from agno.models.message import Message
+from agno.run.agent import RunOutput
+from agno.run.base import RunContext
+from agno.session import AgentSession
+from agno.utils.log import logger
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import JSONResponse
+
+WARMUP_SESSION_ID = "agentos-warmup"
+PING_PROMPT = "Reply with the single word: ok"
+
+
+@dataclass
+class WarmupReport:
+    """Outcome of the warm-up (step durations in ms)."""
+
+    status: str = "warming_up"  # warming_up | ready | failed
+    steps: dict[str, float] = field(default_factory=dict)
+    errors: list[str] = field(default_factory=list)
+    duration_ms: float = 0.0
+
+
+class AgentOSWarmup:
+    """
+    Warms up the AgentOS in the background and serves `/ready`.
+
+    Database failures keep the instance not ready; failures of the other
+    steps are only reported, since the first real request repeats them anyway.
+
+    Args:
+        agents: Agents to warm up (tools and system prompt).
+        ping_model: If True, sends a tiny request to each distinct model.
+        ping_timeout: Seconds to wait for each model ping.
+
+    Example:
+        >>> warmup = AgentOSWarmup(agents=[agent], ping_model=True)
+        >>> agent_os = AgentOS(agents=[agent], lifespan=warmup.lifespan)
+        >>> app = agent_os.get_app()
+        >>> app.include_router(warmup.router())
+    """
+
+    def __init__(self, agents: list[Agent], ping_model: bool = False, ping_timeout: float = 10.0) -> None:
+        self.agents = agents
+        self.ping_model = ping_model
+        self.ping_timeout = ping_timeout
+        self.report = WarmupReport()
+        # Set once the tables exist, for background jobs that write to the same databases
+        self.databases_ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.report.status == "ready"
+
+    @asynccontextmanager
+    async def lifespan(self, app: FastAPI, agent_os: Any):
+        """AgentOS lifespan: starts the warm-up without delaying the server startup."""
+        # The warm-up creates the tables itself, so the AgentOS does not race with it
+        agent_os.auto_provision_dbs = False
+        # Reset for each process: forked workers inherit the parent's state
+        self.report = WarmupReport()
+        self.databases_ready = asyncio.Event()
+        self._task = asyncio.create_task(self.run(agent_os))
+        try:
+            yield
+        finally:
+            if not self._task.done():
+                self._task.cancel()
+
+    async def run(self, agent_os: Any) -> WarmupReport:
+        """
+        Run every warm-up step and update `report`.
+
+        Args:
+            agent_os: AgentOS whose databases are provisioned.
+
+        Returns:
+            WarmupReport: The final report.
+        """
+        start = time.perf_counter()
+        databases_ok = await self._step("databases", self._warm_databases(agent_os))
+        self.databases_ready.set()
+        await self._step("model_clients", self._warm_model_clients())
+        if any(agent.telemetry for agent in self.agents):
+            await self._step("telemetry_client", self._warm_telemetry_client())
+        for agent in self.agents:
+            await self._step(f"agent:{agent.id or agent.name}", self._warm_agent(agent))
+        if self.ping_model:
+            await self._step("model_ping", self._ping_models())
+
+        self.report.duration_ms = (time.perf_counter() - start) * 1000
+        self.report.status = "ready" if databases_ok else "failed"
+        log = logger.info if databases_ok else logger.error
+        log(f"AgentOS warm-up {self.report.status} in {self.report.duration_ms:.0f} ms: {self.report.steps}")
+        return self.report
+
+    async def _step(self, name: str, coroutine) -> bool:
+        start = time.perf_counter()
+        try:
+            await coroutine
+            return True
+        except Exception as e:
+            self.report.errors.append(f"{name}: {type(e).__name__}: {e}")
+            logger.warning(f"Warm-up step {name} failed: {e}")
+            return False
+        finally:
+            self.report.steps[name] = round((time.perf_counter() - start) * 1000, 1)
+
+    async def _warm_databases(self, agent_os: Any) -> None:
+        """Create the tables, then open a connection to each database with a real query."""
+        # The sync databases run in a thread so `/ready` keeps answering meanwhile
+        await asyncio.to_thread(agent_os._initialize_sync_databases)
+        await agent_os._initialize_async_databases()
+        databases = {id(db): db for dbs in agent_os.dbs.values() for db in dbs}
+        for db in databases.values():
+            if isinstance(db, AsyncBaseDb):
+                await db.get_session(session_id=WARMUP_SESSION_ID, session_type=SessionType.AGENT)
+            else:
+                await asyncio.to_thread(db.get_session, WARMUP_SESSION_ID, SessionType.AGENT)
+
+    def _models(self) -> list:
+        models = {id(agent.model): agent.model for agent in self.agents if agent.model is not None}
+        return list(models.values())
+
+    async def _warm_model_clients(self) -> None:
+        for model in self._models():
+            for name in ("get_client", "get_async_client"):
+                create_client = getattr(model, name, None)
+                if callable(create_client):
+                    create_client()
+
+    async def _warm_telemetry_client(self) -> None:
+        """Each run posts telemetry with a new HTTP/2 client; the first one also imports h2 and loads the CA bundle."""
+        from agno.api.agent import AgentRunCreate  # noqa: F401 (imported lazily by the first run)
+        from agno.api.api import api
+
+        async with api.AsyncClient():
+            pass
+
+    async def _warm_agent(self, agent: Agent) -> None:
+        """Resolve the tools and build the system prompt, as a run does before calling the model."""
+        agent.initialize_agent()
+        run_id = str(uuid4())
+        session = AgentSession(session_id=WARMUP_SESSION_ID, agent_id=agent.id, user_id=agent.user_id)
+        run_context = RunContext(run_id=run_id, session_id=WARMUP_SESSION_ID, user_id=agent.user_id)
+        run_response = RunOutput(run_id=run_id, agent_id=agent.id, session_id=WARMUP_SESSION_ID)
+        tools = await agent.aget_tools(
+            run_response=run_response, run_context=run_context, session=session, user_id=agent.user_id
+        )
+        functions = agent._determine_tools_for_model(
+            model=agent.model,
+            processed_tools=tools,
+            run_response=run_response,
+            run_context=run_context,
+            session=session,
+            async_mode=True,
+        )
+        await agent.aget_system_message(
+            session=session, run_context=run_context, user_id=agent.user_id, tools=functions
+        )
+
+    async def _ping_models(self) -> None:
+        for model in self._models():
+            await asyncio.wait_for(
+                model.aresponse(messages=[Message(role="user", content=PING_PROMPT)]),
+                timeout=self.ping_timeout,
+            )
+
+    def router(self, ready_endpoint: str = "/ready") -> APIRouter:
+        """
+        Router with the readiness endpoint.
+
+        Args:
+            ready_endpoint: Path of the endpoint. Defaults to "/ready".
+
+        Returns:
+            APIRouter: 200 once the warm-up is done, 503 before that (or if it failed).
+        """
+        router = APIRouter(tags=["Health"])
+
+        @router.get(ready_endpoint, operation_id="readiness_check", summary="Readiness Check")
+        async def readiness_check() -> JSONResponse:
+            report = self.report
+            return JSONResponse(
+                status_code=200 if report.status == "ready" else 503,
+                content={
+                    "status": report.status,
+                    "duration_ms": round(report.duration_ms, 1),
+                    "steps": report.steps,
+                    "errors": report.errors,
+                },
+            )
+
+        return router
@@ -0,0 +1,315 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script embedding_cache.py
+=========================
+Cache de embeddings em disco, endereçado pelo conteúdo do texto.
+
+Recriar uma tabela do LanceDB, carregar de novo a mesma base ou repetir uma
+pergunta chama o `OpenAIEmbedder` outra vez para textos que ele já embeddou.
+O `CachedEmbedder` envolve qualquer embedder do Agno e guarda cada vetor
+pela chave (id do embedder, dimensões, hash do texto):
+
+- os vetores ficam num arquivo binário de float16 (ou float32) lido via
+  memory map, e os hashes num arquivo ao lado: nada é carregado por inteiro;
+- consultas e inserções são feitas em lote; as inserções são gravadas a cada
+  `flush_every` vetores novos (e na saída do processo);
+- vários processos podem compartilhar o mesmo diretório (as gravações usam
+  lock: `fcntl.flock` no Unix, `msvcrt.locking` no Windows; sem nenhum dos
+  dois, o diretório deve ser usado por um processo só).
+
+Exemplo:
+    >>> embedder = CachedEmbedder(embedder=OpenAIEmbedder(id="text-embedding-3-small"))
+    >>> LanceDb(uri="tmp/lancedb", table_name="docs", embedder=embedder)
+"""
+import asyncio
+import atexit
+import hashlib
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from agno.knowledge.embedder.base import Embedder
+except ImportError:  # agno < 2.0, used by the older scripts of the repo
+    from agno.embedder.base import Embedder
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:  # Unix
+    msvcrt = None
+
+KEY_BYTES = 16
+# msvcrt locks are mandatory: lock a byte far past the keys, never written
+_MSVCRT_LOCK_OFFSET = 1 << 40
+
+
+def text_key(text: str) -> bytes:
+    """Hash of the text used as cache key."""
+    return hashlib.sha256(text.encode("utf-8")).digest()[:KEY_BYTES]
+
+
+def _lock(file) -> None:
+    """Exclusive lock of an open file among processes (no-op without fcntl or msvcrt)."""
+    if fcntl is not None:
+        fcntl.flock(file, fcntl.LOCK_EX)
+    elif msvcrt is not None:
+        file.seek(_MSVCRT_LOCK_OFFSET)
+        while True:
+            try:
+                msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:  # LK_LOCK gives up after 10 s
+                continue
+
+
+def _unlock(file) -> None:
+    if fcntl is not None:
+        fcntl.flock(file, fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        file.seek(_MSVCRT_LOCK_OFFSET)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _file_stem(embedder_id: str, dimensions: int, dtype: str) -> str:
+    return f"{re.sub(r'[^A-Za-z0-9_.-]+', '_', embedder_id)}-{dimensions}-{dtype}"
+
+
+class EmbeddingCache:
+    """
+    Append-only store of the vectors of one embedder.
+
+    `<name>.vec` holds the vectors row after row and `<name>.keys` the hash of
+    the text of each row, so the index is rebuilt by reading only the keys.
+    A vector is written before its key, so a crash never leaves a key without
+    its vector. Use `EmbeddingCache.open` to share one instance per file.
+
+    Args:
+        directory: Folder of the cache files.
+        embedder_id: Model of the embedder (e.g. "text-embedding-3-small").
+        dimensions: Size of the vectors.
+        dtype: "float16" (half the disk) or "float32" (exact vectors).
+        flush_every: New vectors kept in memory before being written.
+    """
+
+    _instances: Dict[Path, "EmbeddingCache"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(
+        self,
+        directory: str | Path,
+        embedder_id: str,
+        dimensions: int,
+        dtype: str = "float16",
+        flush_every: int = 256,
+    ) -> None:
+        if dtype not in ("float16", "float32"):
+            raise ValueError(f"dtype must be float16 or float32, not {dtype}")
+        self.dimensions = dimensions
+        self.dtype = np.dtype(dtype)
+        self.flush_every = flush_every
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = _file_stem(embedder_id, dimensions, dtype)
+        self.vectors_path = self.directory / f"{name}.vec"
+        self.keys_path = self.directory / f"{name}.keys"
+        self.vectors_path.touch()
+        self.keys_path.touch()
+        self.hits = 0
+        self.misses = 0
+        self._row_bytes = dimensions * self.dtype.itemsize
+        self._index: Dict[bytes, int] = {}
+        self._rows = 0
+        self._vectors: Optional[np.memmap] = None
+        self._pending: Dict[bytes, np.ndarray] = {}
+        self._lock = threading.RLock()
+        self._refresh()
+        atexit.register(self.flush)
+
+    @classmethod
+    def open(cls, directory: str | Path, embedder_id: str, dimensions: int, dtype: str = "float16", **kwargs) -> "EmbeddingCache":
+        """Cache of an embedder, shared by every caller of the process."""
+        key = Path(directory).resolve() / _file_stem(embedder_id, dimensions, dtype)
+        with cls._instances_lock:
+            cache = cls._instances.get(key)
+            if cache is None:
+                cache = cls._instances[key] = cls(directory, embedder_id, dimensions, dtype, **kwargs)
+        return cache
+
+    def __len__(self) -> int:
+        return self._rows + len(self._pending)
+
+    def get_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Cached vectors of the texts (None for the texts not in the cache)."""
+        keys = [text_key(text) for text in texts]
+        with self._lock:
+            if any(key not in self._index and key not in self._pending for key in keys):
+                # Other processes may have added them since the last read
+                self._refresh()
+            rows = [self._index.get(key) for key in keys]
+            found = [row for row in rows if row is not None]
+            # One fancy-indexing read from the memory map for the whole batch
+            stored = iter(np.asarray(self._vectors[found], dtype=np.float32)) if found else iter(())
+            results: List[Optional[List[float]]] = []
+            for key, row in zip(keys, rows):
+                if row is not None:
+                    results.append(next(stored).tolist())
+                elif key in self._pending:
+                    results.append(self._pending[key].astype(np.float32).tolist())
+                else:
+                    results.append(None)
+            hits = sum(result is not None for result in results)
+            self.hits += hits
+            self.misses += len(results) - hits
+        return results
+
+    def put_many(self, texts: List[str], vectors: List[List[float]]) -> None:
+        """Add vectors (written once `flush_every` are pending). Empty or malformed vectors are ignored."""
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                if vector is None or len(vector) != self.dimensions:
+                    continue
+                key = text_key(text)
+                if key not in self._index:
+                    self._pending[key] = np.asarray(vector, dtype=self.dtype)
+            if len(self._pending) >= self.flush_every:
+                self.flush()
+
+    def flush(self) -> None:
+        """Append the pending vectors to the files."""
+        with self._lock:
+            if not self._pending:
+                return
+            with self.keys_path.open("r+b") as lock_file:
+                _lock(lock_file)
+                try:
+                    self._refresh()
+                    pending = {key: vector for key, vector in self._pending.items() if key not in self._index}
+                    # Drop what an interrupted write left after the last complete row
+                    with self.vectors_path.open("r+b") as f:
+                        f.truncate(self._rows * self._row_bytes)
+                    lock_file.truncate(self._rows * KEY_BYTES)
+                    if pending:
+                        with self.vectors_path.open("ab") as f:
+                            f.write(np.stack(list(pending.values())).astype(self.dtype).tobytes())
+                        with self.keys_path.open("ab") as f:
+                            f.write(b"".join(pending.keys()))
+                    self._pending.clear()
+                    self._refresh()
+                finally:
+                    _unlock(lock_file)
+
+    def _refresh(self) -> None:
+        """Read the keys appended since the last read and remap the vectors."""
+        complete = min(
+            self.keys_path.stat().st_size // KEY_BYTES, self.vectors_path.stat().st_size // self._row_bytes
+        )
+        if complete <= self._rows:
+            return
+        with self.keys_path.open("rb") as f:
+            f.seek(self._rows * KEY_BYTES)
+            data = f.read((complete - self._rows) * KEY_BYTES)
+        for offset in range(0, len(data), KEY_BYTES):
+            self._index.setdefault(data[offset : offset + KEY_BYTES], self._rows + offset // KEY_BYTES)
+        self._rows = complete
+        self._vectors = np.memmap(self.vectors_path, dtype=self.dtype, mode="r", shape=(complete, self.dimensions))
+
+
+@dataclass
+class CachedEmbedder(Embedder):
+    """
+    Embedder that serves repeated texts from an `EmbeddingCache`.
+
+    Only the texts missing from the cache reach the wrapped embedder, in a
+    single batch when it supports batches. Vectors of cached texts come back
+    without usage.
+
+    Args:
+        embedder: Embedder whose vectors are cached (e.g. OpenAIEmbedder).
+        cache_dir: Folder of the cache files. Defaults to "tmp/embedding_cache".
+        dtype: "float16" or "float32". Defaults to "float16".
+        flush_every: New vectors kept in memory before being written to disk.
+    """
+
+    embedder: Optional[Embedder] = None
+    id: Optional[str] = None
+    cache_dir: str = "tmp/embedding_cache"
+    dtype: str = "float16"
+    flush_every: int = 256
+
+    def __post_init__(self):
+        if self.embedder is None:
+            raise ValueError("CachedEmbedder needs the embedder to cache")
+        # The vector store reads these from its embedder
+        self.id = getattr(self.embedder, "id", None) or type(self.embedder).__name__
+        self.dimensions = self.embedder.dimensions
+        self.enable_batch = getattr(self.embedder, "enable_batch", False)
+        self.batch_size = getattr(self.embedder, "batch_size", 100)
+        self.cache = EmbeddingCache.open(
+            self.cache_dir, self.id, self.dimensions, self.dtype, flush_every=self.flush_every
+        )
+
+    def get_embedding(self, text: str) -> List[float]:
+        return self.get_embedding_and_usage(text)[0]
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        embeddings, usages = self.get_embeddings_batch_and_usage([text])
+        return embeddings[0], usages[0]
+
+    async def async_get_embedding(self, text: str) -> List[float]:
+        return (await self.async_get_embedding_and_usage(text))[0]
+
+    async def async_get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        embeddings, usages = await self.async_get_embeddings_batch_and_usage([text])
+        return embeddings[0], usages[0]
+
+    def get_embeddings_batch_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], List[Optional[Dict]]]:
+        """Embeddings of the texts, calling the wrapped embedder only for the cache misses."""
+        embeddings, usages, missing = self._lookup(texts)
+        if missing:
+            batch = getattr(self.embedder, "get_embeddings_batch_and_usage", None)
+            if batch is not None and len(missing) > 1:
+                new_embeddings, new_usages = batch(missing)
+            else:
+                results = [self.embedder.get_embedding_and_usage(text) for text in missing]
+                new_embeddings, new_usages = [r[0] for r in results], [r[1] for r in results]
+            self._fill(texts, embeddings, usages, missing, new_embeddings, new_usages)
+        return embeddings, usages
+
+    async def async_get_embeddings_batch_and_usage(
+        self, texts: List[str]
+    ) -> Tuple[List[List[float]], List[Optional[Dict]]]:
+        """Async version of `get_embeddings_batch_and_usage`."""
+        embeddings, usages, missing = await asyncio.to_thread(self._lookup, texts)
+        if missing:
+            batch = getattr(self.embedder, "async_get_embeddings_batch_and_usage", None)
+            if batch is not None and len(missing) > 1:
+                new_embeddings, new_usages = await batch(missing)
+            else:
+                results = await asyncio.gather(*[self.embedder.async_get_embedding_and_usage(t) for t in missing])
+                new_embeddings, new_usages = [r[0] for r in results], [r[1] for r in results]
+            await asyncio.to_thread(self._fill, texts, embeddings, usages, missing, new_embeddings, new_usages)
+        return embeddings, usages
+
+    def _lookup(self, texts: List[str]):
+        embeddings = self.cache.get_many(texts)
+        usages: List[Optional[Dict]] = [None] * len(texts)
+        # Repeated texts of the batch are embedded once
+        missing = list(dict.fromkeys(text for text, embedding in zip(texts, embeddings) if embedding is None))
+        return embeddings, usages, missing
+
+    def _fill(self, texts, embeddings, usages, missing, new_embeddings, new_usages) -> None:
+        self.cache.put_many(missing, new_embeddings)
+        found = {text: (embedding, usage) for text, embedding, usage in zip(missing, new_embeddings, new_usages)}
+        for i, text in enumerate(texts):
+            if embeddings[i] is None:
+                embeddings[i], usages[i] = found.get(text, ([], None))
@@ -0,0 +1,258 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script fake_model.py
+====================
+Modelo local e determinístico para benchmarks (sem chamadas de rede).
+
+Implementa a interface `Model` do Agno: na primeira chamada de cada execução
+pede as ferramentas cujos argumentos obrigatórios consegue extrair da
+mensagem do usuário; depois responde com um texto fixo. A latência é
+simulada e todas as cópias do modelo compartilham os mesmos contadores.
+
+O `FakeEmbedder` faz o mesmo papel para os embeddings: vetores
+determinísticos derivados do hash do texto, com latência por requisição.
+"""
+import asyncio
+import copy
+import hashlib
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from agno.knowledge.embedder.base import Embedder
+from agno.models.base import Model
+from agno.models.message import Message
+from agno.models.metrics import Metrics
+from agno.models.response import ModelResponse
+
+# Argument patterns used to fill tool calls from the user message:
+DEFAULT_ARGUMENT_PATTERNS = {
+    "forno_id": r"\bF\d{3}\b",
+    "lote_id": r"\bL[\w-]*\d\b",
+}
+
+
+class FakeModelStats:
+    """Thread-safe counters shared by every copy of a FakeModel."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.tool_calls = 0
+        self._lock = threading.Lock()
+
+    def record(self, tool_calls: int = 0) -> None:
+        with self._lock:
+            self.calls += 1
+            self.tool_calls += tool_calls
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls = 0
+            self.tool_calls = 0
+
+
+@dataclass
+class FakeModel(Model):
+    """
+    Local stand-in for a chat model, for load tests and benchmarks.
+
+    Args:
+        latency: Seconds spent on each model call.
+        stream_chunk_delay: Seconds between streamed chunks.
+        reply: Final answer (default: echoes the start of the last user message).
+        call_tools: Whether to request tools on the first call of a run.
+        argument_patterns: Regex per tool argument, matched against the user message.
+        stats: Call counters (shared across deep copies).
+
+    Example:
+        >>> model = FakeModel(latency=0.2)
+        >>> agent = Agent(model=model, tools=[verificar_temperatura_forno])
+        >>> agent.run("Forno F001")
+        >>> model.stats.calls
+        2
+    """
+
+    id: str = "fake-model"
+    name: str = "FakeModel"
+    provider: str = "Local"
+
+    latency: float = 0.05
+    stream_chunk_delay: float = 0.0
+    reply: Optional[str] = None
+    call_tools: bool = True
+    argument_patterns: Dict[str, str] = field(default_factory=lambda: dict(DEFAULT_ARGUMENT_PATTERNS))
+    stats: FakeModelStats = field(default_factory=FakeModelStats)
+
+    def __deepcopy__(self, memo: dict) -> "FakeModel":
+        # Agents deep-copy their model; copies must keep counting into the same stats.
+        return copy.copy(self)
+
+    # Response logic ----------------------------------------------------------
+
+    def _tool_calls(self, messages: List[Message], tools: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Tool calls for the first call of a run; empty once tool results exist."""
+        if not self.call_tools or not tools:
+            return []
+        last_user = max((i for i, m in enumerate(messages) if m.role == "user"), default=-1)
+        if last_user < 0 or any(m.role == "tool" for m in messages[last_user:]):
+            return []
+        text = str(messages[last_user].content or "")
+        calls = []
+        for tool in tools:
+            function = tool.get("function", {})
+            required = function.get("parameters", {}).get("required", [])
+            arguments = {}
+            for name in required:
+                match = re.search(self.argument_patterns.get(name, r"(?!)"), text)
+                if match is None:
+                    break
+                arguments[name] = match.group(0)
+            else:
+                if required:
+                    calls.append({
+                        "id": f"call_{len(calls)}_{int(time.time() * 1e6)}",
+                        "type": "function",
+                        "function": {"name": function["name"], "arguments": json.dumps(arguments)},
+                    })
+        return calls
+
+    def _reply(self, messages: List[Message]) -> str:
+        if self.reply is not None:
+            return self.reply
+        last_user = next((m for m in reversed(messages) if m.role == "user"), None)
+        text = str(last_user.content or "") if last_user else ""
+        return f"Relatório (modelo local): {text[:200]}"
+
+    def _response(self, messages: List[Message], tools: Optional[List[Dict[str, Any]]]) -> ModelResponse:
+        tool_calls = self._tool_calls(messages, tools)
+        content = None if tool_calls else self._reply(messages)
+        self.stats.record(tool_calls=len(tool_calls))
+        prompt_tokens = sum(len(str(m.content or "")) for m in messages) // 4
+        completion_tokens = len(content or json.dumps(tool_calls)) // 4
+        return ModelResponse(
+            role="assistant",
+            content=content,
+            tool_calls=tool_calls,
+            response_usage=Metrics(
+                input_tokens=prompt_tokens,
+                output_tokens=completion_tokens,
+                total_tokens=prompt_tokens + completion_tokens,
+            ),
+        )
+
+    @staticmethod
+    def _chunks(response: ModelResponse) -> Iterator[ModelResponse]:
+        if response.tool_calls or not response.content:
+            yield response
+            return
+        words = response.content.split(" ")
+        for i, word in enumerate(words):
+            yield ModelResponse(
+                role="assistant" if i == 0 else None,
+                content=word if i == len(words) - 1 else word + " ",
+                response_usage=response.response_usage if i == len(words) - 1 else None,
+            )
+
+    # Model interface ---------------------------------------------------------
+
+    def invoke(self, messages: List[Message], assistant_message: Message, tools=None, **kwargs) -> ModelResponse:
+        assistant_message.metrics.start_timer()
+        time.sleep(self.latency)
+        response = self._response(messages, tools)
+        assistant_message.metrics.stop_timer()
+        return response
+
+    async def ainvoke(self, messages: List[Message], assistant_message: Message, tools=None, **kwargs) -> ModelResponse:
+        assistant_message.metrics.start_timer()
+        await asyncio.sleep(self.latency)
+        response = self._response(messages, tools)
+        assistant_message.metrics.stop_timer()
+        return response
+
+    def invoke_stream(
+        self, messages: List[Message], assistant_message: Message, tools=None, **kwargs
+    ) -> Iterator[ModelResponse]:
+        assistant_message.metrics.start_timer()
+        time.sleep(self.latency)
+        for chunk in self._chunks(self._response(messages, tools)):
+            yield chunk
+            time.sleep(self.stream_chunk_delay)
+        assistant_message.metrics.stop_timer()
+
+    async def ainvoke_stream(
+        self, messages: List[Message], assistant_message: Message, tools=None, **kwargs
+    ) -> AsyncIterator[ModelResponse]:
+        assistant_message.metrics.start_timer()
+        await asyncio.sleep(self.latency)
+        for chunk in self._chunks(self._response(messages, tools)):
+            yield chunk
+            await asyncio.sleep(self.stream_chunk_delay)
+        assistant_message.metrics.stop_timer()
+
+    def _parse_provider_response(self, response: Any, **kwargs) -> ModelResponse:
+        return response
+
+    def _parse_provider_response_delta(self, response: Any) -> ModelResponse:
+        return response
+
+
+@dataclass
+class FakeEmbedder(Embedder):
+    """
+    Local stand-in for an embedding model, for ingestion benchmarks.
+
+    Each request (a single text or a batch) waits `latency` seconds, like a
+    round trip to the embeddings API. Equal texts get equal unit vectors.
+
+    Args:
+        latency: Seconds spent on each request.
+        dimensions: Size of the vectors.
+
+    Example:
+        >>> embedder = FakeEmbedder(latency=0.3, dimensions=256)
+        >>> LanceDb(uri="tmp/bench", table_name="docs", embedder=embedder)
+        >>> embedder.requests, embedder.texts
+    """
+
+    id: str = "fake-embedder"
+    dimensions: int = 256
+    latency: float = 0.2
+    requests: int = 0
+    texts: int = 0
+
+    def _vector(self, text: str) -> List[float]:
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+        vector = np.random.default_rng(seed).standard_normal(self.dimensions)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def get_embedding(self, text: str) -> List[float]:
+        return self.get_embedding_and_usage(text)[0]
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        self.requests += 1
+        self.texts += 1
+        time.sleep(self.latency)
+        return self._vector(text), None
+
+    async def async_get_embedding(self, text: str) -> List[float]:
+        return (await self.async_get_embedding_and_usage(text))[0]
+
+    async def async_get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        self.requests += 1
+        self.texts += 1
+        await asyncio.sleep(self.latency)
+        return self._vector(text), None
+
+    async def async_get_embeddings_batch_and_usage(
+        self, texts: List[str]
+    ) -> Tuple[List[List[float]], List[Optional[Dict]]]:
+        self.requests += 1
+        self.texts += len(texts)
+        await asyncio.sleep(self.latency)
+        return [self._vector(text) for text in texts], [None] * len(texts)
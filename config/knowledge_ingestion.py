@@ -0,0 +1,283 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script knowledge_ingestion.py
+=============================
+Ingestão da base de conhecimento em segundo plano, com progresso consultável.
+
+Chamar `knowledge.add_content(path=...)` na construção do servidor faz o
+AgentOS só abrir a porta depois de ler e embeddar todos os documentos. Aqui a
+ingestão roda como uma tarefa assíncrona iniciada no lifespan do AgentOS:
+
+- um arquivo por vez, numa thread (a leitura dos PDFs não bloqueia o event loop);
+- o servidor responde desde o início e os agentes buscam no que já foi indexado;
+- o progresso fica em `GET /knowledge/ingestion` e nos logs.
+
+Com `incremental=True` cada arquivo passa pelo `IncrementalIndexer` de
+`config.knowledge_manifest`: só as páginas novas ou alteradas são embeddadas e
+os arquivos apagados da pasta saem da base. Com `pipeline=PipelineSettings()`
+essas páginas passam pelo pipeline em estágios de `config.knowledge_pipeline`.
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Optional
+
+from agno.knowledge import Knowledge
+from agno.utils.log import logger
+from fastapi import APIRouter
+
+from config.knowledge_manifest import IncrementalIndexer, IndexStats
+from config.knowledge_pipeline import IngestionPipeline, PipelineReport, PipelineSettings
+
+
+@dataclass
+class IngestionProgress:
+    """Progress of a background ingestion."""
+
+    status: str = "pending"  # pending | running | completed | cancelled
+    files_total: int = 0
+    files_done: int = 0
+    files_failed: int = 0
+    current_file: Optional[str] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    errors: list[str] = field(default_factory=list)
+    # Pages and chunks of the incremental indexing (None otherwise)
+    index: Optional[IndexStats] = None
+    # Pages per second of the ingestion pipeline (None without it)
+    throughput: Optional[PipelineReport] = None
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def to_dict(self) -> dict:
+        return {
+            **asdict(self),
+            "throughput": self.throughput.to_dict() if self.throughput else None,
+            "elapsed_s": round(self.elapsed, 1),
+            "percent": round(100 * self.files_done / self.files_total, 1) if self.files_total else 0.0,
+        }
+
+
+class BackgroundIngestion:
+    """
+    Adds the files of a folder to a knowledge base without blocking the server.
+
+    Each file goes through `knowledge.add_content(path=file)`, which gives it
+    the same content hash as adding the whole folder, so `skip_if_exists`
+    keeps skipping what previous runs already indexed. With `incremental`,
+    files are compared page by page against their manifest instead, so edited
+    files are re-indexed and deleted files are removed.
+
+    Args:
+        knowledge: Knowledge base to fill.
+        path: File or folder with the documents.
+        reader: Reader used for the files (e.g. PDFReader).
+        pattern: Glob that selects the files of the folder.
+        skip_if_exists: Skip files already in the contents database (ignored with `incremental`).
+        incremental: Re-index only new or changed pages (needs LanceDb and a SQL contents_db).
+        pipeline: Stage sizes to parse, embed and write the pages in parallel
+            (see `config.knowledge_pipeline`). None indexes one file at a time.
+
+    Example:
+        >>> ingestion = BackgroundIngestion(knowledge, "data/documents", reader=PDFReader())
+        >>> agent_os = AgentOS(agents=[agent], lifespan=ingestion.lifespan)
+        >>> app = agent_os.get_app()
+        >>> app.include_router(ingestion.router())
+    """
+
+    def __init__(
+        self,
+        knowledge: Knowledge,
+        path: str | Path,
+        reader: Any = None,
+        pattern: str = "*",
+        skip_if_exists: bool = True,
+        incremental: bool = False,
+        pipeline: Optional[PipelineSettings] = None,
+    ) -> None:
+        self.knowledge = knowledge
+        self.path = Path(path)
+        self.reader = reader
+        self.pattern = pattern
+        self.skip_if_exists = skip_if_exists
+        if pipeline is not None and not incremental:
+            raise ValueError("The ingestion pipeline works on the manifest: use it with incremental=True")
+        self.indexer: Optional[IncrementalIndexer] = IncrementalIndexer(knowledge, reader) if incremental else None
+        self.pipeline: Optional[IngestionPipeline] = (
+            IngestionPipeline(self.indexer, pipeline) if pipeline is not None else None
+        )
+        self.progress = IngestionProgress()
+        self._task: Optional[asyncio.Task] = None
+        self._cancelled = False
+
+    def files(self) -> list[Path]:
+        """Files to ingest, in a stable order."""
+        if self.path.is_file():
+            return [self.path]
+        if not self.path.is_dir():
+            return []
+        return sorted(p for p in self.path.iterdir() if p.is_file() and p.match(self.pattern))
+
+    async def run(self, after: Optional[Awaitable] = None) -> IngestionProgress:
+        """
+        Ingest every file, updating `progress` after each one.
+
+        Args:
+            after: Awaited before starting, e.g. the warm-up creating the tables
+                of the contents database (both would create them at the same time).
+
+        Returns:
+            IngestionProgress: The final progress.
+        """
+        if after is not None:
+            await after
+        self.progress = IngestionProgress(
+            status="running", started_at=time.time(), index=IndexStats() if self.indexer else None
+        )
+        files = await asyncio.to_thread(self.files)
+        self.progress.files_total = len(files)
+        if self.knowledge.vector_db is not None:
+            # Searches made before the first file is indexed find an empty table instead of none
+            await asyncio.to_thread(self.knowledge.vector_db.create)
+
+        if self.pipeline is not None:
+            self.progress.throughput = self.pipeline.report
+            try:
+                await self.pipeline.run(files, on_file=self._file_done, cancelled=lambda: self._cancelled)
+            except Exception as e:
+                self.progress.errors.append(f"pipeline: {type(e).__name__}: {e}")
+                logger.error(f"Knowledge ingestion pipeline failed: {e}")
+            self.progress.throughput = self.pipeline.report
+        else:
+            for file in files:
+                if self._cancelled:
+                    break
+                self.progress.current_file = file.name
+                stats, error = None, None
+                try:
+                    if self.indexer is not None:
+                        stats = await asyncio.to_thread(self.indexer.index_file, file)
+                    else:
+                        await asyncio.to_thread(
+                            self.knowledge.add_content,
+                            path=str(file),
+                            reader=self.reader,
+                            skip_if_exists=self.skip_if_exists,
+                        )
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                self._file_done(file, stats, error)
+
+        if self._cancelled and self.progress.files_done < self.progress.files_total:
+            self.progress.status = "cancelled"
+        else:
+            # A missing folder (e.g. an unmounted volume) does not empty the knowledge base
+            if self.indexer is not None and self.path.exists():
+                try:
+                    stats = await asyncio.to_thread(self.indexer.remove_missing, files, self.path)
+                    self.progress.index.add(stats)
+                    if stats.chunks_deleted:
+                        self._refresh_fts_index()
+                except Exception as e:
+                    self.progress.errors.append(f"remove_missing: {type(e).__name__}: {e}")
+                    logger.warning(f"Failed to remove deleted files from the knowledge base: {e}")
+            self.progress.status = "completed"
+
+        self.progress.current_file = None
+        self.progress.finished_at = time.time()
+        logger.info(
+            f"Knowledge ingestion {self.progress.status}: {self.progress.files_done} files "
+            f"({self.progress.files_failed} failed) in {self.progress.elapsed:.1f}s"
+        )
+        return self.progress
+
+    def _file_done(self, file: Path, stats: Optional[IndexStats], error: Optional[str]) -> None:
+        if error is not None:
+            self.progress.files_failed += 1
+            self.progress.errors.append(f"{file.name}: {error}")
+            logger.warning(f"Failed to ingest {file}: {error}")
+        if stats is not None:
+            self.progress.index.add(stats)
+        if stats is None or stats.chunks_added or stats.chunks_deleted:
+            self._refresh_fts_index()
+        self.progress.files_done += 1
+        logger.info(f"Knowledge ingestion: {self.progress.files_done}/{self.progress.files_total} files ({file.name})")
+
+    def _refresh_fts_index(self) -> None:
+        if getattr(self.knowledge.vector_db, "fts_index_exists", False):
+            # LanceDb builds its full-text index on the first search and never refreshes it:
+            # rebuild it on the next search so the new chunks are found by keyword too
+            self.knowledge.vector_db.fts_index_exists = False
+
+    def start(self, after: Optional[Awaitable] = None) -> asyncio.Task:
+        """Start the ingestion as a task of the running event loop (see `run`)."""
+        self._cancelled = False
+        self._task = asyncio.create_task(self.run(after))
+        return self._task
+
+    def cancel(self) -> None:
+        """Stop after the file being ingested (its thread cannot be interrupted)."""
+        self._cancelled = True
+
+    async def stop(self, timeout: float = 30.0) -> None:
+        """
+        Cancel the ingestion and wait for the files being ingested.
+
+        Args:
+            timeout: Seconds to wait before cancelling the task itself. The
+                pipeline then only waits for the page batches being parsed and
+                shuts its process pool down; the files in flight keep their
+                previous manifest, so they are indexed again on the next start.
+        """
+        self.cancel()
+        if self._task is None or self._task.done():
+            return
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            self.progress.status = "cancelled"
+            self.progress.finished_at = time.time()
+            logger.warning(f"Knowledge ingestion did not stop in {timeout:g}s: cancelled")
+        except Exception as e:
+            logger.error(f"Knowledge ingestion failed while stopping: {e}")
+
+    @asynccontextmanager
+    async def lifespan(self, app: Any, after: Optional[Awaitable] = None, timeout: float = 30.0):
+        """Lifespan that starts the ingestion and stops it (see `stop`) on shutdown."""
+        self.start(after)
+        try:
+            yield
+        finally:
+            await self.stop(timeout)
+
+    def router(self, endpoint: str = "/knowledge/ingestion") -> APIRouter:
+        """
+        Router with the ingestion progress endpoint.
+
+        Args:
+            endpoint: Path of the endpoint. Defaults to "/knowledge/ingestion".
+
+        Returns:
+            APIRouter: GET endpoint returning the progress and the number of indexed chunks.
+        """
+        router = APIRouter(tags=["Knowledge"])
+
+        @router.get(endpoint, operation_id="knowledge_ingestion_progress", summary="Knowledge Ingestion Progress")
+        async def ingestion_progress() -> dict:
+            indexed = None
+            if self.knowledge.vector_db is not None:
+                try:
+                    indexed = await asyncio.to_thread(self.knowledge.vector_db.get_count)
+                except Exception:
+                    pass
+            return {**self.progress.to_dict(), "indexed_chunks": indexed}
+
+        return router
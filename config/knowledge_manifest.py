@@ -0,0 +1,532 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script knowledge_manifest.py
+============================
+Reindexação incremental da base de conhecimento com um manifesto de hashes.
+
+`knowledge.add_content(path=..., skip_if_exists=True)` decide pelo caminho do
+arquivo: editar um PDF já indexado não muda nada, e a única alternativa é
+apagar tudo e embeddar de novo. Aqui cada arquivo tem no `contents_db` um
+manifesto com o hash do arquivo e o hash de cada página:
+
+- arquivos com o mesmo tamanho e data de modificação nem são abertos;
+- de um arquivo alterado, só as páginas novas ou alteradas são extraídas,
+  divididas em chunks e embeddadas;
+- as páginas são casadas pelo hash, não pela posição: inserir ou apagar uma
+  página só muda o número das seguintes, e os chunks delas recebem o novo
+  número e id sem serem embeddados de novo;
+- os chunks das páginas alteradas ou removidas (e dos arquivos apagados)
+  saem do LanceDB por id, sem varrer a tabela.
+
+Assim, depois de editar uma página de um corpus de 10 mil páginas, a
+reindexação custa alguns segundos em vez de embeddar tudo de novo.
+"""
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field, fields, replace
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from agno.db.base import BaseDb
+from agno.db.schemas.knowledge import KnowledgeRow
+from agno.knowledge import Knowledge
+from agno.knowledge.content import Content, ContentStatus
+from agno.knowledge.document import Document
+from agno.utils.log import logger
+from agno.utils.string import generate_id
+from agno.vectordb.lancedb import LanceDb
+from pypdf import PdfReader
+from sqlalchemy import BigInteger, Column, MetaData, String, Table, Text, delete, insert, select
+
+MANIFEST_TABLE = "agno_knowledge_manifest"
+# Ids per LanceDB delete or lookup (each delete writes a new table version)
+DELETE_BATCH_SIZE = 500
+
+
+@dataclass
+class FileManifest:
+    """What was indexed from a file: file hash and (page hash, chunk count) per page."""
+
+    path: str
+    content_id: str
+    size: int
+    mtime_ns: int
+    sha256: str
+    signature: str
+    pages: list[tuple[str, int]]
+
+
+@dataclass
+class IndexStats:
+    """What an indexing pass did."""
+
+    files_skipped: int = 0
+    files_indexed: int = 0
+    files_removed: int = 0
+    pages_total: int = 0
+    pages_embedded: int = 0
+    pages_removed: int = 0
+    pages_moved: int = 0
+    chunks_added: int = 0
+    chunks_deleted: int = 0
+
+    def add(self, other: "IndexStats") -> None:
+        for f in fields(self):
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+
+
+class ManifestStore:
+    """
+    Manifest table kept in the contents database of the knowledge base.
+
+    Args:
+        db: Sync SQL contents database (SqliteDb, PostgresDb).
+        scope: Separates the manifests of different knowledge bases sharing the database.
+        table_name: Name of the manifest table.
+    """
+
+    def __init__(self, db: BaseDb, scope: str, table_name: str = MANIFEST_TABLE) -> None:
+        self.engine = getattr(db, "db_engine", None)
+        if self.engine is None or not isinstance(db, BaseDb):
+            raise ValueError("The manifest needs a sync SQL contents_db, e.g. SqliteDb or PostgresDb")
+        self.scope = scope
+        metadata = MetaData()
+        self.table = Table(
+            table_name,
+            metadata,
+            Column("scope", String, primary_key=True),
+            Column("path", String, primary_key=True),
+            Column("content_id", String, nullable=False),
+            Column("size", BigInteger, nullable=False),
+            Column("mtime_ns", BigInteger, nullable=False),
+            Column("sha256", String, nullable=False),
+            Column("signature", String, nullable=False),
+            Column("pages", Text, nullable=False),
+            Column("updated_at", BigInteger, nullable=False),
+        )
+        self._metadata = metadata
+        self._created = False
+
+    def _ensure_table(self) -> None:
+        if not self._created:
+            self._metadata.create_all(self.engine, checkfirst=True)
+            self._created = True
+
+    def get(self, path: str) -> Optional[FileManifest]:
+        self._ensure_table()
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(self.table).where(self.table.c.scope == self.scope, self.table.c.path == path)
+            ).first()
+        return self._from_row(row) if row is not None else None
+
+    def all(self) -> list[FileManifest]:
+        self._ensure_table()
+        with self.engine.connect() as conn:
+            rows = conn.execute(select(self.table).where(self.table.c.scope == self.scope)).all()
+        return [self._from_row(row) for row in rows]
+
+    def put(self, manifest: FileManifest) -> None:
+        self._ensure_table()
+        values = {
+            "scope": self.scope,
+            "path": manifest.path,
+            "content_id": manifest.content_id,
+            "size": manifest.size,
+            "mtime_ns": manifest.mtime_ns,
+            "sha256": manifest.sha256,
+            "signature": manifest.signature,
+            "pages": json.dumps(manifest.pages, separators=(",", ":")),
+            "updated_at": int(time.time()),
+        }
+        with self.engine.begin() as conn:
+            conn.execute(self._where(delete(self.table), manifest.path))
+            conn.execute(insert(self.table).values(**values))
+
+    def remove(self, path: str) -> None:
+        self._ensure_table()
+        with self.engine.begin() as conn:
+            conn.execute(self._where(delete(self.table), path))
+
+    def _where(self, statement, path: str):
+        return statement.where(self.table.c.scope == self.scope, self.table.c.path == path)
+
+    @staticmethod
+    def _from_row(row: Any) -> FileManifest:
+        return FileManifest(
+            path=row.path,
+            content_id=row.content_id,
+            size=row.size,
+            mtime_ns=row.mtime_ns,
+            sha256=row.sha256,
+            signature=row.signature,
+            pages=[tuple(page) for page in json.loads(row.pages)],
+        )
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def lance_row_id(chunk_id: str, content_hash: str) -> str:
+    """Same id that LanceDb.insert gives to a document, so the rows can be deleted without a scan."""
+    return hashlib.md5(f"{chunk_id}_{content_hash}".encode()).hexdigest()
+
+
+def split_page(reader: Any, file: Path, number: int, text: Optional[str]) -> list[Document]:
+    """
+    Chunks of a page with the chunking strategy of the reader.
+
+    Args:
+        reader: Reader of the knowledge base (e.g. PDFReader).
+        file: File of the page.
+        number: Page number, starting at 1.
+        text: Text of the page, or None to read the whole file with the reader.
+
+    Returns:
+        list[Document]: Non-empty chunks, without ids (see `IncrementalIndexer.add_page`).
+    """
+    if text is None:
+        chunks = reader.read(file, name=file.name)
+    elif not text.strip():
+        return []
+    else:
+        page = Document(name=file.name, meta_data={"page": number}, content=text)
+        chunks = reader.chunk_document(page) if getattr(reader, "chunk", True) else [page]
+    return [chunk for chunk in chunks if chunk.content.strip()]
+
+
+@dataclass
+class FilePlan:
+    """What an indexing pass has to do for a file (see `IncrementalIndexer.plan`)."""
+
+    file: Path
+    content_hash: str
+    content_id: str
+    signature: str
+    row: Optional[KnowledgeRow]
+    stats: IndexStats
+    size: int = 0
+    mtime_ns: int = 0
+    sha256: str = ""
+    page_hashes: list[str] = field(default_factory=list)
+    # (page hash, chunk count) of the kept pages, None for the pages to embed
+    pages: list[Optional[tuple[str, int]]] = field(default_factory=list)
+    # (old number, new number) of unchanged pages that only changed position
+    moves: list[tuple[int, int]] = field(default_factory=list)
+    stale_ids: list[str] = field(default_factory=list)
+    load_page: Optional[Callable[[int], str]] = None
+
+    @property
+    def up_to_date(self) -> bool:
+        return self.stats.files_skipped == 1
+
+    @property
+    def changed_pages(self) -> list[int]:
+        return [number for number, page in enumerate(self.pages, start=1) if page is None]
+
+
+class IncrementalIndexer:
+    """
+    Keeps a LanceDB knowledge base in sync with files, page by page.
+
+    PDF pages are compared by the hash of their content stream, so only the
+    text of new or changed pages is extracted. Pages are matched by hash, so
+    a page inserted or deleted only renumbers the chunks of the pages after
+    it (new ids and page metadata, same vectors). Other files count as a
+    single page. A change of chunking or embedder re-indexes every file.
+
+    The files get the same content id as `knowledge.add_content(path=file)`,
+    so they show up (and can be removed) in the AgentOS knowledge page as
+    usual. Files added by `add_content` before the manifest existed are
+    re-indexed once.
+
+    Args:
+        knowledge: Knowledge base with a LanceDb vector_db and a sync SQL contents_db.
+        reader: Reader whose chunking strategy splits the pages (e.g. PDFReader).
+        table_name: Name of the manifest table in the contents database.
+
+    Example:
+        >>> indexer = IncrementalIndexer(knowledge, reader=PDFReader(chunking_strategy=DocumentChunking()))
+        >>> stats = indexer.sync(sorted(Path("data/documents").glob("*.pdf")))
+    """
+
+    def __init__(self, knowledge: Knowledge, reader: Any, table_name: str = MANIFEST_TABLE) -> None:
+        if not isinstance(knowledge.vector_db, LanceDb):
+            raise ValueError("Incremental indexing needs a LanceDb vector_db")
+        if knowledge.contents_db is None:
+            raise ValueError("Incremental indexing needs a contents_db to keep the manifest")
+        if reader is None:
+            raise ValueError("Incremental indexing needs a reader to split the pages into chunks")
+        self.knowledge = knowledge
+        self.vector_db: LanceDb = knowledge.vector_db
+        self.reader = reader
+        self.manifest = ManifestStore(knowledge.contents_db, scope=self.vector_db.table_name, table_name=table_name)
+
+    def signature(self) -> str:
+        """Chunking and embedder settings: chunks made with other settings are stale."""
+        chunking = getattr(self.reader, "chunking_strategy", None)
+        # A CachedEmbedder returns the vectors of the embedder it wraps
+        embedder = getattr(self.vector_db.embedder, "embedder", None) or self.vector_db.embedder
+        return "|".join(
+            [
+                type(self.reader).__name__,
+                type(chunking).__name__,
+                str(getattr(chunking, "chunk_size", "")),
+                str(getattr(chunking, "overlap", "")),
+                type(embedder).__name__,
+                str(getattr(embedder, "id", "")),
+                str(getattr(embedder, "dimensions", "")),
+            ]
+        )
+
+    def sync(self, files: list[Path]) -> IndexStats:
+        """Index the given files and drop the indexed files that are no longer among them."""
+        stats = IndexStats()
+        for file in files:
+            stats.add(self.index_file(file))
+        stats.add(self.remove_missing(files))
+        return stats
+
+    def index_file(self, file: Path) -> IndexStats:
+        """
+        Bring one file up to date.
+
+        Args:
+            file: File to index.
+
+        Returns:
+            IndexStats: Pages embedded and chunks added or deleted for this file.
+        """
+        plan = self.plan(file)
+        if plan.up_to_date:
+            return plan.stats
+        documents: list[Document] = []
+        for number in plan.changed_pages:
+            text = plan.load_page(number) if plan.load_page else None
+            documents.extend(self.add_page(plan, number, split_page(self.reader, file, number, text)))
+        if documents:
+            self.vector_db.insert(plan.content_hash, documents)
+        return self.finish(plan)
+
+    def plan(self, file: Path) -> FilePlan:
+        """
+        Compare a file with its manifest.
+
+        Args:
+            file: File to index.
+
+        Returns:
+            FilePlan: Pages to embed and stale chunks to delete (`up_to_date` if none).
+        """
+        stats = IndexStats()
+        path = str(file)
+        content_hash = self.knowledge._build_content_hash(Content(path=path))
+        content_id = generate_id(content_hash)
+        signature = self.signature()
+        previous = self.manifest.get(path)
+        row = self.knowledge.contents_db.get_knowledge_content(content_id)
+        # A row removed from the AgentOS also removed its chunks: index the file again
+        current = previous is not None and previous.signature == signature and row is not None
+        plan = FilePlan(file=file, content_hash=content_hash, content_id=content_id, signature=signature, row=row, stats=stats)
+
+        stat = file.stat()
+        plan.size, plan.mtime_ns = stat.st_size, stat.st_mtime_ns
+        if current and (previous.size, previous.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+            stats.files_skipped, stats.pages_total = 1, len(previous.pages)
+            return plan
+        plan.sha256 = _file_sha256(file)
+        if current and previous.sha256 == plan.sha256:
+            # Touched or copied without changes
+            self.manifest.put(replace(previous, size=stat.st_size, mtime_ns=stat.st_mtime_ns))
+            stats.files_skipped, stats.pages_total = 1, len(previous.pages)
+            return plan
+
+        if previous is None and row is not None:
+            # Added by add_content: its chunk ids are random, so this one time they are found by scanning
+            self.vector_db.delete_by_content_id(content_id)
+
+        plan.page_hashes, plan.load_page = self._pages(file)
+        plan.pages = [None] * len(plan.page_hashes)
+        old_pages = previous.pages if previous is not None else []
+        kept: set[int] = set()
+        # Pages still at their position are kept as they are, the others can be reused by hash
+        reusable: dict[str, list[int]] = {}
+        for number, (page_hash, chunk_count) in enumerate(old_pages if current else [], start=1):
+            if number <= len(plan.page_hashes) and plan.page_hashes[number - 1] == page_hash:
+                plan.pages[number - 1] = (page_hash, chunk_count)
+                kept.add(number)
+            else:
+                reusable.setdefault(page_hash, []).append(number)
+        # A page that only moved (one inserted or deleted before it) keeps its vectors
+        for index, page_hash in enumerate(plan.page_hashes):
+            if plan.pages[index] is None and reusable.get(page_hash):
+                old_number = reusable[page_hash].pop(0)
+                plan.pages[index] = old_pages[old_number - 1]
+                plan.moves.append((old_number, index + 1))
+                kept.add(old_number)
+        stats.pages_moved = len(plan.moves)
+        for number, (page_hash, chunk_count) in enumerate(old_pages, start=1):
+            if number not in kept:
+                plan.stale_ids.extend(self._row_ids(content_id, content_hash, number, page_hash, chunk_count))
+                stats.pages_removed += number > len(plan.page_hashes)
+        return plan
+
+    def add_page(self, plan: FilePlan, number: int, chunks: list[Document]) -> list[Document]:
+        """Give the chunks of a new or changed page their ids and record them in the plan."""
+        page_hash = plan.page_hashes[number - 1]
+        for index, chunk in enumerate(chunks):
+            chunk.id = self._chunk_id(plan.content_id, number, page_hash, index)
+            chunk.content_id = plan.content_id
+        plan.pages[number - 1] = (page_hash, len(chunks))
+        plan.stats.pages_embedded += 1
+        plan.stats.chunks_added += len(chunks)
+        return chunks
+
+    def finish(self, plan: FilePlan) -> IndexStats:
+        """Delete the stale chunks and save the manifest, once the new chunks are written."""
+        # Delete after inserting, so a changed page is never missing from the searches
+        moved_ids = self._move_pages(plan)
+        self._delete_rows(plan.stale_ids + moved_ids)
+        self._save_content_row(plan.file, plan.content_id, plan.size, plan.row)
+        self.manifest.put(
+            FileManifest(
+                path=str(plan.file),
+                content_id=plan.content_id,
+                size=plan.size,
+                mtime_ns=plan.mtime_ns,
+                sha256=plan.sha256,
+                signature=plan.signature,
+                pages=plan.pages,
+            )
+        )
+        stats = plan.stats
+        stats.files_indexed, stats.pages_total, stats.chunks_deleted = 1, len(plan.pages), len(plan.stale_ids)
+        logger.info(
+            f"Indexed {plan.file.name}: {stats.pages_embedded}/{len(plan.pages)} pages embedded, "
+            f"{stats.pages_moved} moved, "
+            f"{stats.chunks_added} chunks added, {stats.chunks_deleted} deleted"
+        )
+        return stats
+
+    def remove_missing(self, files: list[Path], root: Optional[Path] = None) -> IndexStats:
+        """
+        Delete the chunks, content row and manifest of the indexed files not in `files`.
+
+        Args:
+            files: Files that still exist.
+            root: Only consider indexed files inside this folder (other folders may share the table).
+
+        Returns:
+            IndexStats: Files, pages and chunks removed.
+        """
+        stats = IndexStats()
+        present = {str(file) for file in files}
+        for manifest in self.manifest.all():
+            if manifest.path in present or (root is not None and not Path(manifest.path).is_relative_to(root)):
+                continue
+            content_hash = self.knowledge._build_content_hash(Content(path=manifest.path))
+            ids = [
+                row_id
+                for number, (page_hash, chunk_count) in enumerate(manifest.pages, start=1)
+                for row_id in self._row_ids(manifest.content_id, content_hash, number, page_hash, chunk_count)
+            ]
+            self._delete_rows(ids)
+            self.knowledge.contents_db.delete_knowledge_content(manifest.content_id)
+            self.manifest.remove(manifest.path)
+            stats.files_removed += 1
+            stats.pages_removed += len(manifest.pages)
+            stats.chunks_deleted += len(ids)
+            logger.info(f"Removed {Path(manifest.path).name} from the knowledge base ({len(ids)} chunks)")
+        return stats
+
+    def _pages(self, file: Path):
+        """Hash of each page and a function returning the text of a page."""
+        if file.suffix.lower() == ".pdf":
+            pdf = PdfReader(file)
+            hashes = []
+            for page in pdf.pages:
+                contents = page.get_contents()
+                data = contents.get_data() if contents is not None else b""
+                hashes.append(hashlib.sha256(data).hexdigest()[:32])
+            return hashes, lambda number: pdf.pages[number - 1].extract_text()
+        # Other formats are read whole by the reader, as a single page
+        return [_file_sha256(file)[:32]], None
+
+    @staticmethod
+    def _chunk_id(content_id: str, number: int, page_hash: str, index: int) -> str:
+        return f"{content_id}_p{number}_{page_hash}_{index}"
+
+    def _row_ids(self, content_id: str, content_hash: str, number: int, page_hash: str, chunk_count: int) -> list[str]:
+        return [lance_row_id(self._chunk_id(content_id, number, page_hash, index), content_hash) for index in range(chunk_count)]
+
+    def _move_pages(self, plan: FilePlan) -> list[str]:
+        """
+        Give the chunks of the moved pages the ids and page number of their new position.
+
+        The rows are copied with the same vector, so nothing is embedded again.
+
+        Returns:
+            list[str]: Row ids at the old positions, to delete once the copies are written.
+        """
+        if not plan.moves or self.vector_db.table is None:
+            return []
+        new_ids: dict[str, tuple[str, int]] = {}
+        for old_number, new_number in plan.moves:
+            page_hash, chunk_count = plan.pages[new_number - 1]
+            old_ids = self._row_ids(plan.content_id, plan.content_hash, old_number, page_hash, chunk_count)
+            moved_ids = self._row_ids(plan.content_id, plan.content_hash, new_number, page_hash, chunk_count)
+            new_ids.update((old_id, (moved_id, new_number)) for old_id, moved_id in zip(old_ids, moved_ids))
+        rows = []
+        for row in self._read_rows(list(new_ids)):
+            moved_id, number = new_ids[row[self.vector_db._id]]
+            payload = json.loads(row["payload"])
+            payload["meta_data"] = {**(payload.get("meta_data") or {}), "page": number}
+            rows.append({self.vector_db._id: moved_id, "vector": list(row["vector"]), "payload": json.dumps(payload)})
+        if rows:
+            self.vector_db.table.merge_insert(self.vector_db._id).when_matched_update_all().when_not_matched_insert_all().execute(rows)
+        return list(new_ids)
+
+    def _read_rows(self, ids: list[str]) -> list[dict]:
+        rows = []
+        for start in range(0, len(ids), DELETE_BATCH_SIZE):
+            batch = ", ".join(f"'{row_id}'" for row_id in ids[start : start + DELETE_BATCH_SIZE])
+            rows.extend(
+                self.vector_db.table.search()
+                .where(f"{self.vector_db._id} IN ({batch})")
+                .limit(DELETE_BATCH_SIZE)
+                .to_list()
+            )
+        return rows
+
+    def _delete_rows(self, ids: list[str]) -> None:
+        if not ids or self.vector_db.table is None:
+            return
+        for start in range(0, len(ids), DELETE_BATCH_SIZE):
+            batch = ", ".join(f"'{row_id}'" for row_id in ids[start : start + DELETE_BATCH_SIZE])
+            self.vector_db.table.delete(f"{self.vector_db._id} IN ({batch})")
+
+    def _save_content_row(self, file: Path, content_id: str, size: int, row: Optional[KnowledgeRow]) -> None:
+        now = int(time.time())
+        self.knowledge.contents_db.upsert_knowledge_content(
+            KnowledgeRow(
+                id=content_id,
+                name=file.name,
+                description="",
+                type=file.suffix,
+                size=size,
+                linked_to=self.knowledge.name or "",
+                access_count=row.access_count if row is not None else 0,
+                status=ContentStatus.COMPLETED,
+                status_message="",
+                created_at=row.created_at if row is not None and row.created_at else now,
+                updated_at=now,
+            )
+        )
@@ -0,0 +1,343 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script knowledge_pipeline.py
+============================
+Pipeline em estágios para a ingestão de PDFs: parsing, embeddings e escrita em paralelo.
+
+Indexando um arquivo por vez, a extração do texto (CPU) e as chamadas de
+embedding (rede) nunca se sobrepõem. Aqui as páginas novas ou alteradas
+(segundo o manifesto de `config.knowledge_manifest`) passam por três estágios
+ligados por filas limitadas:
+
+1. um pool de processos extrai o texto e divide as páginas em chunks;
+2. `embed_concurrency` tarefas assíncronas pedem os embeddings em lote;
+3. um único escritor grava os chunks no LanceDB em lotes grandes.
+
+No máximo `max_pending_tasks` lotes de páginas ficam em memória entre o
+parsing e a escrita: quando os embeddings atrasam, o parsing espera
+(backpressure). A vazão sai em páginas por segundo no `PipelineReport`.
+"""
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from agno.knowledge.document import Document
+from agno.utils.log import logger
+from pypdf import PdfReader
+
+from config.knowledge_manifest import FilePlan, IncrementalIndexer, IndexStats, lance_row_id, split_page
+
+
+@dataclass
+class PipelineSettings:
+    """
+    Sizes of the ingestion stages.
+
+    Args:
+        parse_workers: Processes that extract and chunk the pages (started only
+            once a run has more than two tasks of pages).
+        pages_per_task: Pages parsed per process task, embedded in one batch request.
+        embed_concurrency: Embedding requests in flight at the same time.
+        write_batch_size: Chunks per LanceDB write.
+        max_pending_tasks: Page batches held in memory between parsing and writing (backpressure).
+    """
+
+    parse_workers: int = max(1, min(4, (os.cpu_count() or 2) - 1))
+    pages_per_task: int = 16
+    embed_concurrency: int = 4
+    write_batch_size: int = 512
+    max_pending_tasks: int = 16
+
+
+@dataclass
+class PipelineReport:
+    """Throughput of a pipeline run (stage times add up the work of every worker)."""
+
+    files: int = 0
+    pages: int = 0
+    chunks: int = 0
+    embedding_requests: int = 0
+    writes: int = 0
+    parse_s: float = 0.0
+    embed_s: float = 0.0
+    write_s: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    @property
+    def pages_per_s(self) -> float:
+        return self.pages / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            **{k: round(v, 2) if isinstance(v, float) else v for k, v in asdict(self).items()},
+            "elapsed_s": round(self.elapsed, 2),
+            "pages_per_s": round(self.pages_per_s, 1),
+        }
+
+    def summary(self) -> str:
+        return (
+            f"{self.pages} pages, {self.chunks} chunks in {self.elapsed:.1f}s ({self.pages_per_s:.1f} pages/s; "
+            f"busy: parse {self.parse_s:.1f}s, embed {self.embed_s:.1f}s, write {self.write_s:.1f}s)"
+        )
+
+
+def _parse_pages(reader: Any, path: str, numbers: list[int], is_pdf: bool) -> tuple[list[tuple[int, list[Document]]], float]:
+    """Runs in a worker process: chunks of the given pages and the seconds it took."""
+    start = time.perf_counter()
+    file = Path(path)
+    if not is_pdf:
+        return [(1, split_page(reader, file, 1, None))], time.perf_counter() - start
+    pdf = PdfReader(file)
+    pages = [(number, split_page(reader, file, number, pdf.pages[number - 1].extract_text())) for number in numbers]
+    return pages, time.perf_counter() - start
+
+
+@dataclass
+class _FileJob:
+    plan: FilePlan
+    remaining: int
+    error: Optional[str] = None
+
+
+class IngestionPipeline:
+    """
+    Indexes files through the parse → embed → write stages.
+
+    Uses the manifest of an `IncrementalIndexer` to decide which pages to
+    embed, and finishes each file (stale chunks, manifest) only after all its
+    new chunks are written. Writes are upserts by chunk id, so a file that
+    fails halfway is simply indexed again on the next run.
+
+    Args:
+        indexer: Incremental indexer of the knowledge base.
+        settings: Sizes of the stages. Defaults to PipelineSettings().
+
+    Example:
+        >>> pipeline = IngestionPipeline(IncrementalIndexer(knowledge, reader), PipelineSettings(embed_concurrency=8))
+        >>> stats = await pipeline.run(sorted(Path("data/documents").glob("*.pdf")))
+        >>> print(pipeline.report.summary())
+    """
+
+    def __init__(self, indexer: IncrementalIndexer, settings: Optional[PipelineSettings] = None) -> None:
+        self.indexer = indexer
+        self.settings = settings or PipelineSettings()
+        self.report = PipelineReport()
+        self._stats = IndexStats()
+        self._on_file: Callable[[Path, Optional[IndexStats], Optional[str]], None] = lambda file, stats, error: None
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    async def run(
+        self,
+        files: list[Path],
+        on_file: Optional[Callable[[Path, Optional[IndexStats], Optional[str]], None]] = None,
+        cancelled: Callable[[], bool] = lambda: False,
+    ) -> IndexStats:
+        """
+        Index the files.
+
+        Args:
+            files: Files to index.
+            on_file: Called with (file, stats, None) when a file is done, or (file, None, error) if it failed.
+            cancelled: Checked before each file; files already started are finished.
+
+        Returns:
+            IndexStats: Totals of the indexed files.
+        """
+        settings = self.settings
+        self.report = PipelineReport(started_at=time.time())
+        self._stats = IndexStats()
+        self._on_file = on_file or (lambda file, stats, error: None)
+        if self.indexer.vector_db.table is None:
+            await asyncio.to_thread(self.indexer.vector_db.create)
+        embed_queue: asyncio.Queue = asyncio.Queue(maxsize=settings.embed_concurrency * 2)
+        write_queue: asyncio.Queue = asyncio.Queue(maxsize=settings.embed_concurrency * 2)
+        pending = asyncio.Semaphore(settings.max_pending_tasks)
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(self._produce(files, cancelled, group, embed_queue, pending))
+                for _ in range(settings.embed_concurrency):
+                    group.create_task(self._embed(embed_queue, write_queue))
+                group.create_task(self._write(write_queue, pending))
+        finally:
+            if self._executor is not None:
+                executor, self._executor = self._executor, None
+                await asyncio.to_thread(executor.shutdown, cancel_futures=True)
+            self.report.finished_at = time.time()
+        logger.info(f"Ingestion pipeline: {self.report.summary()}")
+        return self._stats
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a server process with running threads (uvicorn, LanceDB) is unsafe
+            self._executor = ProcessPoolExecutor(
+                self.settings.parse_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def _produce(self, files, cancelled, group, embed_queue, pending) -> None:
+        """Plan each file and send its changed pages to the process pool, a batch at a time."""
+        loop = asyncio.get_running_loop()
+        parse_tasks = []
+        submitted = 0
+        for file in files:
+            if cancelled():
+                break
+            try:
+                plan = await asyncio.to_thread(self.indexer.plan, file)
+            except Exception as e:
+                self._file_done(file, None, f"{type(e).__name__}: {e}")
+                continue
+            if plan.up_to_date:
+                self._file_done(file, plan.stats, None)
+                continue
+            is_pdf, plan.load_page = plan.load_page is not None, None  # the workers open the file themselves
+            numbers = plan.changed_pages
+            size = self.settings.pages_per_task
+            batches = [numbers[i : i + size] for i in range(0, len(numbers), size)]
+            job = _FileJob(plan=plan, remaining=len(batches))
+            if not batches:
+                # Only removed pages: nothing to embed
+                await self._complete(job)
+                continue
+            for batch in batches:
+                await pending.acquire()
+                submitted += len(batch)
+                # Small edits are parsed in a thread: starting the worker processes takes seconds
+                executor = self._pool() if submitted > 2 * size else None
+                future = loop.run_in_executor(executor, _parse_pages, self.indexer.reader, str(file), batch, is_pdf)
+                parse_tasks.append(group.create_task(self._parsed(job, future, embed_queue)))
+        await asyncio.gather(*parse_tasks)
+        for _ in range(self.settings.embed_concurrency):
+            await embed_queue.put(None)
+
+    async def _parsed(self, job: _FileJob, future, embed_queue: asyncio.Queue) -> None:
+        documents: list[Document] = []
+        try:
+            pages, seconds = await future
+            self.report.parse_s += seconds
+            self.report.pages += len(pages)
+            for number, chunks in pages:
+                documents.extend(self.indexer.add_page(job.plan, number, chunks))
+        except Exception as e:
+            job.error = f"parse: {type(e).__name__}: {e}"
+        await embed_queue.put((job, documents))
+
+    async def _embed(self, embed_queue: asyncio.Queue, write_queue: asyncio.Queue) -> None:
+        while (item := await embed_queue.get()) is not None:
+            job, documents = item
+            if documents and job.error is None:
+                try:
+                    await self._embed_documents(documents)
+                except Exception as e:
+                    job.error = f"embed: {type(e).__name__}: {e}"
+            await write_queue.put(item)
+        await write_queue.put(None)
+
+    async def _embed_documents(self, documents: list[Document]) -> None:
+        embedder = self.indexer.vector_db.embedder
+        texts = [document.content for document in documents]
+        start = time.perf_counter()
+        if hasattr(embedder, "async_get_embeddings_batch_and_usage"):
+            embeddings, usages = await embedder.async_get_embeddings_batch_and_usage(texts)
+        else:
+            results = await asyncio.gather(*[embedder.async_get_embedding_and_usage(text) for text in texts])
+            embeddings, usages = [r[0] for r in results], [r[1] for r in results]
+        self.report.embed_s += time.perf_counter() - start
+        self.report.embedding_requests += 1
+        failed = sum(1 for embedding in embeddings if not embedding) + len(texts) - len(embeddings)
+        if failed:
+            raise ValueError(f"no embedding for {failed} of {len(texts)} chunks")
+        for document, embedding, usage in zip(documents, embeddings, usages):
+            document.embedding, document.usage = embedding, usage
+
+    async def _write(self, write_queue: asyncio.Queue, pending: asyncio.Semaphore) -> None:
+        """Collect embedded chunks and write them in batches of `write_batch_size`."""
+        running = self.settings.embed_concurrency
+        rows: list[dict] = []
+        jobs: list[_FileJob] = []
+        while running:
+            item = await write_queue.get()
+            if item is None:
+                running -= 1
+                continue
+            # The batch left the stages before the writer, whose buffer is bounded by the batch size
+            pending.release()
+            job, documents = item
+            if documents and job.error is None:
+                rows.extend(self._row(document, job.plan.content_hash) for document in documents)
+            jobs.append(job)
+            if len(rows) >= self.settings.write_batch_size:
+                await self._flush(rows, jobs)
+                rows, jobs = [], []
+        await self._flush(rows, jobs)
+
+    def _row(self, document: Document, content_hash: str) -> dict:
+        # Same row as LanceDb.insert builds, without embedding the document again
+        content = document.content.replace("\x00", "\ufffd")
+        payload = {
+            "name": document.name,
+            "meta_data": document.meta_data,
+            "content": content,
+            "usage": document.usage,
+            "content_id": document.content_id,
+            "content_hash": content_hash,
+        }
+        return {
+            "id": lance_row_id(document.id, content_hash),
+            "vector": self.indexer.vector_db._prepare_vector(document.embedding),
+            "payload": json.dumps(payload),
+        }
+
+    async def _flush(self, rows: list[dict], jobs: list[_FileJob]) -> None:
+        if rows:
+            start = time.perf_counter()
+            try:
+                await asyncio.to_thread(self._upsert, rows)
+                self.report.writes += 1
+                self.report.chunks += len(rows)
+            except Exception as e:
+                for job in jobs:
+                    job.error = job.error or f"write: {type(e).__name__}: {e}"
+            self.report.write_s += time.perf_counter() - start
+        for job in jobs:
+            job.remaining -= 1
+            if job.remaining == 0:
+                await self._complete(job)
+
+    def _upsert(self, rows: list[dict]) -> None:
+        table = self.indexer.vector_db.table
+        table.merge_insert("id").when_matched_update_all().when_not_matched_insert_all().execute(rows)
+
+    async def _complete(self, job: _FileJob) -> None:
+        file = job.plan.file
+        if job.error is not None:
+            # The manifest is left as it was, so the next run indexes the file again
+            self._file_done(file, None, job.error)
+            return
+        try:
+            stats = await asyncio.to_thread(self.indexer.finish, job.plan)
+        except Exception as e:
+            self._file_done(file, None, f"{type(e).__name__}: {e}")
+            return
+        self.report.files += 1
+        self._file_done(file, stats, None)
+
+    def _file_done(self, file: Path, stats: Optional[IndexStats], error: Optional[str]) -> None:
+        if stats is not None:
+            self._stats.add(stats)
+        self._on_file(file, stats, error)
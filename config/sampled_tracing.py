@@ -0,0 +1,282 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script sampled_tracing.py
+=========================
+Tracing amostrado do Agno (OpenTelemetry) com exportação local em lote.
+
+Com `tracing=True` o AgentOS grava cada span de cada execução no banco, de
+forma síncrona (`SimpleSpanProcessor`), no caminho da requisição. Aqui:
+
+- amostragem na cabeça: uma fração `head_ratio` das execuções é rastreada
+  por completo (decisão determinística pelo trace_id);
+- amostragem na cauda: as demais ficam só em memória até o span raiz
+  terminar e são mantidas se a execução foi lenta ou falhou;
+- exportação em lote numa thread de fundo (banco de traces do Agno ou JSONL),
+  com fila limitada: quando cheia, spans são descartados e contados, nunca
+  bloqueiam a requisição.
+"""
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Sequence
+
+from agno.utils.log import logger
+from openinference.instrumentation.agno import AgnoInstrumentor
+from opentelemetry import trace as trace_api
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.sampling import Decision, Sampler, SamplingResult
+from opentelemetry.trace import StatusCode
+
+
+@dataclass
+class TraceSampling:
+    """
+    Sampling and export settings.
+
+    Args:
+        head_ratio: Fraction of runs traced in full (0.0 to 1.0).
+        slow_threshold_ms: Runs at least this slow are always kept (None disables).
+        keep_errors: If True, runs with an error span are always kept.
+        max_buffered_traces: Unsampled traces held in memory waiting for their root span.
+        max_queue_size: Spans waiting for export; beyond it spans are dropped.
+        max_export_batch_size: Spans written per export call.
+        schedule_delay_ms: Interval between exports.
+    """
+
+    head_ratio: float = 0.1
+    slow_threshold_ms: Optional[float] = 5000.0
+    keep_errors: bool = True
+    max_buffered_traces: int = 1000
+    max_queue_size: int = 4096
+    max_export_batch_size: int = 512
+    schedule_delay_ms: int = 1000
+
+    @property
+    def tail_enabled(self) -> bool:
+        return self.keep_errors or self.slow_threshold_ms is not None
+
+
+@dataclass
+class TracingStats:
+    """Counters of the sampling decisions."""
+
+    head_traces: int = 0
+    tail_traces: int = 0
+    discarded_traces: int = 0
+    exported_spans: int = 0
+    dropped_spans: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, **counts: int) -> None:
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+
+class HeadSampler(Sampler):
+    """
+    Samples `head_ratio` of the root spans; children follow their root.
+
+    Unsampled traces are still recorded (not exported) when tail sampling is
+    on, so the processor can keep them if they turn out slow or failed.
+    """
+
+    def __init__(self, sampling: TraceSampling) -> None:
+        self.sampling = sampling
+
+    def should_sample(
+        self, parent_context, trace_id, name, kind=None, attributes=None, links=None, trace_state=None
+    ) -> SamplingResult:
+        parent = trace_api.get_current_span(parent_context).get_span_context()
+        if parent.is_valid:
+            sampled = parent.trace_flags.sampled
+            trace_state = parent.trace_state
+        else:
+            # Same rule as TraceIdRatioBased: lower 64 bits of the trace_id against the ratio
+            sampled = (trace_id & 0xFFFFFFFFFFFFFFFF) < int(self.sampling.head_ratio * (1 << 64))
+        if sampled:
+            decision = Decision.RECORD_AND_SAMPLE
+        elif self.sampling.tail_enabled:
+            decision = Decision.RECORD_ONLY
+        else:
+            decision = Decision.DROP
+        return SamplingResult(decision, attributes if decision != Decision.DROP else None, trace_state)
+
+    def get_description(self) -> str:
+        return f"HeadSampler{{{self.sampling.head_ratio}}}"
+
+
+class TailSamplingProcessor(SpanProcessor):
+    """
+    Exports sampled spans and slow/failed unsampled traces in batches off the request path.
+
+    Attributes:
+        stats: Sampling and export counters.
+    """
+
+    def __init__(self, exporter: SpanExporter, sampling: TraceSampling) -> None:
+        self.exporter = exporter
+        self.sampling = sampling
+        self.stats = TracingStats()
+        self._pending: OrderedDict[int, list[ReadableSpan]] = OrderedDict()
+        self._start_worker()
+        os.register_at_fork(after_in_child=self._start_worker)
+
+    def _start_worker(self) -> None:
+        # Also runs in forked workers: the parent's thread and queued spans do not survive the fork
+        self._lock = threading.Lock()
+        self._export_lock = threading.Lock()
+        self._queue: list[ReadableSpan] = []
+        self._pending.clear()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._worker = threading.Thread(target=self._run, name="TailSamplingExporter", daemon=True)
+        self._worker.start()
+
+    def on_start(self, span: Span, parent_context=None) -> None:
+        pass
+
+    def on_end(self, span: ReadableSpan) -> None:
+        context = span.context
+        is_root = span.parent is None or span.parent.is_remote
+        if context.trace_flags.sampled:
+            if is_root:
+                self.stats.add(head_traces=1)
+            self._enqueue([span])
+            return
+
+        with self._lock:
+            spans = self._pending.setdefault(context.trace_id, [])
+            spans.append(span)
+            if is_root:
+                del self._pending[context.trace_id]
+            elif len(self._pending) > self.sampling.max_buffered_traces:
+                self._pending.popitem(last=False)
+                self.stats.add(discarded_traces=1)
+        if not is_root:
+            return
+
+        if self._keep(span, spans):
+            self.stats.add(tail_traces=1)
+            self._enqueue(spans)
+        else:
+            self.stats.add(discarded_traces=1)
+
+    def _keep(self, root: ReadableSpan, spans: list[ReadableSpan]) -> bool:
+        if self.sampling.keep_errors and any(s.status.status_code == StatusCode.ERROR for s in spans):
+            return True
+        threshold = self.sampling.slow_threshold_ms
+        return threshold is not None and (root.end_time - root.start_time) / 1e6 >= threshold
+
+    def _enqueue(self, spans: Sequence[ReadableSpan]) -> None:
+        with self._lock:
+            room = self.sampling.max_queue_size - len(self._queue)
+            if room < len(spans):
+                self.stats.add(dropped_spans=len(spans) - max(room, 0))
+                spans = spans[: max(room, 0)]
+            self._queue.extend(spans)
+            full_batch = len(self._queue) >= self.sampling.max_export_batch_size
+        if full_batch:
+            self._wake.set()
+
+    def _export_pending(self) -> None:
+        with self._export_lock:
+            while True:
+                with self._lock:
+                    batch = self._queue[: self.sampling.max_export_batch_size]
+                    del self._queue[: len(batch)]
+                if not batch:
+                    return
+                try:
+                    if self.exporter.export(batch) == SpanExportResult.SUCCESS:
+                        self.stats.add(exported_spans=len(batch))
+                    else:
+                        self.stats.add(dropped_spans=len(batch))
+                except Exception as e:
+                    logger.error(f"Failed to export {len(batch)} spans: {e}")
+                    self.stats.add(dropped_spans=len(batch))
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._wake.wait(self.sampling.schedule_delay_ms / 1000)
+            self._wake.clear()
+            self._export_pending()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        self._export_pending()
+        return True
+
+    def shutdown(self) -> None:
+        self._stopped = True
+        self._wake.set()
+        self._worker.join(timeout=5)
+        self._export_pending()
+        self.exporter.shutdown()
+
+
+class JsonlSpanExporter(SpanExporter):
+    """Appends one OpenTelemetry span per line (JSON) to a local file."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        self._file.write("".join(span.to_json(indent=None) + "\n" for span in spans))
+        self._file.flush()
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        self._file.close()
+
+
+def build_tracer_provider(
+    exporter: SpanExporter, sampling: TraceSampling
+) -> tuple[TracerProvider, TailSamplingProcessor]:
+    """
+    Create a TracerProvider with head sampling and the tail/batching processor.
+
+    Args:
+        exporter: Destination of the kept spans.
+        sampling: Sampling and export settings.
+
+    Returns:
+        tuple: The provider and its processor (for stats and flushing).
+    """
+    provider = TracerProvider(sampler=HeadSampler(sampling))
+    processor = TailSamplingProcessor(exporter, sampling)
+    provider.add_span_processor(processor)
+    return provider, processor
+
+
+def setup_sampled_tracing(
+    exporter: SpanExporter, sampling: Optional[TraceSampling] = None
+) -> Optional[TailSamplingProcessor]:
+    """
+    Install sampled tracing as the global tracer provider and instrument Agno.
+
+    Call it before creating the AgentOS: with a provider already installed,
+    `AgentOS(tracing=True)` keeps it instead of setting up its own exporter.
+
+    Args:
+        exporter: Destination of the kept spans, e.g.
+            `DatabaseSpanExporter(SqliteDb(db_file="traces.db"))` or `JsonlSpanExporter(...)`.
+        sampling: Sampling and export settings.
+
+    Returns:
+        Optional[TailSamplingProcessor]: The processor, or None if tracing was
+        already configured in this process.
+    """
+    if isinstance(trace_api.get_tracer_provider(), TracerProvider):
+        logger.debug("Tracing already configured; keeping the existing tracer provider")
+        return None
+    provider, processor = build_tracer_provider(exporter, sampling or TraceSampling())
+    trace_api.set_tracer_provider(provider)
+    AgnoInstrumentor().instrument(tracer_provider=provider)
+    return processor
@@ -0,0 +1,382 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script session_compaction.py
+============================
+Compactação e vacuum dos bancos SQLite do AgentOS, executável com o servidor no ar.
+
+Cada sessão guarda todas as suas execuções (com mensagens completas, resultados
+de ferramentas etc.) numa única coluna JSON, então carregar a sessão fica mais
+lento a cada mês. A compactação:
+
+- resume em `summary` as execuções antigas além de `max_runs_per_session`;
+- remove os campos volumosos (mensagens, eventos, raciocínio) das execuções
+  mais velhas que `retention_days`, preservando as `keep_recent_runs` mais
+  recentes que o Agno usa como histórico;
+- apaga traces mais velhos que `trace_retention_days`;
+- reconstrói os índices e faz vacuum incremental em passos.
+
+As escritas acontecem em transações curtas (o lote encolhe se passar de
+`max_lock_ms`) e só se a sessão não mudou desde a leitura (mesmo `updated_at`
+e mesmas execuções); entre elas o AgentOS continua escrevendo normalmente.
+"""
+import json
+import sqlite3
+import statistics
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+# Run fields that are only needed while the run is recent (history/debugging):
+BULKY_RUN_FIELDS = (
+    "messages",
+    "events",
+    "reasoning_messages",
+    "reasoning_steps",
+    "additional_input",
+    "references",
+    "member_responses",
+)
+MAX_TOOL_RESULT_CHARS = 500
+MAX_DIGEST_LINES = 20
+
+
+@dataclass
+class CompactionPolicy:
+    """
+    What to compact and how long the job may hold the write lock.
+
+    Args:
+        retention_days: Runs older than this lose their bulky fields.
+        keep_recent_runs: Latest runs of each session that are never changed.
+        max_runs_per_session: Older runs beyond this are folded into the summary.
+        trace_retention_days: Traces older than this are deleted (None keeps them).
+        batch_size: Sessions updated per write transaction (shrinks adaptively).
+        max_lock_ms: Target duration of each write transaction.
+        pause_ms: Pause between write transactions.
+        vacuum_step_pages: Pages released per incremental vacuum step.
+        allow_full_vacuum: Allow a one-time full VACUUM to switch a database to
+            incremental auto-vacuum (holds the lock for the whole VACUUM).
+        sample_sessions: Largest sessions used to measure load latency.
+        busy_timeout_ms: How long to wait for the AgentOS writer.
+        session_table: Name of the sessions table.
+    """
+
+    retention_days: float = 30.0
+    keep_recent_runs: int = 10
+    max_runs_per_session: int = 50
+    trace_retention_days: Optional[float] = 14.0
+    batch_size: int = 20
+    max_lock_ms: float = 50.0
+    pause_ms: float = 20.0
+    vacuum_step_pages: int = 256
+    allow_full_vacuum: bool = False
+    sample_sessions: int = 50
+    busy_timeout_ms: int = 5000
+    session_table: str = "agno_sessions"
+
+
+@dataclass
+class CompactionReport:
+    """Result of compacting one database (sizes in bytes, latencies in ms)."""
+
+    db_file: str
+    size_before: int = 0
+    size_after: int = 0
+    load_before: dict = field(default_factory=dict)
+    load_after: dict = field(default_factory=dict)
+    sessions_compacted: int = 0
+    sessions_skipped: int = 0
+    runs_folded: int = 0
+    runs_stripped: int = 0
+    traces_deleted: int = 0
+    pages_vacuumed: int = 0
+    max_lock_ms: float = 0.0
+    duration: float = 0.0
+    notes: list[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        mib = 1024 * 1024
+        lines = [
+            f"📦 {self.db_file}: {self.size_before / mib:.1f} MiB → {self.size_after / mib:.1f} MiB",
+            f"   sessions compacted={self.sessions_compacted} (skipped, changed meanwhile={self.sessions_skipped}) | "
+            f"runs folded={self.runs_folded} | runs stripped={self.runs_stripped} | traces deleted={self.traces_deleted}",
+        ]
+        if self.load_before:
+            lines.append(
+                f"   session load p50/p95: {self.load_before['p50']:.1f}/{self.load_before['p95']:.1f} ms → "
+                f"{self.load_after['p50']:.1f}/{self.load_after['p95']:.1f} ms"
+            )
+        lines.append(f"   longest write lock={self.max_lock_ms:.1f} ms | total {self.duration:.1f}s")
+        lines.extend(f"   ⚠️ {note}" for note in self.notes)
+        return "\n".join(lines)
+
+
+def _database_size(path: Path) -> int:
+    return sum(p.stat().st_size for p in (path, Path(f"{path}-wal")) if p.exists())
+
+
+def _table_exists(conn: sqlite3.Connection, table: str) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,)).fetchone() is not None
+
+
+def _measure_load(conn: sqlite3.Connection, table: str, session_ids: list[str]) -> dict:
+    """Time reading and decoding each session, as the AgentOS does on every run."""
+    timings = []
+    for session_id in session_ids:
+        start = time.perf_counter()
+        row = conn.execute(f"SELECT runs, summary, session_data FROM {table} WHERE session_id=?", (session_id,)).fetchone()
+        if row is not None:
+            for value in row:
+                if value:
+                    json.loads(value)
+        timings.append((time.perf_counter() - start) * 1000)
+    if not timings:
+        return {}
+    quantiles = statistics.quantiles(timings, n=20) if len(timings) > 1 else [timings[0]] * 19
+    return {"p50": statistics.median(timings), "p95": quantiles[18]}
+
+
+def _strip_run(run: dict) -> bool:
+    """Drop the bulky fields of a run in place; returns True if anything changed."""
+    changed = False
+    for name in BULKY_RUN_FIELDS:
+        if run.get(name):
+            run[name] = None
+            changed = True
+    for tool in run.get("tools") or []:
+        result = tool.get("result")
+        if isinstance(result, str) and len(result) > MAX_TOOL_RESULT_CHARS:
+            tool["result"] = result[: MAX_TOOL_RESULT_CHARS - 1] + "…"
+            changed = True
+    return changed
+
+
+def _digest(runs: list[dict]) -> str:
+    """Extractive summary of the runs being folded (used when the session has no summary)."""
+    dates = [run["created_at"] for run in runs if run.get("created_at")]
+    period = (
+        f" from {datetime.fromtimestamp(min(dates)):%Y-%m-%d} to {datetime.fromtimestamp(max(dates)):%Y-%m-%d}"
+        if dates
+        else ""
+    )
+    lines = [f"Earlier conversation ({len(runs)} runs{period}):"]
+    for run in runs[-MAX_DIGEST_LINES:]:
+        question = str((run.get("input") or {}).get("input_content") or "").strip().replace("\n", " ")
+        answer = str(run.get("content") or "").strip().replace("\n", " ")
+        lines.append(f"- user: {question[:120]} → {answer[:160]}")
+    return "\n".join(lines)
+
+
+def compact_session(runs: list[dict], summary: Optional[dict], now: float, policy: CompactionPolicy):
+    """
+    Compact the runs of one session.
+
+    Args:
+        runs: Runs of the session, oldest first (as stored by Agno).
+        summary: Stored session summary, if any.
+        now: Current unix time.
+        policy: Compaction policy.
+
+    Returns:
+        tuple: (runs, summary, runs_folded, runs_stripped).
+    """
+    cutoff = now - policy.retention_days * 86400
+    keep_from = max(len(runs) - policy.keep_recent_runs, 0)
+
+    # Fold: old runs beyond max_runs_per_session leave the session
+    fold = 0
+    limit = max(policy.max_runs_per_session, policy.keep_recent_runs)
+    while fold < keep_from and len(runs) - fold > limit and (runs[fold].get("created_at") or now) < cutoff:
+        fold += 1
+    if fold:
+        folded, runs = runs[:fold], runs[fold:]
+        keep_from -= fold
+        note = _digest(folded)
+        if summary and summary.get("summary"):
+            # The Agno summary already covers the whole session; only record what was removed
+            summary = {**summary, "summary": f"{summary['summary']}\n\n[{len(folded)} earlier runs compacted]"}
+        else:
+            summary = {"summary": note, "topics": None, "updated_at": datetime.now().isoformat()}
+
+    stripped = 0
+    for run in runs[:keep_from]:
+        if (run.get("created_at") or now) < cutoff and _strip_run(run):
+            stripped += 1
+    return runs, summary, fold, stripped
+
+
+class _LockBudget:
+    """Write transactions that adapt their batch size to `max_lock_ms`."""
+
+    def __init__(self, conn: sqlite3.Connection, policy: CompactionPolicy, report: CompactionReport) -> None:
+        self.conn = conn
+        self.policy = policy
+        self.report = report
+        self.batch_size = max(policy.batch_size, 1)
+
+    def write(self, statements: list[tuple[str, tuple]]) -> list[int]:
+        start = time.perf_counter()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            counts = [self.conn.execute(sql, params).rowcount for sql, params in statements]
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        elapsed = (time.perf_counter() - start) * 1000
+        self.report.max_lock_ms = max(self.report.max_lock_ms, elapsed)
+        if elapsed > self.policy.max_lock_ms and self.batch_size > 1:
+            self.batch_size = max(self.batch_size // 2, 1)
+        time.sleep(self.policy.pause_ms / 1000)
+        return counts
+
+
+def _compact_sessions(conn: sqlite3.Connection, budget: _LockBudget, policy: CompactionPolicy, report: CompactionReport) -> None:
+    table = policy.session_table
+    now = time.time()
+    last_id = ""
+    while True:
+        # Reads happen outside the write transaction (WAL readers do not block the AgentOS)
+        rows = conn.execute(
+            f"SELECT session_id, runs, summary, updated_at FROM {table} WHERE session_id > ? ORDER BY session_id LIMIT ?",
+            (last_id, budget.batch_size),
+        ).fetchall()
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        updates, folded, stripped = [], 0, 0
+        for session_id, runs_json, summary_json, updated_at in rows:
+            runs = json.loads(runs_json) if runs_json else []
+            if not runs:
+                continue
+            summary = json.loads(summary_json) if summary_json else None
+            new_runs, new_summary, n_folded, n_stripped = compact_session(runs, summary, now, policy)
+            if not n_folded and not n_stripped:
+                continue
+            # updated_at has a resolution of one second: the runs read are compared too,
+            # so a run added in the same second as the read is never overwritten
+            updates.append((
+                f"UPDATE {table} SET runs=?, summary=? WHERE session_id=? AND updated_at IS ? AND runs IS ?",
+                (
+                    json.dumps(new_runs, ensure_ascii=False),
+                    json.dumps(new_summary, ensure_ascii=False) if new_summary else None,
+                    session_id,
+                    updated_at,
+                    runs_json,
+                ),
+            ))
+            folded += n_folded
+            stripped += n_stripped
+        if not updates:
+            continue
+        counts = budget.write(updates)
+        written = sum(counts)
+        report.sessions_compacted += written
+        report.sessions_skipped += len(counts) - written
+        if written:
+            report.runs_folded += folded
+            report.runs_stripped += stripped
+
+
+def _delete_old_traces(conn: sqlite3.Connection, budget: _LockBudget, policy: CompactionPolicy, report: CompactionReport) -> None:
+    if policy.trace_retention_days is None or not _table_exists(conn, "agno_traces"):
+        return
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=policy.trace_retention_days)).isoformat()
+    while True:
+        trace_ids = [
+            row[0]
+            for row in conn.execute(
+                "SELECT trace_id FROM agno_traces WHERE created_at < ? LIMIT ?", (cutoff, budget.batch_size * 10)
+            )
+        ]
+        if not trace_ids:
+            return
+        marks = ",".join("?" * len(trace_ids))
+        statements = [(f"DELETE FROM agno_traces WHERE trace_id IN ({marks})", tuple(trace_ids))]
+        if _table_exists(conn, "agno_spans"):
+            statements.insert(0, (f"DELETE FROM agno_spans WHERE trace_id IN ({marks})", tuple(trace_ids)))
+        report.traces_deleted += budget.write(statements)[-1]
+
+
+def _rebuild_indexes(conn: sqlite3.Connection, budget: _LockBudget) -> None:
+    # One index per transaction: each REINDEX holds the lock only for that index
+    indexes = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index' AND sql IS NOT NULL")]
+    for name in indexes:
+        budget.write([(f'REINDEX "{name}"', ())])
+    conn.execute("PRAGMA optimize")
+
+
+def _vacuum(conn: sqlite3.Connection, policy: CompactionPolicy, report: CompactionReport) -> None:
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        if not policy.allow_full_vacuum:
+            report.notes.append(
+                "auto_vacuum is not INCREMENTAL: free pages stay in the file "
+                "(run once with allow_full_vacuum=True, ideally off-peak)"
+            )
+            return
+        start = time.perf_counter()
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("VACUUM")
+        report.max_lock_ms = max(report.max_lock_ms, (time.perf_counter() - start) * 1000)
+        report.notes.append("one-time full VACUUM switched the file to incremental auto-vacuum")
+        return
+    while (free := conn.execute("PRAGMA freelist_count").fetchone()[0]) > 0:
+        start = time.perf_counter()
+        # executescript steps the pragma to completion (execute frees a single page)
+        conn.executescript(f"PRAGMA incremental_vacuum({policy.vacuum_step_pages});")
+        report.max_lock_ms = max(report.max_lock_ms, (time.perf_counter() - start) * 1000)
+        report.pages_vacuumed += min(free, policy.vacuum_step_pages)
+        time.sleep(policy.pause_ms / 1000)
+
+
+def compact_database(db_file: str | Path, policy: Optional[CompactionPolicy] = None) -> CompactionReport:
+    """
+    Compact one AgentOS SQLite database while it stays online.
+
+    Args:
+        db_file: SQLite file (sessions and/or traces).
+        policy: Compaction policy.
+
+    Returns:
+        CompactionReport: Sizes, session load latency before/after and what was changed.
+    """
+    policy = policy or CompactionPolicy()
+    path = Path(db_file)
+    report = CompactionReport(db_file=str(path))
+    started = time.perf_counter()
+    conn = sqlite3.connect(path, isolation_level=None, timeout=policy.busy_timeout_ms / 1000)
+    try:
+        conn.execute(f"PRAGMA busy_timeout={policy.busy_timeout_ms}")
+        has_sessions = _table_exists(conn, policy.session_table)
+        sample: list[Any] = []
+        if has_sessions:
+            sample = [
+                row[0]
+                for row in conn.execute(
+                    f"SELECT session_id FROM {policy.session_table} ORDER BY length(runs) DESC LIMIT ?",
+                    (policy.sample_sessions,),
+                )
+            ]
+            report.load_before = _measure_load(conn, policy.session_table, sample)
+        report.size_before = _database_size(path)
+
+        budget = _LockBudget(conn, policy, report)
+        if has_sessions:
+            _compact_sessions(conn, budget, policy, report)
+        _delete_old_traces(conn, budget, policy, report)
+        _rebuild_indexes(conn, budget)
+        _vacuum(conn, policy, report)
+        if conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal":
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+        report.size_after = _database_size(path)
+        if has_sessions:
+            report.load_after = _measure_load(conn, policy.session_table, sample)
+    finally:
+        conn.close()
+    report.duration = time.perf_counter() - started
+    return report
@@ -0,0 +1,138 @@
+#! /usr/bin/env python3
+"""
+Senior Data Scientist.: Dr. Eddy Giusepe Chirinos Isidro
+
+Script sqlite_engine.py
+=======================
+AsyncSqliteDb do Agno com pragmas ajustáveis e pools separados de leitura e escrita.
+
+Por padrão o `AsyncSqliteDb` abre o arquivo em modo rollback-journal, com
+`synchronous=FULL` e sem busy timeout: sob execuções concorrentes as leituras
+esperam as escritas e escritas simultâneas falham com "database is locked".
+O `TunedAsyncSqliteDb` aplica os pragmas de `SqliteTuning` em cada conexão e
+direciona os SELECTs para um pool de conexões somente leitura (em WAL, leitores
+não bloqueiam o escritor) e o restante para uma única conexão de escrita, de
+modo que as escritas do processo fazem fila no pool em vez de disputar o lock.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from agno.db.sqlite import AsyncSqliteDb
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+
+@dataclass
+class SqliteTuning:
+    """
+    SQLite settings applied to every connection.
+
+    Args:
+        journal_mode: Journal mode ("WAL" lets readers run alongside the writer).
+        synchronous: fsync level ("NORMAL" is safe with WAL; "FULL" is the default).
+        cache_size_kib: Page cache per connection, in KiB.
+        mmap_size: Bytes of the file mapped in memory (0 disables).
+        busy_timeout_ms: How long a connection waits for a lock before failing.
+        reader_pool_size: Read-only connections kept open per process.
+        writer_pool_timeout: Seconds a write waits for the writer connection.
+        auto_vacuum: Auto-vacuum mode of new databases ("INCREMENTAL" lets
+            `config.session_compaction` release free pages in small steps).
+    """
+
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    cache_size_kib: int = 64 * 1024
+    mmap_size: int = 256 * 1024 * 1024
+    busy_timeout_ms: int = 5000
+    reader_pool_size: int = 8
+    writer_pool_timeout: float = 30.0
+    auto_vacuum: str = "INCREMENTAL"
+
+    def pragmas(self) -> list[str]:
+        return [
+            # Only takes effect before the first table is created
+            f"PRAGMA auto_vacuum={self.auto_vacuum}",
+            f"PRAGMA journal_mode={self.journal_mode}",
+            f"PRAGMA synchronous={self.synchronous}",
+            f"PRAGMA cache_size=-{self.cache_size_kib}",
+            f"PRAGMA mmap_size={self.mmap_size}",
+            f"PRAGMA busy_timeout={self.busy_timeout_ms}",
+        ]
+
+
+def create_sqlite_engine(
+    db_file: str, tuning: SqliteTuning, pool_size: int, read_only: bool = False, pool_timeout: float = 30.0
+) -> AsyncEngine:
+    """
+    Create an aiosqlite engine whose connections are configured by `tuning`.
+
+    Args:
+        db_file: Database file (created if missing).
+        tuning: Pragmas applied on connect.
+        pool_size: Connections kept in the pool (no overflow).
+        read_only: If True, connections refuse writes (`PRAGMA query_only`).
+        pool_timeout: Seconds to wait for a free connection.
+
+    Returns:
+        AsyncEngine: Configured engine.
+    """
+    db_path = Path(db_file).resolve()
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{db_path}",
+        pool_size=pool_size,
+        max_overflow=0,
+        pool_timeout=pool_timeout,
+    )
+    pragmas = tuning.pragmas() + (["PRAGMA query_only=ON"] if read_only else [])
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def apply_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    return engine
+
+
+class _RoutingSession(Session):
+    """Sends SELECTs to the reader pool and everything else to the writer."""
+
+    reader: Optional[Any] = None
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kwargs: Any) -> Any:
+        if self.reader is not None and isinstance(clause, Select) and not self._flushing:
+            return self.reader
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+class TunedAsyncSqliteDb(AsyncSqliteDb):
+    """
+    AsyncSqliteDb with tuned pragmas, a read-only reader pool and a single writer.
+
+    Example:
+        >>> db = TunedAsyncSqliteDb(db_file="my_agent_os.db", tuning=SqliteTuning(reader_pool_size=16))
+        >>> agent = Agent(model=..., db=db)
+    """
+
+    def __init__(self, db_file: str, tuning: Optional[SqliteTuning] = None, **kwargs: Any) -> None:
+        self.tuning = tuning or SqliteTuning()
+        writer = create_sqlite_engine(
+            db_file, self.tuning, pool_size=1, pool_timeout=self.tuning.writer_pool_timeout
+        )
+        super().__init__(db_file=db_file, db_engine=writer, **kwargs)
+        self.reader_engine = create_sqlite_engine(
+            db_file, self.tuning, pool_size=self.tuning.reader_pool_size, read_only=True
+        )
+        routing = type("RoutingSession", (_RoutingSession,), {"reader": self.reader_engine.sync_engine})
+        self.async_session_factory = async_sessionmaker(
+            bind=writer, class_=AsyncSession, sync_session_class=routing, expire_on_commit=False
+        )
+
+    async def close(self) -> None:
+        await super().close()
+        await self.reader_engine.dispose()